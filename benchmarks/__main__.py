@@ -0,0 +1,114 @@
+"""
+Runs the benchmark suite and writes one JSON document with the results and
+the environment they were measured in, so that runs can be compared.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --quick --output new.json --compare results.json
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import numpy as np
+
+from utils import event_loop
+from benchmarks import (bench_orderbook, bench_public_websocket, bench_market_api, bench_signing, bench_order_entry,
+                        bench_models, bench_import, bench_routes, bench_depth_buckets)
+
+
+def _environment(backend):
+    loop = event_loop.new_event_loop(backend)
+    loop.close()
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit or None,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "event_loop": event_loop.loop_backend(loop),
+    }
+
+
+def run(quick: bool = False, frames_path: str = None, backend: str = None):
+    scale = 10 if quick else 1
+    return {
+        "environment": _environment(backend),
+        "benchmarks": [
+            bench_orderbook.run(messages=20000 // scale, quotes=5000 // scale, frames_path=frames_path),
+            event_loop.run(bench_public_websocket.run(messages=20000 // scale, frames_path=frames_path), backend),
+            event_loop.run(bench_market_api.run(requests=500 // scale), backend),
+            bench_signing.run(100000 // scale),
+            event_loop.run(bench_order_entry.run(1000 // scale), backend),
+            bench_models.run(100000 // scale),
+            bench_import.run(runs=3 if quick else 5),
+            bench_routes.run(scans=200 // scale),
+            bench_depth_buckets.run(messages=20000 // scale),
+        ],
+    }
+
+
+def _flatten(value, prefix=""):
+    """
+    Flattens the numeric leaves of a result into {"path": value}; list entries
+    are keyed by their depth/symbols/coalesce fields when present.
+    """
+    flat = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            if isinstance(item, dict) and "benchmark" in item:
+                name = item["benchmark"]
+            elif isinstance(item, dict):
+                name = ",".join(f"{key}={item[key]}" for key in ["symbols", "depth", "coalesce"] if key in item)
+            else:
+                name = str(i)
+            flat.update(_flatten(item, f"{prefix}[{name or i}]"))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        flat[prefix] = value
+    return flat
+
+
+def compare(baseline: dict, results: dict):
+    """
+    Returns {"path": (baseline, new, new / baseline)} for every metric in both runs.
+    """
+    old = _flatten(baseline["benchmarks"])
+    new = _flatten(results["benchmarks"])
+    return {key: (old[key], new[key], new[key] / old[key] if old[key] else None)
+            for key in new if key in old}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="File the JSON results are written to; stdout if omitted")
+    parser.add_argument("--compare", help="Earlier results file to print ratios against")
+    parser.add_argument("--quick", action="store_true", help="Run a tenth of the default iterations")
+    parser.add_argument("--frames", help="JSONL file of recorded frames replayed instead of synthetic ones")
+    parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], help="Event loop backend")
+    args = parser.parse_args()
+
+    results = run(args.quick, args.frames, args.loop)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for key, (old, new, ratio) in compare(baseline, results).items():
+            ratio = f"{ratio:8.3f}" if ratio is not None else "     n/a"
+            print(f"{ratio}  {key}: {old:.6g} -> {new:.6g}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
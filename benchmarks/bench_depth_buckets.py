@@ -0,0 +1,82 @@
+"""
+Compares keeping price-bucketed depth with BybitDepthBuckets, updated from
+each delta, against recomputing it with np.histogram after every message,
+on synthetic frames of deep books.
+
+    python -m benchmarks.bench_depth_buckets --depth 1000 --messages 20000
+"""
+import json
+import time
+import logging
+import argparse
+import numpy as np
+
+from utils.bybit_orderbook import BybitOrderbook
+from utils.bybit_depth_buckets import BybitDepthBuckets
+from benchmarks.stand_ins import synthetic_frames
+
+
+def _histogram(book, width_bps, range_bps):
+    bid_price, _, ask_price, _ = book.get_bbo()
+    mid = (bid_price + ask_price) / 2
+    bins = int(np.ceil(range_bps / width_bps))
+    depth = {}
+    for side, sign in [("bids", -1), ("asks", 1)]:
+        levels = book.get_book_type(side)
+        depth[side], _ = np.histogram(sign * (levels["price"] - mid), bins=bins, range=(0, mid * range_bps / 1e4),
+                                      weights=levels["quantity"])
+    return depth
+
+
+def _replay(frames, on_message):
+    logger = logging.getLogger("benchmarks.bench_depth_buckets")
+    logger.disabled = True
+    book = BybitOrderbook(logger=logger, symbol="SYM0USDT", _type="spot")
+    book.process_update_message(frames[0])
+    setup = on_message(book)
+    t1 = time.perf_counter()
+    for frame in frames[1:]:
+        book.process_update_message(frame)
+        on_message(book)
+    return book, setup, (time.perf_counter() - t1) / (len(frames) - 1) * 1e6
+
+
+def run(depth: int = 1000, messages: int = 20000, width_bps: float = 1.0, range_bps: float = 200.0):
+    frames = synthetic_frames(["SYM0USDT"], depth=depth, messages=messages)
+
+    _, _, plain_us = _replay(frames, lambda book: None)
+    _, _, histogram_us = _replay(frames, lambda book: _histogram(book, width_bps, range_bps))
+
+    def attach(book):
+        if book.depth_buckets is None:
+            book.attach_depth_buckets(BybitDepthBuckets(width_bps, "bps", range_bps))
+
+    book, _, buckets_us = _replay(frames, attach)
+    buckets = book.depth_buckets
+    incremental = {side: buckets.quantity[side].copy() for side in ["bids", "asks"]}
+    buckets.rebuild(book)
+    drift = max(float(np.abs(incremental[side] - buckets.quantity[side]).max()) for side in incremental)
+    return {
+        "benchmark": "depth_buckets",
+        "depth": depth,
+        "buckets": buckets.size,
+        "anchors": buckets.anchors,
+        "max_abs_drift": drift,
+        "update_us": plain_us,
+        "update_histogram_us": histogram_us,
+        "update_buckets_us": buckets_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--width-bps", type=float, default=1.0)
+    parser.add_argument("--range-bps", type=float, default=200.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.depth, args.messages, args.width_bps, args.range_bps), indent=2))
+
+
+if __name__ == "__main__":
+    main()
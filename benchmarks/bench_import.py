@@ -0,0 +1,90 @@
+"""
+Measures the import time of the package entry point and its modules in
+fresh interpreters, and checks that importing has no side effects: no
+logging handlers installed and no heavy dependency loaded before it is used.
+Exits with status 1 if a check fails or an import exceeds --max-ms, so it can
+guard against regressions.
+
+    python -m benchmarks.bench_import --runs 5 --max-ms 150
+"""
+import sys
+import json
+import argparse
+import subprocess
+
+MODULES = [
+    "utils",
+    "utils.bybit_public_websocket",
+    "utils.bybit_private_websocket",
+    "utils.bybit_trade_websocket",
+    "utils.bybit_account",
+    "utils.bybit_market",
+    "utils.bybit_orderbook",
+]
+
+HEAVY = ["numpy", "aiohttp", "websockets", "requests"]
+
+# Heavy dependencies each module may load at import time
+ALLOWED = {
+    "utils.bybit_orderbook": ["numpy"],
+}
+
+_PROBE = """
+import sys, time, json, logging
+t1 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t1
+print(json.dumps({{
+    "ms": elapsed * 1e3,
+    "handlers": len(logging.getLogger().handlers),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def _probe(module):
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(modules=MODULES, runs: int = 5, max_ms: float = None):
+    results = []
+    violations = []
+    for module in modules:
+        probes = [_probe(module) for _ in range(runs)]
+        times = sorted(probe["ms"] for probe in probes)
+        result = {
+            "module": module,
+            "min_ms": times[0],
+            "median_ms": times[len(times) // 2],
+            "logging_handlers": probes[0]["handlers"],
+            "heavy_modules": probes[0]["heavy"],
+        }
+        results.append(result)
+        if result["logging_handlers"]:
+            violations.append(f"{module} installs logging handlers on import")
+        unexpected = set(result["heavy_modules"]) - set(ALLOWED.get(module, []))
+        if unexpected:
+            violations.append(f"{module} imports {sorted(unexpected)} on import")
+        if max_ms is not None and result["min_ms"] > max_ms:
+            violations.append(f"{module} takes {result['min_ms']:.1f} ms to import (max {max_ms} ms)")
+    return {"benchmark": "import", "results": results, "violations": violations}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="Fail if an import takes longer than this")
+    args = parser.parse_args()
+    result = run(args.modules, args.runs, args.max_ms)
+    print(json.dumps(result, indent=2))
+    if result["violations"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmarks BybitMarketApi against a local REST stand-in: sequential
+get_orderbook latency, and the throughput of bursts of concurrent requests
+over several symbols, with and without request coalescing.
+
+    python -m benchmarks.bench_market_api --depths 50 200 --symbols 1 10 --requests 500
+"""
+import json
+import time
+import asyncio
+import argparse
+
+from utils.bybit_market import BybitMarketApi
+from benchmarks.stand_ins import RestStandIn, summarize, max_rss_kb
+
+
+async def _sequential(api, requests):
+    latencies = []
+    for _ in range(requests):
+        t1 = time.perf_counter()
+        await api.get_orderbook("SYM0USDT", "spot", limit=50)
+        latencies.append(time.perf_counter() - t1)
+    return summarize(latencies)
+
+
+async def _burst(api, server, symbols, requests):
+    names = [f"SYM{i}USDT" for i in range(symbols)]
+    hits = server.hits
+    t1 = time.perf_counter()
+    await asyncio.gather(*[api.get_orderbook(names[i % symbols], "spot", limit=50) for i in range(requests)])
+    elapsed = time.perf_counter() - t1
+    return {"requests_per_s": requests / elapsed, "server_hits": server.hits - hits}
+
+
+async def run(depths=(50, 200), symbols=(1, 10), requests: int = 500, port: int = 18201):
+    results = []
+    for depth in depths:
+        server = RestStandIn(port=port, depth=depth)
+        await server.start()
+        try:
+            for coalesce in [False, True]:
+                api = BybitMarketApi(coalesce=coalesce)
+                api.base_url = server.url
+                result = {"depth": depth, "coalesce": coalesce, "sequential": await _sequential(api, requests)}
+                for n in symbols:
+                    result[f"burst_{n}_symbols"] = await _burst(api, server, n, requests)
+                results.append(result)
+        finally:
+            await server.stop()
+    return {"benchmark": "market_api", "results": results, "max_rss_kb": max_rss_kb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.depths, args.symbols, args.requests)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
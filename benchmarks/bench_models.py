@@ -0,0 +1,77 @@
+"""
+Compares construction time and per-object memory of the models (Orderbook,
+BybitOrderbook, and the slotted per-message BBOEvent and Trade) against the
+same objects built on a bare AbstractModel and, for BBO events, a namedtuple.
+
+    python -m benchmarks.bench_models --objects 100000
+"""
+import json
+import time
+import argparse
+import collections
+import tracemalloc
+
+from models.model import AbstractModel
+from models.orderbook import Orderbook
+from models.trade import Trade
+from utils.bybit_orderbook import BBOEvent, BybitOrderbook
+
+BBOTuple = collections.namedtuple(
+    "BBOTuple", ["symbol", "bid_price", "bid_quantity", "ask_price", "ask_quantity", "update_id", "timestamp"]
+)
+
+CASES = {
+    "orderbook": {
+        "abstract_model": lambda: AbstractModel(symbol="BTCUSDT", exchange="bybit", updateId=1, timestamp=time.time()),
+        "model": lambda: Orderbook(symbol="BTCUSDT", exchange="bybit", updateId=1),
+        "bybit_model": lambda: BybitOrderbook(symbol="BTCUSDT", depth=50, _type="spot"),
+    },
+    "bbo_event": {
+        "abstract_model": lambda: AbstractModel(symbol="BTCUSDT", bid_price=100.0, bid_quantity=1.0, ask_price=100.1,
+                                                ask_quantity=2.0, update_id=1, timestamp=time.time()),
+        "namedtuple": lambda: BBOTuple("BTCUSDT", 100.0, 1.0, 100.1, 2.0, 1, time.time()),
+        "model": lambda: BBOEvent("BTCUSDT", 100.0, 1.0, 100.1, 2.0, 1),
+    },
+    "trade": {
+        "abstract_model": lambda: AbstractModel(symbol="BTCUSDT", side="Buy", price=100.0, quantity=0.1,
+                                                trade_id="1", is_block_trade=False, timestamp=1.7e9),
+        "model": lambda: Trade("BTCUSDT", "Buy", 100.0, 0.1, "1", False, 1.7e9),
+    },
+}
+
+
+def _construction(factory, objects):
+    t1 = time.perf_counter()
+    for _ in range(objects):
+        factory()
+    return (time.perf_counter() - t1) / objects * 1e9
+
+
+def _memory(factory, objects):
+    tracemalloc.start()
+    kept = [factory() for _ in range(objects)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Discount the list holding the objects
+    return (current - kept.__sizeof__()) / objects
+
+
+def run(objects: int = 100000):
+    results = {}
+    for model, variants in CASES.items():
+        results[model] = {
+            name: {"construction_ns": _construction(factory, objects), "bytes_per_object": _memory(factory, objects)}
+            for name, factory in variants.items()
+        }
+    return {"benchmark": "models", "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=100000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.objects), indent=2))
+
+
+if __name__ == "__main__":
+    main()
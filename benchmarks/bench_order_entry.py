@@ -0,0 +1,98 @@
+"""
+Compares order round-trip time of REST (AsyncBybitAccount.place_order) and
+the /v5/trade websocket (BybitTradeWebSocket.place_order) against local
+stand-ins that imitate Bybit's ack protocol.
+
+    python -m benchmarks.bench_order_entry --orders 2000
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import websockets
+from aiohttp import web
+
+from benchmarks.stand_ins import HOST, summarize, instrument_registry
+from utils.bybit_async_account import AsyncBybitAccount
+from utils.bybit_trade_websocket import BybitTradeWebSocket
+
+
+def _ack(order_link_id):
+    return {"orderId": str(time.time_ns()), "orderLinkId": order_link_id or ""}
+
+
+async def _rest_create(request):
+    body = json.loads(await request.text())
+    return web.json_response({"retCode": 0, "retMsg": "OK", "result": _ack(body.get("orderLinkId"))})
+
+
+async def _ws_handler(ws):
+    async for message in ws:
+        data = json.loads(message)
+        if data.get("op") == "auth":
+            await ws.send(json.dumps({"op": "auth", "retCode": 0, "retMsg": "OK"}))
+        elif data.get("op", "").startswith("order."):
+            await ws.send(json.dumps({
+                "reqId": data["reqId"],
+                "retCode": 0,
+                "retMsg": "OK",
+                "op": data["op"],
+                "data": _ack(data["args"][0].get("orderLinkId")),
+            }))
+
+
+async def run(orders: int = 1000, rest_port: int = 18100, ws_port: int = 18101):
+    os.environ.setdefault("BYBIT_API_KEY", "bench")
+    os.environ.setdefault("BYBIT_SECRET_KEY", "bench")
+
+    app = web.Application()
+    app.router.add_post("/v5/order/create", _rest_create)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, rest_port).start()
+    ws_server = await websockets.serve(_ws_handler, HOST, ws_port)
+
+    account = AsyncBybitAccount(instruments=instrument_registry())
+    account.base_url = f"http://{HOST}:{rest_port}"
+    trade_ws = BybitTradeWebSocket(account=account, ws_url=f"ws://{HOST}:{ws_port}")
+    ws_task = asyncio.create_task(trade_ws.start())
+
+    try:
+        rest_latencies = []
+        for _ in range(orders):
+            t1 = time.perf_counter()
+            await account.place_order("BTCUSDT", "Buy", "Limit", 0.001, 30000)
+            rest_latencies.append(time.perf_counter() - t1)
+
+        ws_latencies = []
+        for _ in range(orders):
+            t1 = time.perf_counter()
+            await trade_ws.place_order("BTCUSDT", "Buy", "Limit", 0.001, 30000)
+            ws_latencies.append(time.perf_counter() - t1)
+    finally:
+        await trade_ws.stop()
+        await ws_task
+        await account.close()
+        ws_server.close()
+        await ws_server.wait_closed()
+        await runner.cleanup()
+
+    rest, ws = summarize(rest_latencies), summarize(ws_latencies)
+    return {
+        "benchmark": "order_entry",
+        "rest": rest,
+        "websocket": ws,
+        "p50_speedup": rest["p50_us"] / ws["p50_us"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.orders)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmarks BybitOrderbook.process_update_message and request_quote over
+synthetic (or recorded) frames at several book depths, without a network.
+
+    python -m benchmarks.bench_orderbook --depths 1 50 200 --messages 20000
+"""
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+
+from utils.bybit_orderbook import BybitOrderbook
+from benchmarks.stand_ins import summarize, synthetic_frames, load_frames, frame_symbols
+
+
+def _books(frames):
+    logger = logging.getLogger("benchmarks.bench_orderbook")
+    logger.disabled = True
+    return {symbol: BybitOrderbook(logger=logger, symbol=symbol, depth=depth, _type="spot")
+            for symbol, depth in frame_symbols(frames)}
+
+
+def _replay(frames):
+    books = _books(frames)
+    latencies = []
+    t0 = time.perf_counter()
+    for frame in frames:
+        if not frame["topic"].startswith("orderbook"):
+            continue
+        book = books[frame["data"]["s"]]
+        t1 = time.perf_counter()
+        book.process_update_message(frame)
+        latencies.append(time.perf_counter() - t1)
+    return books, latencies, time.perf_counter() - t0
+
+
+def _memory(frames):
+    tracemalloc.start()
+    books, _, _ = _replay(frames)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"retained_kb": current / 1024, "peak_kb": peak / 1024}
+
+
+def _quotes(book, quotes):
+    latencies = []
+    size = book.asks["quantity"].sum() / 2
+    for i in range(quotes):
+        side = "BUY" if i % 2 == 0 else "SELL"
+        t1 = time.perf_counter()
+        book.request_quote(side, size)
+        latencies.append(time.perf_counter() - t1)
+    return latencies
+
+
+def run(depths=(1, 50, 200), messages: int = 20000, symbols: int = 1, quotes: int = 5000, frames_path: str = None):
+    names = [f"SYM{i}USDT" for i in range(symbols)]
+    results = []
+    for depth in ([None] if frames_path else depths):
+        frames = load_frames(frames_path) if frames_path else synthetic_frames(names, depth=depth, messages=messages)
+        books, latencies, elapsed = _replay(frames)
+        book = next(iter(books.values()))
+        results.append({
+            "depth": depth,
+            "symbols": len(books),
+            "update": dict(summarize(latencies), messages_per_s=len(latencies) / elapsed),
+            "request_quote": summarize(_quotes(book, quotes)),
+            "memory": _memory(frames),
+        })
+    return {"benchmark": "orderbook", "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--symbols", type=int, default=1)
+    parser.add_argument("--quotes", type=int, default=5000)
+    parser.add_argument("--frames", help="JSONL file of recorded frames replayed instead of synthetic ones")
+    args = parser.parse_args()
+    print(json.dumps(run(args.depths, args.messages, args.symbols, args.quotes, args.frames), indent=2))
+
+
+if __name__ == "__main__":
+    main()
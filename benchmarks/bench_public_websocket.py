@@ -0,0 +1,97 @@
+"""
+Benchmarks BybitWebSocket end to end against a local feed server replaying
+orderbook (and publicTrade) frames at a configurable rate, for several
+symbol counts and depths.
+
+Latency is measured from the moment the server sends a frame to the moment
+process_book_update sees it, so it covers the socket, json parsing and the
+book update. With --rate 0 the server floods the client, so latency then
+mostly measures queueing; use a fixed rate for latency percentiles.
+
+    python -m benchmarks.bench_public_websocket --symbols 1 10 50 --depths 50 200 --rate 0
+"""
+import json
+import time
+import logging
+import argparse
+
+from utils import event_loop
+from utils.bybit_public_websocket import BybitWebSocket
+from benchmarks.stand_ins import FeedServer, summarize, synthetic_frames, load_frames, frame_symbols, max_rss_kb
+
+
+async def _replay(frames, rate, port):
+    server = FeedServer(frames, rate=rate, port=port)
+    await server.start()
+
+    logger = logging.getLogger("benchmarks.bench_public_websocket")
+    logger.disabled = True
+    monitor = event_loop.LoopLagMonitor(interval=0.01, logger=logger)
+    ws = BybitWebSocket("spot", logger=logger, loop_monitor=monitor)
+    ws.ws_url = server.url
+    for symbol, depth in frame_symbols(frames):
+        ws.add_orderbook_stream(symbol, depth)
+        ws.books[symbol].logger = logger
+    for symbol in {frame["topic"].split(".")[1] for frame in frames if frame["topic"].startswith("publicTrade")}:
+        ws.add_trade_stream(symbol)
+
+    latencies = []
+    expected = len(frames)
+    first = []
+
+    async def process_book_update(data):
+        now = time.perf_counter()
+        if "bench_ts" not in data:
+            return
+        if not first:
+            first.append(now)
+        latencies.append(now - data["bench_ts"])
+        if len(latencies) == expected:
+            ws.stop_execution = True
+
+    ws.process_book_update = process_book_update
+    monitor.start()
+    try:
+        await ws.start()
+    finally:
+        monitor.stop()
+        await server.stop()
+    elapsed = time.perf_counter() - first[0]
+    book_kb = sum(book.bids.nbytes + book.asks.nbytes for book in ws.books.values()) / 1024
+    return dict(summarize(latencies), messages_per_s=len(latencies) / elapsed, book_kb=book_kb,
+                loop_lag=monitor.lag_stats(), slowest_topics=monitor.top_sections(3, key="max"))
+
+
+async def run(symbols=(1, 10), depths=(50, 200), messages: int = 20000, rate: float = 0,
+              trade_ratio: float = 0.1, frames_path: str = None, port: int = 18200):
+    results = []
+    cases = [(None, None)] if frames_path else [(n, depth) for n in symbols for depth in depths]
+    for n, depth in cases:
+        if frames_path:
+            frames = load_frames(frames_path)
+        else:
+            frames = synthetic_frames([f"SYM{i}USDT" for i in range(n)], depth=depth, messages=messages,
+                                      trade_ratio=trade_ratio)
+        result = await _replay(frames, rate, port)
+        results.append(dict(symbols=n, depth=depth, rate=rate, **result))
+    return {"benchmark": "public_websocket", "event_loop": event_loop.loop_backend(), "results": results,
+            "max_rss_kb": max_rss_kb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--depths", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--rate", type=float, default=0, help="Frames per second; 0 replays as fast as possible")
+    parser.add_argument("--trade-ratio", type=float, default=0.1)
+    parser.add_argument("--frames", help="JSONL file of recorded frames replayed instead of synthetic ones")
+    parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], help="Event loop backend")
+    args = parser.parse_args()
+    result = event_loop.run(run(args.symbols, args.depths, args.messages, args.rate, args.trade_ratio, args.frames),
+                            args.loop)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compares scanning conversion routes by chaining Orderbook.request_quote
+over each leg against BybitRouteQuoter.quote_all, with no book changed
+between scans and with one leg book changed per scan. That both give the
+same amounts is asserted in tests/test_bybit_route_quoter.py.
+
+    python -m benchmarks.bench_routes --coins 100 --depth 50 --scans 200
+"""
+import json
+import time
+import logging
+import argparse
+import numpy as np
+
+from utils.bybit_orderbook import BybitOrderbook
+from utils.bybit_route_quoter import BybitRouteQuoter
+
+
+def _book(symbol, mid, depth, rng, logger):
+    book = BybitOrderbook(logger=logger, symbol=symbol)
+    tick = mid * 1e-4
+    offsets = tick * np.arange(1, depth + 1)
+    book.process_update_message({"type": "snapshot", "ts": 0, "data": {
+        "u": 1,
+        "b": np.column_stack([mid - offsets, rng.uniform(0.1, 5, depth)]).astype(str).tolist(),
+        "a": np.column_stack([mid + offsets, rng.uniform(0.1, 5, depth)]).astype(str).tolist(),
+    }})
+    return book
+
+
+def _universe(coins, depth, seed=0):
+    logger = logging.getLogger("benchmarks.bench_routes")
+    logger.disabled = True
+    rng = np.random.default_rng(seed)
+    usdt = {"BTC": 60000.0, "ETH": 3000.0}
+    books = {"BTCUSDT": _book("BTCUSDT", 60000.0, depth, rng, logger),
+             "ETHUSDT": _book("ETHUSDT", 3000.0, depth, rng, logger)}
+    pairs = {"BTCUSDT": ("BTC", "USDT"), "ETHUSDT": ("ETH", "USDT")}
+    for i in range(coins):
+        coin = f"C{i}"
+        price = rng.uniform(1, 100)
+        books[f"{coin}USDT"] = _book(f"{coin}USDT", price, depth, rng, logger)
+        pairs[f"{coin}USDT"] = (coin, "USDT")
+        for middle in ["BTC", "ETH"]:
+            books[f"{coin}{middle}"] = _book(f"{coin}{middle}", price / usdt[middle], depth, rng, logger)
+            pairs[f"{coin}{middle}"] = (coin, middle)
+    return books, pairs
+
+
+def _legacy_scan(books, quoter, sizes):
+    # Every leg sells its base coin, so each leg is one request_quote("SELL", ...)
+    received = np.empty(len(quoter.routes))
+    for row, legs in enumerate(quoter.legs):
+        amount = sizes[row]
+        for symbol, _ in legs:
+            _, price, filled = books[symbol].request_quote("SELL", amount)
+            amount = price * filled
+        received[row] = amount
+    return received
+
+
+def _timed(func, scans):
+    t1 = time.perf_counter()
+    for i in range(scans):
+        func(i)
+    return (time.perf_counter() - t1) / scans * 1e6
+
+
+def run(coins: int = 100, depth: int = 50, scans: int = 200):
+    books, pairs = _universe(coins, depth)
+    quoter = BybitRouteQuoter(books, pairs)
+    for i in range(coins):
+        quoter.find_routes(f"C{i}", "USDT", max_legs=2)
+    sizes = np.ones(len(quoter.routes))
+    # Builds every route curve once, so the scans below only time the steady state
+    quoter.quote_all(sizes)
+    symbols = list(books)
+
+    def changed(i):
+        book = books[symbols[i % len(symbols)]]
+        book.last_update_id += 1
+        quoter.quote_all(sizes)
+
+    return {
+        "benchmark": "routes",
+        "routes": len(quoter.routes),
+        "request_quote_scan_us": _timed(lambda i: _legacy_scan(books, quoter, sizes), scans),
+        "quote_all_unchanged_us": _timed(lambda i: quoter.quote_all(sizes), scans),
+        "quote_all_one_leg_changed_us": _timed(changed, scans),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--coins", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=50)
+    parser.add_argument("--scans", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.coins, args.depth, args.scans), indent=2))
+
+
+if __name__ == "__main__":
+    main()
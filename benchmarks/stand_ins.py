@@ -0,0 +1,261 @@
+"""
+Local stand-ins for the Bybit public websocket and market REST endpoints,
+and the synthetic frames they serve, shared by the benchmarks.
+"""
+import json
+import time
+import asyncio
+import resource
+import numpy as np
+import websockets
+from aiohttp import web
+
+from utils.bybit_instruments import BybitInstrumentRegistry
+
+HOST = "127.0.0.1"
+
+
+def summarize(latencies):
+    """
+    Summarizes latencies in seconds as microsecond percentiles.
+    """
+    latencies = np.asarray(latencies, dtype="f8") * 1e6
+    if latencies.size == 0:
+        return {"count": 0}
+    return {
+        "count": int(latencies.size),
+        "mean_us": float(latencies.mean()),
+        "p50_us": float(np.percentile(latencies, 50)),
+        "p90_us": float(np.percentile(latencies, 90)),
+        "p99_us": float(np.percentile(latencies, 99)),
+        "max_us": float(latencies.max()),
+    }
+
+
+def instrument_registry(symbols=("BTCUSDT",), category: str = "spot"):
+    """
+    Returns an in-memory BybitInstrumentRegistry holding USDT instruments for
+    the symbols, so that benchmarks neither fetch nor touch the disk cache.
+    """
+    registry = BybitInstrumentRegistry(cache_path=None)
+    registry.update(category, [{
+        "symbol": symbol,
+        "baseCoin": symbol[:-4],
+        "quoteCoin": "USDT",
+        "status": "Trading",
+        "priceFilter": {"tickSize": "0.01"},
+        "lotSizeFilter": {"basePrecision": "0.000001", "minOrderQty": "0.000001", "maxOrderQty": "1000",
+                          "minOrderAmt": "1", "maxOrderAmt": "10000000"},
+    } for symbol in symbols])
+    return registry
+
+
+def max_rss_kb():
+    """
+    Returns the peak resident set size of the process in KB (Linux units).
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _levels(prices, quantities):
+    return [[f"{price:.2f}", f"{quantity:.4f}"] for price, quantity in zip(prices, quantities)]
+
+
+def synthetic_frames(symbols, depth: int = 50, messages: int = 10000, levels_per_delta: int = 3,
+                     trade_ratio: float = 0.0, seed: int = 0):
+    """
+    Generates an orderbook.{depth} snapshot per symbol followed by deltas
+    (and optionally publicTrade frames) around a random-walking mid.
+
+    :param symbols: Symbols the frames are generated for, round-robin.
+    :param depth: Number of levels per side of the snapshots.
+    :param messages: Number of frames after the snapshots.
+    :param levels_per_delta: Number of levels changed per side and delta (at most depth), besides
+        the deletions of levels the mid crossed or that left the top depth.
+    :param trade_ratio: Fraction of the frames that are publicTrade frames.
+    :param seed: Random seed, so that runs are reproducible.
+    :return: List of message dicts shaped like Bybit's.
+    """
+    rng = np.random.default_rng(seed)
+    tick = 0.01
+    # Mids and levels are kept in whole ticks so that prices compare exactly
+    mids = {symbol: 10000 + 1000 * i for i, symbol in enumerate(symbols)}
+    update_ids = {symbol: 1 for symbol in symbols}
+    live = {}
+    frames = []
+    offsets = np.arange(1, depth + 1)
+    for symbol in symbols:
+        mid = mids[symbol]
+        live[symbol] = {"b": set((mid - offsets).tolist()), "a": set((mid + offsets).tolist())}
+        frames.append({
+            "topic": f"orderbook.{depth}.{symbol}",
+            "type": "snapshot",
+            "ts": 0,
+            "data": {
+                "s": symbol,
+                "b": _levels((mid - offsets) * tick, rng.uniform(0.1, 5, depth)),
+                "a": _levels((mid + offsets) * tick, rng.uniform(0.1, 5, depth)),
+                "u": 1,
+                "seq": 1,
+            },
+        })
+
+    for i in range(messages):
+        symbol = symbols[i % len(symbols)]
+        if trade_ratio and rng.random() < trade_ratio:
+            frames.append({
+                "topic": f"publicTrade.{symbol}",
+                "type": "snapshot",
+                "ts": 0,
+                "data": [{
+                    "T": 0,
+                    "s": symbol,
+                    "S": "Buy" if rng.random() < 0.5 else "Sell",
+                    "v": f"{rng.uniform(0.01, 1):.4f}",
+                    "p": f"{mids[symbol] * tick:.2f}",
+                    "i": str(i),
+                    "BT": False,
+                }],
+            })
+            continue
+        mids[symbol] += int(rng.integers(-1, 2))
+        mid = mids[symbol]
+        update_ids[symbol] += 1
+        data = {"s": symbol}
+        for side, sign in (("b", -1), ("a", 1)):
+            levels = live[symbol][side]
+            # Bids stay below the mid and asks above it: levels the mid moved
+            # onto, or that left the top depth, are deleted
+            dropped = sorted(price for price in levels if not 1 <= (price - mid) * sign <= depth)
+            levels.difference_update(dropped)
+            # Distinct offsets, so that a delta never repeats a price
+            count = min(levels_per_delta, depth)
+            prices = mid + sign * (rng.choice(depth, count, replace=False) + 1)
+            # About a fifth of the changed levels are deletions
+            quantities = np.where(rng.random(count) < 0.2, 0, rng.uniform(0.1, 5, count))
+            for price, quantity in zip(prices.tolist(), quantities):
+                if quantity:
+                    levels.add(price)
+                else:
+                    levels.discard(price)
+            data[side] = _levels(np.append(dropped, prices) * tick, np.append(np.zeros(len(dropped)), quantities))
+        data["u"] = update_ids[symbol]
+        data["seq"] = update_ids[symbol]
+        frames.append({
+            "topic": f"orderbook.{depth}.{symbol}",
+            "type": "delta",
+            "ts": 0,
+            "data": data,
+        })
+    return frames
+
+
+def load_frames(path: str):
+    """
+    Loads recorded frames, one raw websocket message per line.
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def frame_symbols(frames):
+    """
+    Returns the (symbol, depth) of every orderbook stream in the frames, in
+    order of appearance.
+    """
+    streams = {}
+    for frame in frames:
+        parts = frame.get("topic", "").split(".")
+        if parts[0] == "orderbook" and len(parts) == 3:
+            streams.setdefault(parts[2], int(parts[1]))
+    return list(streams.items())
+
+
+class FeedServer:
+    """
+    Local websocket server that answers a subscribe request and then replays
+    frames at a fixed rate. Each sent frame carries ``bench_ts``, the
+    time.perf_counter() at which it was sent, for latency measurement in the
+    same process.
+    """
+
+    def __init__(self, frames, rate: float = 0, port: int = 18200):
+        """
+        :param frames: Message dicts replayed to every subscriber.
+        :param rate: Frames per second; 0 replays as fast as possible.
+        :param port: Local port of the server.
+        """
+        self.frames = frames
+        self.rate = rate
+        self.port = port
+        self.url = f"ws://{HOST}:{port}"
+        self.server = None
+
+    async def _handler(self, ws):
+        request = json.loads(await ws.recv())
+        await ws.send(json.dumps({"success": True, "ret_msg": "", "op": request.get("op"), "conn_id": "bench"}))
+        start = time.perf_counter()
+        for i, frame in enumerate(self.frames):
+            if self.rate:
+                delay = start + i / self.rate - time.perf_counter()
+                # Sleep only when ahead by more than the timer granularity
+                if delay > 0.001:
+                    await asyncio.sleep(delay)
+            frame["bench_ts"] = time.perf_counter()
+            await ws.send(json.dumps(frame))
+        try:
+            await ws.wait_closed()
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    async def start(self):
+        self.server = await websockets.serve(self._handler, HOST, self.port, max_queue=None)
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+class RestStandIn:
+    """
+    Local aiohttp server answering the public market endpoints used by
+    BybitMarketApi with canned responses, counting the requests it serves.
+    """
+
+    def __init__(self, port: int = 18201, depth: int = 50):
+        """
+        :param port: Local port of the server.
+        :param depth: Number of levels per side of the orderbook responses.
+        """
+        self.port = port
+        self.url = f"http://{HOST}:{port}"
+        self.hits = 0
+        frames = synthetic_frames(["BTCUSDT"], depth=depth, messages=0)
+        self.orderbook = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"s": "BTCUSDT", "b": frames[0]["data"]["b"], "a": frames[0]["data"]["a"],
+                       "ts": 0, "u": 1, "seq": 1},
+        }
+        self.runner = None
+
+    def _response(self, result):
+        async def handler(request):
+            self.hits += 1
+            return web.json_response(result)
+        return handler
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/v5/market/orderbook", self._response(self.orderbook))
+        app.router.add_get("/v5/market/time", self._response(
+            {"retCode": 0, "retMsg": "OK", "result": {"timeSecond": "0", "timeNano": "0"}}))
+        app.router.add_get("/v5/market/tickers", self._response(
+            {"retCode": 0, "retMsg": "OK", "result": {"category": "spot", "list": [
+                {"symbol": "BTCUSDT", "bid1Price": "99.99", "ask1Price": "100.01", "lastPrice": "100"}]}}))
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, HOST, self.port).start()
+
+    async def stop(self):
+        await self.runner.cleanup()
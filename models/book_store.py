@@ -0,0 +1,164 @@
+import numpy as np
+
+from models.orderbook import Orderbook
+
+
+class BookStore:
+    """
+    Struct-of-arrays storage for the books of many symbols.
+
+    Each side is one preallocated ``(n_symbols, depth)`` array of
+    ``Orderbook.dtype`` records, which is laid out exactly like an
+    ``(n_symbols, depth, 2)`` float array (see ``bids_array``). Rows are
+    addressed through a symbol -> row index and only the first
+    ``bid_lengths[row]``/``ask_lengths[row]`` levels of a row are valid.
+    Cross-symbol metrics are computed for every symbol in one NumPy call.
+
+    The arrays are reallocated when the store grows (a symbol beyond the
+    capacity, or a book deeper than the store), which detaches any view
+    returned before: keep row numbers and call get_book again instead of
+    holding on to views.
+    """
+
+    def __init__(self, capacity: int = 64, depth: int = 200):
+        """
+        Initializes an instance of BookStore.
+
+        :param capacity: Initial number of symbol rows; grows as symbols are added.
+        :param depth: Initial number of levels per side; grows with add_symbol and set_book.
+        """
+        self.capacity = capacity
+        self.depth = depth
+        self.symbols = []
+        self.index = {}
+        self.bids = np.zeros((capacity, depth), dtype=Orderbook.dtype)
+        self.asks = np.zeros((capacity, depth), dtype=Orderbook.dtype)
+        self.bid_lengths = np.zeros(capacity, dtype=np.int64)
+        self.ask_lengths = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _resize(self, capacity, depth):
+        for side in ["bids", "asks"]:
+            old = getattr(self, side)
+            new = np.zeros((capacity, depth), dtype=Orderbook.dtype)
+            new[: old.shape[0], : old.shape[1]] = old
+            setattr(self, side, new)
+        for lengths in ["bid_lengths", "ask_lengths"]:
+            old = getattr(self, lengths)
+            new = np.zeros(capacity, dtype=np.int64)
+            new[: old.shape[0]] = old
+            setattr(self, lengths, new)
+        self.capacity = capacity
+        self.depth = depth
+
+    def add_symbol(self, symbol: str, depth: int = None):
+        """
+        Reserves a row for a symbol, growing the arrays if needed.
+
+        :param symbol: Symbol of the book.
+        :param depth: Optional number of levels the book needs per side.
+        :return: Row number of the symbol.
+        """
+        if depth is not None and depth > self.depth:
+            self._resize(self.capacity, depth)
+        row = self.index.get(symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row == self.capacity:
+                self._resize(self.capacity * 2, self.depth)
+            self.symbols.append(symbol)
+            self.index[symbol] = row
+        return row
+
+    def _side(self, order_type):
+        if order_type in ["BUY", "buy", "asks"]:
+            return self.asks, self.ask_lengths
+        elif order_type in ["SELL", "sell", "bids"]:
+            return self.bids, self.bid_lengths
+        else:
+            raise ValueError("order_type must be either 'asks' or 'bids'.")
+
+    def get_book(self, row: int, order_type):
+        """
+        Returns a zero-copy view of the valid levels of a book side. It sees
+        later writes to the row until the store is resized, after which it
+        keeps the old levels; call get_book again rather than keeping it.
+        """
+        book, lengths = self._side(order_type)
+        return book[row, : lengths[row]]
+
+    def set_book(self, row: int, order_type, levels):
+        """
+        Copies the levels of a book side into a row. A book deeper than the
+        store grows every row (at least doubling the depth, so repeated growth
+        stays amortized) instead of being truncated.
+        """
+        levels = np.asarray(levels, dtype=Orderbook.dtype)
+        size = len(levels)
+        if size > self.depth:
+            self._resize(self.capacity, max(size, 2 * self.depth))
+        book, lengths = self._side(order_type)
+        book[row, :size] = levels
+        lengths[row] = size
+
+    def bids_array(self):
+        """
+        Returns the bids as a zero-copy ``(n_symbols, depth, 2)`` float array,
+        valid until the store is resized (see get_book).
+        """
+        return self.bids[: len(self.symbols)].view("f8").reshape(len(self.symbols), self.depth, 2)
+
+    def asks_array(self):
+        """
+        Returns the asks as a zero-copy ``(n_symbols, depth, 2)`` float array,
+        valid until the store is resized (see get_book).
+        """
+        return self.asks[: len(self.symbols)].view("f8").reshape(len(self.symbols), self.depth, 2)
+
+    def best_bids(self):
+        """
+        Returns the best bid price of every symbol, nan where the side is empty.
+        """
+        size = len(self.symbols)
+        return np.where(self.bid_lengths[:size] > 0, self.bids["price"][:size, 0], np.nan)
+
+    def best_asks(self):
+        """
+        Returns the best ask price of every symbol, nan where the side is empty.
+        """
+        size = len(self.symbols)
+        return np.where(self.ask_lengths[:size] > 0, self.asks["price"][:size, 0], np.nan)
+
+    def spreads(self):
+        return self.best_asks() - self.best_bids()
+
+    def mids(self):
+        return (self.best_asks() + self.best_bids()) / 2
+
+    def depth_sums(self, order_type, levels: int, notional: bool = False):
+        """
+        Returns, for every symbol, the quantity (or notional) of the top levels of a side.
+
+        :param order_type: 'bids' or 'asks'.
+        :param levels: Number of levels summed.
+        :param notional: Sum price * quantity instead of quantity.
+        """
+        book, lengths = self._side(order_type)
+        size = len(self.symbols)
+        levels = min(levels, self.depth)
+        top = book[:size, :levels]
+        values = top["quantity"] * top["price"] if notional else top["quantity"]
+        valid = np.arange(levels) < lengths[:size, None]
+        return np.where(valid, values, 0.0).sum(axis=1)
+
+    def imbalances(self, levels: int = 1):
+        """
+        Returns (bid depth - ask depth) / (bid depth + ask depth) over the top
+        levels of every symbol.
+        """
+        bids = self.depth_sums("bids", levels)
+        asks = self.depth_sums("asks", levels)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (bids - asks) / (bids + asks)
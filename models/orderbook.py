@@ -1,27 +1,41 @@
 from time import time
 from datetime import datetime
+from decimal import Decimal
 from models.model import AbstractModel
 import numpy as np
 import copy
 
 
+def get_scale(step: str):
+    """
+    Splits a decimal step such as a tickSize into (units, decimals) so that
+    step == units / 10**decimals exactly, e.g. "0.05" -> (5, 2).
+    """
+    number = Decimal(step).normalize()
+    decimals = max(0, -number.as_tuple().exponent)
+    return int(number.scaleb(decimals)), decimals
+
+
 class Orderbook(
     AbstractModel
 ):  # receives a list of lines that contain prices and amounts in that order
     """
     Represents an order book with bids and asks for a particular symbol on an exchange.
+
+    ``timestamp`` is the time of the book (its creation time until an update
+    sets it) and ``timestamp_str`` is only formatted when read.
     """
 
     symbol: str = ""
     exchange: str = ""
     updateId: int = 0
     dtype: list = [("price", "f8"), ("quantity", "f8")]
-    bids: np.array = (np.array([], dtype=dtype),)
-    asks: np.array = (np.array([], dtype=dtype),)
-    timestamp: float = time()
-    timestamp_str: str = datetime.utcfromtimestamp(timestamp).strftime(
-        "%Y-%m-%d %H:%M:%S.%f"
-    )
+    bids: np.array = np.array([], dtype=dtype)
+    asks: np.array = np.array([], dtype=dtype)
+    # (units, decimals) of one tick / lot when the book is in integer mode
+    price_scale: tuple = None
+    quantity_scale: tuple = None
+    timestamp: float = 0.0
 
     def __init__(self, **kwargs):
         """
@@ -29,8 +43,13 @@ class Orderbook(
 
         :param kwargs: Arguments passed to the parent class (AbstractModel).
         """
+        self.timestamp = time()
         super().__init__(**kwargs)
 
+    @property
+    def timestamp_str(self):
+        return datetime.utcfromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")
+
     def __str__(self):
         """
         Returns a string representation of the Orderbook instance.
@@ -123,6 +142,79 @@ class Orderbook(
         else:
             raise ValueError("order_type must be either 'asks' or 'bids'.")
 
+    def set_book(self, order_type, book):
+        """
+        Replaces a side of the order book.
+
+        :param order_type: String either 'bids' or 'asks'.
+        :param book: Array or list of (price, quantity) levels, sorted like the side.
+        :raises ValueError: If the order_type is neither 'asks' nor 'bids'.
+        """
+        book = np.asarray(book, dtype=self.dtype)
+        if order_type in ["BUY", "buy", "asks"]:
+            self.asks = book
+        elif order_type in ["SELL", "sell", "bids"]:
+            self.bids = book
+        else:
+            raise ValueError("order_type must be either 'asks' or 'bids'.")
+
+    def set_integer_mode(self, tick_size: str, qty_step: str, int_dtype: str = "i8"):
+        """
+        Switches the book to integer mode: prices are stored as int tick counts
+        and quantities as int lot counts, which makes price equality exact and
+        comparisons and sorting cheaper. Existing levels are converted.
+
+        :param tick_size: Instrument tickSize as the exchange string.
+        :param qty_step: Instrument qtyStep (or basePrecision) as the exchange string.
+        :param int_dtype: 'i8', or 'i4' to halve memory when the counts fit.
+        """
+        bids = self.get_float_book("bids")
+        asks = self.get_float_book("asks")
+        self.price_scale = get_scale(tick_size)
+        self.quantity_scale = get_scale(qty_step)
+        self.dtype = [("price", int_dtype), ("quantity", int_dtype)]
+        self.set_book("bids", self.to_book_units(bids))
+        self.set_book("asks", self.to_book_units(asks))
+
+    def to_float(self, levels):
+        """
+        Converts integer-mode levels to float prices and quantities.
+
+        :param levels: Structured array of (price, quantity) in ticks and lots.
+        :return: Structured array with the float Orderbook.dtype.
+        """
+        result = np.empty(len(levels), dtype=Orderbook.dtype)
+        units, decimals = self.price_scale
+        result["price"] = levels["price"] * units / 10**decimals
+        units, decimals = self.quantity_scale
+        result["quantity"] = levels["quantity"] * units / 10**decimals
+        return result
+
+    def to_book_units(self, levels):
+        """
+        Converts float (price, quantity) levels to the units of this book:
+        unchanged in float mode, rounded to tick and lot counts in integer mode.
+        """
+        levels = np.asarray(levels)
+        if self.price_scale is None or levels.dtype == np.dtype(self.dtype):
+            return levels
+        result = np.empty(len(levels), dtype=self.dtype)
+        units, decimals = self.price_scale
+        result["price"] = np.rint(levels["price"] * 10**decimals / units)
+        units, decimals = self.quantity_scale
+        result["quantity"] = np.rint(levels["quantity"] * 10**decimals / units)
+        return result
+
+    def get_float_book(self, order_type):
+        """
+        Returns a side of the book with float prices and quantities, converting
+        it if the book is in integer mode.
+        """
+        book = self.get_book_type(order_type)
+        if self.price_scale is None:
+            return book
+        return self.to_float(book)
+
     def request_quote(
         self, order_type: str, position_size, position_side: str = None, fee=0
     ):
@@ -136,9 +228,9 @@ class Orderbook(
         :return: Tuple containing the resulting order book array, weighted price, and effective size.
         """
 
-        book = self.get_book_type(order_type)
+        book = self.get_float_book(order_type)
 
-        result_array = np.zeros(len(book), dtype=self.dtype)
+        result_array = np.zeros(len(book), dtype=Orderbook.dtype)
 
         if order_type == "BUY":
             prices = book["price"] * (1 + fee)
@@ -169,23 +261,23 @@ class Orderbook(
         Subtracts the quantities of my current orders from the order book.
 
         :param order_type: String indicating the type of order ('bids' or 'asks').
-        :param my_orders: Numpy array of my current orders.
+        :param my_orders: Numpy array of my current orders, in float or book units.
         :return: A new numpy array with the quantities adjusted.
         """
         book = self.get_book_type(order_type)
+        my_orders = self.to_book_units(my_orders)
 
         # Create a copy of the book to modify
         adjusted_book = book.copy()
 
-        for my_order in my_orders:
-            price = my_order["price"]
-            quantity = my_order["quantity"]
-
-            # Find matching price level in the book
-            match = adjusted_book[adjusted_book["price"] == price]
-            if match.size > 0:
-                # Subtract the quantity
-                adjusted_book["quantity"][adjusted_book["price"] == price] -= quantity
+        if len(my_orders) > 0 and len(adjusted_book) > 0:
+            # Aggregate my orders per price, then match every book level against
+            # them with a binary search instead of scanning the book per order
+            prices, inverse = np.unique(my_orders["price"], return_inverse=True)
+            quantities = np.bincount(inverse, weights=my_orders["quantity"]).astype(book["quantity"].dtype)
+            positions = np.searchsorted(prices, adjusted_book["price"]).clip(max=len(prices) - 1)
+            match = prices[positions] == adjusted_book["price"]
+            adjusted_book["quantity"][match] -= quantities[positions[match]]
 
         # Remove entries with non-positive quantities
         adjusted_book = adjusted_book[adjusted_book["quantity"] > 0]
@@ -0,0 +1,22 @@
+class Trade:
+    """
+    Represents a public trade on an exchange.
+
+    Trades are created for every publicTrade message, so they are slotted
+    rather than built on AbstractModel.
+    """
+
+    __slots__ = ("symbol", "side", "price", "quantity", "trade_id", "is_block_trade", "timestamp")
+
+    def __init__(self, symbol, side, price, quantity, trade_id="", is_block_trade=False, timestamp=0.0):
+        self.symbol = symbol
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.trade_id = trade_id
+        self.is_block_trade = is_block_trade
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return (f"Trade({self.symbol} {self.side} {self.quantity}@{self.price} "
+                f"id={self.trade_id} block={self.is_block_trade} ts={self.timestamp})")
@@ -0,0 +1,117 @@
+"""
+Checks that awaiting REST orders on AsyncBybitAccount does not delay the
+websocket feed handled on the same event loop, against a local aiohttp
+stand-in serving both a slow /v5/order/create and a public orderbook stream.
+The stand-in runs on its own loop in a thread, so messages keep being sent
+(and stamped) on time even if the client loop is blocked.
+"""
+import json
+import time
+import asyncio
+import threading
+
+from aiohttp import web
+
+from utils.bybit_async_account import AsyncBybitAccount
+from utils.bybit_public_websocket import BybitWebSocket
+
+ORDER_DELAY = 0.3
+MESSAGES = 200
+MESSAGE_INTERVAL = 0.005
+
+
+class StandIn:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.runner = None
+        self.port = None
+
+    async def create_order(self, request):
+        await request.read()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(ORDER_DELAY)
+        self.in_flight -= 1
+        return web.json_response({"retCode": 0, "retMsg": "OK", "result": {"orderId": "1", "orderLinkId": ""}})
+
+    async def stream(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.receive()
+        await ws.send_str(json.dumps({"topic": "orderbook.50.BTCUSDT", "type": "snapshot", "ts": 0, "data": {
+            "s": "BTCUSDT", "b": [["99.99", "1"]], "a": [["100.01", "1"]], "u": 1, "seq": 1}}))
+        for i in range(MESSAGES):
+            await asyncio.sleep(MESSAGE_INTERVAL)
+            await ws.send_str(json.dumps({"topic": "orderbook.50.BTCUSDT", "type": "delta", "ts": 0,
+                                          "sent_at": time.perf_counter(), "data": {
+                "s": "BTCUSDT", "b": [["99.99", str(1 + i % 5)]], "a": [], "u": i + 2, "seq": i + 2}}))
+        await ws.receive()
+        return ws
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_post("/v5/order/create", self.create_order)
+        app.router.add_get("/ws", self.stream)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", 0).start()
+        self.port = self.runner.addresses[0][1]
+
+    def start(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(timeout=5)
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+async def _feed_latencies(stand_in, orders):
+    ws = BybitWebSocket("spot")
+    ws.ws_url = f"ws://127.0.0.1:{stand_in.port}/ws"
+    ws.add_orderbook_stream("BTCUSDT", 50)
+    latencies = []
+
+    async def on_message(data):
+        if "sent_at" in data:
+            latencies.append(time.perf_counter() - data["sent_at"])
+            if len(latencies) == MESSAGES:
+                ws.stop_execution = True
+
+    ws.process_book_update = on_message
+
+    account = AsyncBybitAccount()
+    account.base_url = f"http://127.0.0.1:{stand_in.port}"
+    account.api_key, account.api_secret = "key", "secret"
+    async with account:
+        feed = asyncio.ensure_future(ws.start())
+        await asyncio.sleep(0.05)
+        responses = await asyncio.gather(
+            *[account.place_order("BTCUSDT", "Buy", "Limit", "0.001", "100") for _ in range(orders)]
+        )
+        await asyncio.wait_for(feed, timeout=10)
+    return latencies, responses
+
+
+def test_feed_latency_unaffected_by_in_flight_orders():
+    stand_in = StandIn()
+    stand_in.start()
+    try:
+        baseline, _ = asyncio.run(_feed_latencies(stand_in, orders=0))
+        loaded, responses = asyncio.run(_feed_latencies(stand_in, orders=20))
+    finally:
+        stand_in.stop()
+    max_in_flight = stand_in.max_in_flight
+
+    assert len(baseline) == len(loaded) == MESSAGES
+    assert all(response["retCode"] == 0 for response in responses)
+    # The orders really were in flight together, while the feed was running
+    assert max_in_flight == 20
+    # A blocking client would hold the loop for ORDER_DELAY on every order
+    assert max(loaded) < ORDER_DELAY / 3
+    assert sorted(loaded)[len(loaded) // 2] < sorted(baseline)[len(baseline) // 2] + 0.01
@@ -0,0 +1,76 @@
+import numpy as np
+
+from models.book_store import BookStore
+from models.orderbook import Orderbook
+from utils.bybit_orderbook import BybitStoreOrderbook
+
+
+def _levels(prices, quantities):
+    return np.array(list(zip(prices, quantities)), dtype=Orderbook.dtype)
+
+
+def test_deeper_book_grows_the_store_instead_of_truncating():
+    store = BookStore(capacity=2, depth=4)
+    first = store.add_symbol("BTCUSDT")
+    second = store.add_symbol("ETHUSDT")
+    store.set_book(second, "asks", _levels([10, 11], [1, 2]))
+    deep = _levels(100 - np.arange(10), np.arange(1, 11))
+    store.set_book(first, "bids", deep)
+    assert store.depth >= 10
+    assert np.array_equal(store.get_book(first, "bids"), deep)
+    assert np.array_equal(store.get_book(second, "asks"), _levels([10, 11], [1, 2]))
+
+
+def test_views_alias_the_row_until_a_resize():
+    store = BookStore(capacity=1, depth=4)
+    row = store.add_symbol("BTCUSDT")
+    store.set_book(row, "bids", _levels([100, 99], [1, 2]))
+    view = store.get_book(row, "bids")
+    store.set_book(row, "bids", _levels([101, 100], [3, 4]))
+    # Same buffer: the old view sees the new levels (over its old length)
+    assert view["price"].tolist() == [101, 100]
+    store.add_symbol("ETHUSDT")
+    store.set_book(row, "bids", _levels([102], [5]))
+    assert view["price"].tolist() == [101, 100]
+    assert store.get_book(row, "bids")["price"].tolist() == [102]
+
+
+def test_cross_symbol_metrics_match_per_book_values():
+    rng = np.random.default_rng(0)
+    store = BookStore(capacity=2, depth=8)
+    books = {}
+    for i, symbol in enumerate(["AUSDT", "BUSDT", "CUSDT", "DUSDT"]):
+        size = 3 + i
+        bids = _levels(100 - np.arange(size), rng.uniform(1, 5, size))
+        asks = _levels(101 + np.arange(size), rng.uniform(1, 5, size))
+        row = store.add_symbol(symbol)
+        store.set_book(row, "bids", bids)
+        store.set_book(row, "asks", asks)
+        books[symbol] = (bids, asks)
+    empty = store.add_symbol("EUSDT")
+    store.set_book(empty, "asks", _levels([5], [1]))
+
+    bid_depth = [bids["quantity"][:5].sum() for bids, _ in books.values()] + [0]
+    ask_depth = [asks["quantity"][:5].sum() for _, asks in books.values()] + [1]
+    notional = [(bids["quantity"][:2] * bids["price"][:2]).sum() for bids, _ in books.values()] + [0]
+    assert np.array_equal(store.best_bids(), [100] * 4 + [np.nan], equal_nan=True)
+    assert np.array_equal(store.best_asks(), [101] * 4 + [5])
+    assert np.allclose(store.spreads()[:4], 1) and np.isnan(store.spreads()[4])
+    assert np.allclose(store.mids()[:4], 100.5)
+    assert np.allclose(store.depth_sums("bids", 5), bid_depth)
+    assert np.allclose(store.depth_sums("asks", 5), ask_depth)
+    assert np.allclose(store.depth_sums("bids", 2, notional=True), notional)
+    expected = (np.array(bid_depth) - ask_depth) / (np.array(bid_depth) + ask_depth)
+    assert np.allclose(store.imbalances(5), expected)
+    assert store.bids_array().shape == (5, store.depth, 2)
+    assert store.bids_array()[0, 0].tolist() == [100, books["AUSDT"][0]["quantity"][0]]
+
+
+def test_store_orderbook_keeps_its_levels_across_a_resize():
+    store = BookStore(capacity=1, depth=2)
+    book = BybitStoreOrderbook(store, symbol="BTCUSDT")
+    book.process_update_message({"type": "snapshot", "ts": 0, "data": {
+        "u": 1, "b": [["99.9", "1"], ["99.8", "2"], ["99.7", "3"]], "a": [["100.1", "1"]]}})
+    BybitStoreOrderbook(store, symbol="ETHUSDT")
+    assert book.bids["price"].tolist() == [99.9, 99.8, 99.7]
+    assert book.get_bbo() == (99.9, 1.0, 100.1, 1.0)
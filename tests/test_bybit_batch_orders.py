@@ -0,0 +1,79 @@
+import json
+import asyncio
+
+from utils.bybit_async_account import AsyncBybitAccount
+
+
+class BatchAccount(AsyncBybitAccount):
+    """
+    Account answering batch requests locally: each chunk gets its items
+    back in order, except the chunks listed in ``replies``.
+    """
+
+    def __init__(self, replies=None):
+        super().__init__()
+        self.replies = replies or {}
+        self.chunks = []
+
+    async def _signed_post(self, endpoint, params):
+        index = len(self.chunks)
+        self.chunks.append(params)
+        await asyncio.sleep(0.01 * (index % 3))
+        if index in self.replies:
+            reply = self.replies[index]
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+        items = [{"orderId": f"id-{request['orderLinkId']}", "orderLinkId": request["orderLinkId"]}
+                 for request in params["request"]]
+        infos = [{"code": 170131 if request["qty"] == "0" else 0, "msg": "Insufficient balance"
+                  if request["qty"] == "0" else "OK"} for request in params["request"]]
+        return 200, json.dumps({"retCode": 0, "retMsg": "OK", "result": {"list": items},
+                                "retExtInfo": {"list": infos}})
+
+
+def _orders(count):
+    return [{"symbol": "BTCUSDT", "side": "Buy", "orderType": "Limit", "qty": i % 7, "price": 60000 + i,
+             "orderLinkId": f"link-{i}"} for i in range(count)]
+
+
+def test_orders_are_chunked_by_category_limit_and_mapped_back():
+    for category, limit in [("spot", 10), ("linear", 20)]:
+        account = BatchAccount()
+        results = asyncio.run(account.place_orders(_orders(45), category))
+        assert [len(chunk["request"]) for chunk in account.chunks] == [limit] * (45 // limit) + [45 % limit]
+        assert all(chunk["category"] == category for chunk in account.chunks)
+        assert [result["request"]["orderLinkId"] for result in results] == [f"link-{i}" for i in range(45)]
+        for i, result in enumerate(results):
+            assert result["result"]["orderId"] == f"id-link-{i}"
+            assert result["request"]["price"] == str(60000 + i)
+            assert result["retCode"] == (170131 if i % 7 == 0 else 0)
+
+
+def test_bad_chunk_replies_only_fail_their_own_orders():
+    replies = {1: (200, '{"retCode": 0, "result": {"li'), 2: (200, "<html>Bad Gateway</html>"),
+               3: (502, "Bad Gateway"), 4: ConnectionError("reset by peer")}
+    account = BatchAccount(replies)
+    results = asyncio.run(account.place_orders(_orders(60), "spot"))
+    assert len(results) == 60
+    for i, result in enumerate(results):
+        chunk = i // 10
+        assert result["request"]["orderLinkId"] == f"link-{i}"
+        if chunk in (1, 2):
+            assert result["retCode"] == -1 and result["result"] is None
+            assert result["retMsg"].startswith("Invalid response body")
+        elif chunk == 3:
+            assert result["retCode"] == 502 and result["retMsg"] == "Bad Gateway"
+        elif chunk == 4:
+            assert result["retCode"] == -1 and result["retMsg"] == "reset by peer"
+        else:
+            assert result["result"]["orderId"] == f"id-link-{i}"
+
+
+def test_orders_without_link_id_get_one():
+    account = BatchAccount()
+    orders = [{key: value for key, value in order.items() if key != "orderLinkId"} for order in _orders(3)]
+    results = asyncio.run(account.place_orders(orders))
+    link_ids = [result["request"]["orderLinkId"] for result in results]
+    assert len(set(link_ids)) == 3
+    assert [result["result"]["orderLinkId"] for result in results] == link_ids
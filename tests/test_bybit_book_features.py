@@ -0,0 +1,31 @@
+import numpy as np
+
+from benchmarks.stand_ins import synthetic_frames
+from utils.bybit_orderbook import BybitOrderbook
+from utils.bybit_book_features import BybitBookFeatures
+
+
+def _assert_matches_recompute(book):
+    recomputed = BybitBookFeatures()
+    recomputed.reset(book)
+    expected = recomputed.to_dict()
+    for name, value in book.features.to_dict().items():
+        assert np.isclose(value, expected[name], rtol=1e-9, atol=1e-6, equal_nan=True), name
+
+
+def test_repeated_price_in_a_delta_is_applied_once():
+    book = BybitOrderbook(symbol="BTCUSDT")
+    book.attach_features(BybitBookFeatures())
+    book.process_update_message({"type": "snapshot", "ts": 0, "data": {
+        "u": 1, "b": [["99.90", "1"], ["99.80", "2"]], "a": [["100.10", "1"], ["100.20", "2"]]}})
+    book.process_update_message({"type": "delta", "ts": 1, "data": {
+        "u": 2, "b": [["99.80", "5"], ["99.80", "7"]], "a": [["100.20", "0"], ["100.20", "3"]]}})
+    _assert_matches_recompute(book)
+
+
+def test_incremental_features_match_a_recompute():
+    book = BybitOrderbook(symbol="BTCUSDT")
+    book.attach_features(BybitBookFeatures())
+    for frame in synthetic_frames(["BTCUSDT"], messages=3000):
+        book.process_update_message(frame)
+        _assert_matches_recompute(book)
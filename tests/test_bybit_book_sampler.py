@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import asyncio
+import threading
+import numpy as np
+
+from utils import bybit_book_sampler
+from utils.bybit_orderbook import BybitOrderbook
+from utils.bybit_book_sampler import BybitBookSampler
+
+SNAPSHOT = {"type": "snapshot", "ts": 0, "data": {
+    "u": 1, "b": [["99.90", "1.5"], ["99.80", "2"]], "a": [["100.10", "0.25"], ["100.20", "2"]]}}
+
+
+def _book(**kwargs):
+    book = BybitOrderbook(symbol="BTCUSDT", **kwargs)
+    book.process_update_message(SNAPSHOT)
+    return book
+
+
+def test_integer_mode_books_are_sampled_as_floats(tmp_path):
+    books = {"BTCUSDT": _book(tick_size="0.01", qty_step="0.0001"), "ETHUSDT": _book()}
+    sampler = BybitBookSampler(books, ["BTCUSDT", "ETHUSDT"], str(tmp_path), levels=3, chunk_size=4)
+    sampler.sample(1.0)
+    row = sampler.buffer[0]
+    assert np.array_equal(row[0], row[1], equal_nan=True)
+    assert np.allclose(row[0, :2], [[99.90, 1.5, 100.10, 0.25], [99.80, 2, 100.20, 2]])
+    assert np.isnan(row[0, 2]).all()
+
+
+def test_stop_does_not_block_the_event_loop(tmp_path):
+    sampler = BybitBookSampler({"BTCUSDT": _book()}, ["BTCUSDT"], str(tmp_path), chunk_size=4)
+    write_chunks = sampler._write_chunks
+
+    def slow_write_chunks():
+        time.sleep(0.3)
+        write_chunks()
+
+    sampler._write_chunks = slow_write_chunks
+
+    async def main():
+        sampler.sample(1.0)
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0.02)
+        await sampler.stop()
+        ticker.cancel()
+        return max(np.diff(ticks))
+
+    assert asyncio.run(main()) < 0.1
+    assert np.load(tmp_path / "l2_000000.npy").shape == (1, 1, 10, 4)
+
+
+def test_files_are_only_touched_by_the_writer_thread(tmp_path, monkeypatch):
+    output_dir = tmp_path / "nested" / "l2"
+    sampler = BybitBookSampler({"BTCUSDT": _book()}, ["BTCUSDT"], str(output_dir), levels=2, chunk_size=2)
+    threads = []
+    makedirs = os.makedirs
+
+    def recording_makedirs(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return makedirs(*args, **kwargs)
+
+    monkeypatch.setattr(bybit_book_sampler.os, "makedirs", recording_makedirs)
+
+    async def main():
+        for timestamp in [1.0, 2.0, 3.0]:
+            sampler.sample(timestamp)
+        await sampler.stop()
+
+    asyncio.run(main())
+    assert threads and threading.main_thread() not in threads
+    with open(output_dir / "l2_meta.json") as f:
+        assert json.load(f)["symbols"] == ["BTCUSDT"]
+    assert np.load(output_dir / "l2_000000.npy").shape == (2, 1, 2, 4)
+    assert np.load(output_dir / "l2_000001_timestamps.npy").tolist() == [3.0]
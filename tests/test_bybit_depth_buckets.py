@@ -0,0 +1,58 @@
+import copy
+import numpy as np
+
+from benchmarks.stand_ins import synthetic_frames
+from utils.bybit_orderbook import BybitOrderbook
+from utils.bybit_depth_buckets import BybitDepthBuckets
+
+
+def _assert_matches_recompute(book):
+    buckets = book.depth_buckets
+    recomputed = copy.deepcopy(buckets)
+    recomputed.rebuild(book)
+    for side in ["bids", "asks"]:
+        assert np.allclose(buckets.quantity[side], recomputed.quantity[side], rtol=0, atol=1e-9), side
+        assert np.allclose(buckets.notional[side], recomputed.notional[side], rtol=0, atol=1e-7), side
+
+
+def _book(**kwargs):
+    book = BybitOrderbook(symbol="BTCUSDT")
+    book.attach_depth_buckets(BybitDepthBuckets(**kwargs))
+    return book
+
+
+def test_repeated_price_in_a_delta_is_applied_once():
+    book = _book(width=1.0, range_bps=50.0)
+    book.process_update_message({"type": "snapshot", "ts": 0, "data": {
+        "u": 1, "b": [["99.99", "1"], ["99.90", "2"]], "a": [["100.01", "1"], ["100.10", "2"]]}})
+    book.process_update_message({"type": "delta", "ts": 1, "data": {
+        "u": 2, "b": [["99.90", "5"], ["99.90", "7"]], "a": [["100.10", "0"], ["100.10", "3"]]}})
+    _assert_matches_recompute(book)
+
+
+def test_incremental_buckets_match_a_recompute():
+    book = _book(width=1.0, range_bps=100.0)
+    for frame in synthetic_frames(["BTCUSDT"], depth=200, messages=3000):
+        book.process_update_message(frame)
+        _assert_matches_recompute(book)
+    buckets = book.depth_buckets
+    # The mid walked far enough to re-anchor several times
+    assert buckets.anchors > 1
+    mid = (book.bids["price"][0] + book.asks["price"][0]) / 2
+    assert abs(mid - buckets.anchor) <= buckets.price_width
+
+
+def test_buckets_match_a_histogram_after_reset():
+    book = _book(width=2.0, range_bps=100.0)
+    for frame in synthetic_frames(["BTCUSDT"], depth=200, messages=500):
+        book.process_update_message(frame)
+    buckets = book.depth_buckets
+    buckets.reset(book)
+    for side, sign in [("bids", -1), ("asks", 1)]:
+        levels = book.get_book_type(side)
+        edges = sign * (buckets.edges(side) - buckets.anchor)
+        offsets = sign * (levels["price"] - buckets.anchor)
+        expected, _ = np.histogram(offsets, bins=edges, weights=levels["quantity"])
+        # Levels on the wrong side of the anchor count in bucket 0
+        expected[0] += levels["quantity"][offsets < 0].sum()
+        assert np.allclose(buckets.quantity[side], expected)
@@ -0,0 +1,101 @@
+import asyncio
+import numpy as np
+
+from utils.bybit_feed_manager import BybitFeedManager
+
+
+def _book_message(symbol, u, bids, asks, kind="delta"):
+    return {"topic": f"orderbook.50.{symbol}", "type": kind, "ts": 0,
+            "data": {"s": symbol, "u": u, "b": bids, "a": asks}}
+
+
+def _ticker_message(symbol, funding_rate):
+    return {"topic": f"tickers.{symbol}", "type": "delta", "ts": 0,
+            "data": {"symbol": symbol, "fundingRate": funding_rate}}
+
+
+async def _deliver(manager, category, data):
+    # Same dispatch as BybitWebSocket.connect_to_stream
+    ws = manager.sockets[category]
+    bbo = ws.on_message(data)
+    if bbo is not None and ws.process_bbo_update is not None:
+        await ws.process_bbo_update(bbo)
+    await ws.process_book_update(data)
+
+
+def _manager():
+    now = [1000.0]
+    manager = BybitFeedManager(capacity=1, clock=lambda: now[0])
+    published = []
+
+    async def on_basis(key, values):
+        published.append((key, values))
+
+    manager.process_basis_update = on_basis
+    return manager, now, published
+
+
+def test_basis_across_spot_and_linear_books():
+    manager, now, published = _manager()
+    key = manager.add_basis("BTC")
+    assert key == ("BTC", "linear")
+    assert ("spot", "BTCUSDT") in manager.books and ("linear", "BTCUSDT") in manager.books
+
+    async def main():
+        await _deliver(manager, "spot", _book_message("BTCUSDT", 1, [["99.9", "1"]], [["100.1", "1"]], "snapshot"))
+        now[0] += 0.25
+        await _deliver(manager, "linear", _book_message("BTCUSDT", 1, [["100.4", "2"]], [["100.6", "2"]], "snapshot"))
+        await _deliver(manager, "linear", _ticker_message("BTCUSDT", "0.0001"))
+
+    asyncio.run(main())
+    values = manager.get("BTC")
+    assert values["spot_bid"] == 99.9 and values["derivative_ask"] == 100.6
+    assert np.isclose(values["basis_bps"], 50.0)
+    assert np.isclose(values["funding_adjusted_bps"], 49.0)
+    assert np.isclose(values["carry_bps"], (100.4 - 100.1) / 100 * 1e4)
+    assert np.isclose(values["reverse_carry_bps"], (99.9 - 100.6) / 100 * 1e4)
+    assert np.isclose(values["leg_lag_ms"], 250.0)
+    assert values["updated_at"] == now[0]
+    # One publication per leg update and per funding update
+    assert [key for key, _ in published] == [("BTC", "linear")] * 3
+    assert published[-1][1] == values
+
+
+def test_missing_legs_give_nan_until_both_are_known():
+    manager, _, published = _manager()
+    manager.add_basis("BTC")
+    manager.add_basis("ETH")
+    assert manager.capacity >= 2
+
+    async def main():
+        await _deliver(manager, "spot", _book_message("BTCUSDT", 1, [["99.9", "1"]], [["100.1", "1"]], "snapshot"))
+        await _deliver(manager, "linear", _book_message("ETHUSDT", 1, [["10.0", "1"]], [], "snapshot"))
+
+    asyncio.run(main())
+    btc = manager.get("BTC")
+    assert btc["spot_bid"] == 99.9 and np.isnan(btc["derivative_bid"])
+    assert np.isnan(btc["basis_bps"]) and np.isnan(btc["carry_bps"])
+    eth = manager.get("ETH")
+    # An empty ask side is a missing leg too
+    assert eth["derivative_bid"] == 10.0 and np.isnan(eth["derivative_ask"])
+    assert np.isnan(eth["basis_bps"])
+    assert manager.get("SOL") is None
+    assert manager.column("basis_bps").shape == (2,)
+    assert len(published) == 2
+
+
+def test_funding_without_books_and_inverse_symbols():
+    manager, _, _ = _manager()
+    key = manager.add_basis("BTC", derivative="inverse")
+    assert ("inverse", "BTCUSD") in manager.books
+
+    async def main():
+        await _deliver(manager, "inverse", _ticker_message("BTCUSD", "0.0002"))
+        await _deliver(manager, "spot", _book_message("BTCUSDT", 1, [["99.9", "1"]], [["100.1", "1"]], "snapshot"))
+        await _deliver(manager, "inverse", _book_message("BTCUSD", 1, [["100.0", "5"]], [["100.2", "5"]], "snapshot"))
+
+    asyncio.run(main())
+    values = manager.get(*key)
+    assert values["funding_rate"] == 0.0002
+    assert np.isclose(values["basis_bps"], 10.0)
+    assert np.isclose(values["funding_adjusted_bps"], 8.0)
@@ -0,0 +1,68 @@
+import os
+import asyncio
+import pytest
+
+from utils.bybit_instruments import BybitInstrumentRegistry
+
+BTCUSDT = {
+    "symbol": "BTCUSDT",
+    "baseCoin": "BTC",
+    "quoteCoin": "USDT",
+    "priceFilter": {"tickSize": "0.01"},
+    "lotSizeFilter": {"basePrecision": "0.000001", "minOrderQty": "0.000048", "maxOrderQty": "71.73956243",
+                      "minOrderAmt": "1"},
+}
+
+
+class FakeMarketApi:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    async def get_all_instruments_info(self, category):
+        self.calls.append(category)
+        return self.responses[category]
+
+
+def _ok(instruments):
+    return {"retCode": 0, "retMsg": "OK", "result": {"category": "spot", "list": instruments, "nextPageCursor": ""}}
+
+
+def test_load_persists_successful_fetch(tmp_path):
+    cache_path = str(tmp_path / "instruments.json")
+    registry = BybitInstrumentRegistry(FakeMarketApi({"spot": _ok([BTCUSDT])}), cache_path=cache_path)
+    tables = asyncio.run(registry.load(["spot"]))
+    assert "BTCUSDT" in tables["spot"]
+    assert os.path.exists(cache_path)
+
+    reloaded = BybitInstrumentRegistry(FakeMarketApi({}), cache_path=cache_path)
+    assert reloaded.is_fresh("spot")
+    assert reloaded.get("BTCUSDT")["baseCoin"] == "BTC"
+
+
+@pytest.mark.parametrize("response", [
+    {"retCode": 10006, "retMsg": "Too many visits!", "result": {}},
+    {"retCode": 0, "retMsg": "OK", "result": {}},
+])
+def test_load_raises_on_error_payload_and_does_not_cache(tmp_path, response):
+    cache_path = str(tmp_path / "instruments.json")
+    registry = BybitInstrumentRegistry(FakeMarketApi({"spot": response}), cache_path=cache_path)
+    with pytest.raises(Exception, match="Error fetching spot instruments"):
+        asyncio.run(registry.load(["spot"]))
+    assert "spot" not in registry.tables
+    assert not os.path.exists(cache_path)
+
+
+def test_failed_category_keeps_previous_table(tmp_path):
+    cache_path = str(tmp_path / "instruments.json")
+    registry = BybitInstrumentRegistry(FakeMarketApi({"spot": _ok([BTCUSDT])}), cache_path=cache_path)
+    asyncio.run(registry.load(["spot"]))
+
+    registry.market_api = FakeMarketApi({
+        "spot": {"retCode": 10016, "retMsg": "Server error", "result": {}},
+        "linear": _ok([]),
+    })
+    with pytest.raises(Exception):
+        asyncio.run(registry.load(["spot", "linear"], force=True))
+    assert "BTCUSDT" in registry.table("spot")
+    assert "linear" in registry.tables
@@ -0,0 +1,105 @@
+import numpy as np
+
+from utils.bybit_orderbook import BybitOrderbook
+from utils.bybit_order_manager import BybitOrderManager
+
+
+def _levels(prices, quantities):
+    return [[f"{price:.2f}", f"{quantity:.4f}"] for price, quantity in zip(prices, quantities)]
+
+
+def _book(rng):
+    book = BybitOrderbook(symbol="BTCUSDT")
+    offsets = np.arange(1, 51) * 0.01
+    book.process_update_message({"type": "snapshot", "ts": 0, "data": {
+        "u": 1, "b": _levels(100 - offsets, rng.uniform(1, 5, 50)), "a": _levels(100 + offsets, rng.uniform(1, 5, 50))}})
+    return book
+
+
+def _events(manager, rng, count):
+    for i in range(count):
+        side = "Buy" if rng.random() < 0.5 else "Sell"
+        offset = rng.integers(1, 60) * 0.01
+        price = round(100 - offset if side == "Buy" else 100 + offset, 2)
+        order = manager.track_pending("BTCUSDT", side, round(rng.uniform(0.1, 2), 4), price)
+        manager.on_rest_response({"retCode": 0, "result": {"orderId": str(i), "orderLinkId": order.order_link_id}})
+        for other in list(manager.get_open_orders("BTCUSDT")):
+            roll = rng.random()
+            if roll < 0.1:
+                status = "Cancelled"
+            elif roll < 0.2:
+                status = "PartiallyFilled"
+            else:
+                continue
+            manager.on_order_update({
+                "orderId": other.order_id, "orderLinkId": other.order_link_id, "symbol": "BTCUSDT",
+                "side": other.side, "price": str(other.price), "qty": str(other.qty), "orderStatus": status,
+                "cumExecQty": str(round(other.filled_qty + other.remaining / 2, 6)), "updatedTime": str(i + 1),
+            })
+            break
+
+
+def test_own_orders_stay_equal_to_a_rebuild():
+    rng = np.random.default_rng(0)
+    manager = BybitOrderManager()
+    for side in ["bids", "asks"]:
+        manager.own_orders("BTCUSDT", side)
+    for _ in range(50):
+        _events(manager, rng, 5)
+        for side in ["bids", "asks"]:
+            incremental = manager.own_orders("BTCUSDT", side).copy()
+            manager._own_books.pop(("BTCUSDT", side))
+            rebuilt = manager.own_orders("BTCUSDT", side)
+            assert np.array_equal(incremental["price"], rebuilt["price"])
+            assert np.allclose(incremental["quantity"], rebuilt["quantity"])
+
+
+def test_subtract_from_matches_remove_orders():
+    rng = np.random.default_rng(1)
+    book = _book(rng)
+    manager = BybitOrderManager()
+    for _ in range(20):
+        _events(manager, rng, 5)
+        for side in ["bids", "asks"]:
+            expected = book.remove_orders(side, manager.own_orders("BTCUSDT", side))
+            adjusted = manager.subtract_from(book, side)
+            assert np.array_equal(adjusted["price"], expected["price"])
+            assert np.allclose(adjusted["quantity"], expected["quantity"])
+
+
+def _update(order, status, updated_time, filled="0"):
+    return {"orderId": order.order_id, "orderLinkId": order.order_link_id, "symbol": "BTCUSDT", "side": order.side,
+            "price": str(order.price), "qty": str(order.qty), "orderStatus": status, "cumExecQty": filled,
+            "updatedTime": updated_time}
+
+
+def _acked_order(manager):
+    order = manager.track_pending("BTCUSDT", "Buy", 1.0, 100.0)
+    manager.on_rest_response({"retCode": 0, "result": {"orderId": "1", "orderLinkId": order.order_link_id}})
+    return order
+
+
+def test_late_update_does_not_reopen_a_cancelled_order():
+    for late_time in ["5", "4", "", None]:
+        manager = BybitOrderManager()
+        order = _acked_order(manager)
+        manager.on_order_update(_update(order, "New", "3"))
+        manager.on_order_update(_update(order, "Cancelled", "5"))
+        manager.on_order_update(_update(order, "New", late_time))
+        assert order.status == "cancelled"
+        assert manager.get_open_orders() == []
+        assert len(manager.own_orders("BTCUSDT", "bids")) == 0
+
+
+def test_equal_updated_time_does_not_move_an_order_backwards():
+    manager = BybitOrderManager()
+    order = _acked_order(manager)
+    manager.on_order_update(_update(order, "PartiallyFilled", "5", "0.4"))
+    manager.on_order_update(_update(order, "New", "5"))
+    assert order.status == "partial" and order.filled_qty == 0.4
+    manager.on_order_update(_update(order, "PartiallyFilled", "5", "0.2"))
+    assert order.filled_qty == 0.4
+    manager.on_order_update(_update(order, "PartiallyFilled", "5", "0.7"))
+    assert order.filled_qty == 0.7
+    own_book = manager.own_orders("BTCUSDT", "bids")
+    assert own_book["price"].tolist() == [100.0] and np.allclose(own_book["quantity"], [0.3])
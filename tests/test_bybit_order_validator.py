@@ -0,0 +1,122 @@
+import json
+import asyncio
+import numpy as np
+import pytest
+from decimal import ROUND_FLOOR, ROUND_CEILING
+
+from utils.bybit_instruments import BybitInstrumentRegistry
+from utils.bybit_async_account import AsyncBybitAccount
+from utils.bybit_order_validator import BybitOrderValidator, _round_units
+
+BTCUSDT = {
+    "symbol": "BTCUSDT",
+    "baseCoin": "BTC",
+    "quoteCoin": "USDT",
+    "priceFilter": {"tickSize": "0.01"},
+    "lotSizeFilter": {
+        "basePrecision": "0.000001",
+        "quotePrecision": "0.00000001",
+        "minOrderQty": "0.000048",
+        "maxOrderQty": "71.73956243",
+        "minOrderAmt": "1",
+        "maxOrderAmt": "2000000",
+    },
+}
+ETHUSDT = {
+    "symbol": "ETHUSDT",
+    "baseCoin": "ETH",
+    "quoteCoin": "USDT",
+    "priceFilter": {"tickSize": "0.05"},
+    "lotSizeFilter": {"qtyStep": "0.1", "minOrderQty": "0.3", "maxOrderQty": "100", "minOrderAmt": "5"},
+}
+
+
+@pytest.fixture
+def validator():
+    registry = BybitInstrumentRegistry(cache_path=None)
+    registry.update("spot", [BTCUSDT, ETHUSDT])
+    return BybitOrderValidator(registry, "spot")
+
+
+def test_limit_order_is_rounded_to_tick_and_step(validator):
+    assert validator.validate("BTCUSDT", "Buy", 0.0012345678, 60000.129) == ("0.001234", "60000.12")
+    assert validator.validate("BTCUSDT", "Sell", "0.001", "60000.121") == ("0.001000", "60000.13")
+
+
+def test_spot_market_buy_is_sized_in_quote_coin(validator):
+    # Buying 100 USDT of BTC is far above maxOrderQty in BTC but a valid order value
+    assert validator.validate("BTCUSDT", "Buy", 100, None, "Market") == ("100.00000000", None)
+    assert validator.validate("BTCUSDT", "Buy", "100.123456789", None, "Market", "quoteCoin") == \
+        ("100.12345678", None)
+    with pytest.raises(ValueError, match="minOrderAmt"):
+        validator.validate("BTCUSDT", "Buy", "0.5", None, "Market")
+    with pytest.raises(ValueError, match="maxOrderAmt"):
+        validator.validate("BTCUSDT", "Buy", "3000000", None, "Market")
+
+
+def test_spot_market_buy_in_base_coin_and_market_sell_use_base_filters(validator):
+    assert validator.validate("BTCUSDT", "Buy", "0.0012345", None, "Market", "baseCoin") == ("0.001234", None)
+    with pytest.raises(ValueError, match="maxOrderQty"):
+        validator.validate("BTCUSDT", "Buy", 100, None, "Market", "baseCoin")
+    with pytest.raises(ValueError, match="maxOrderQty"):
+        validator.validate("BTCUSDT", "Sell", 100, None, "Market")
+
+
+def test_place_order_passes_market_unit_to_validator(validator):
+    account = AsyncBybitAccount(validator=validator)
+    sent = {}
+
+    async def signed_post(endpoint, params):
+        sent.update(params)
+        return 200, json.dumps({"retCode": 0})
+
+    account._signed_post = signed_post
+    asyncio.run(account.place_order("BTCUSDT", "Buy", "Market", 100))
+    assert sent["qty"] == "100.00000000"
+
+
+def test_ladder_snaps_exactly_at_boundaries(validator):
+    # 0.3 / 0.1 and 0.15 / 0.05 are just below whole numbers in binary floating point
+    qtys, prices, valid = validator.validate_ladder("ETHUSDT", "Buy", [0.3, 0.7, 0.29, 100.0, 100.1],
+                                                    [0.15, 30.0, 3000.0, 3000.0, 3000.0])
+    assert qtys == ["0.3", "0.7", "0.2", "100.0", "100.1"]
+    assert prices == ["0.15", "30.00", "3000.00", "3000.00", "3000.00"]
+    # 0.3 * 0.15 is below the 5 USDT min order value, 0.2 is below minOrderQty, 100.1 above maxOrderQty
+    assert valid.tolist() == [False, True, False, True, False]
+
+
+def test_ladder_does_not_round_up_values_just_below_a_step(validator):
+    below = np.nextafter(0.3, 0)
+    qtys, prices, _ = validator.validate_ladder("ETHUSDT", "Sell", [below, 0.3], [np.nextafter(30.05, 31), 30.05])
+    assert qtys == [validator.round_qty("ETHUSDT", below), "0.3"] == ["0.2", "0.3"]
+    assert prices == ["30.10", "30.05"]
+
+
+def test_ladder_matches_single_order_validation(validator):
+    rng = np.random.default_rng(0)
+    qtys = np.round(rng.uniform(0, 2, 500), 4)
+    prices = np.round(rng.uniform(1, 100, 500), 3)
+    for side in ["Buy", "Sell"]:
+        ladder_qtys, ladder_prices, valid = validator.validate_ladder("ETHUSDT", side, qtys, prices)
+        for qty, price, qty_str, price_str, ok in zip(qtys, prices, ladder_qtys, ladder_prices, valid):
+            try:
+                expected = validator.validate("ETHUSDT", side, qty, price)
+            except ValueError:
+                assert not ok
+                continue
+            assert ok and (qty_str, price_str) == expected
+
+
+def test_array_rounding_matches_decimal_rounding():
+    rng = np.random.default_rng(1)
+    grid = np.arange(0, 20001) / 1000
+    noisy = np.concatenate([grid, grid * 3 / 3, np.cumsum(np.full(2000, 0.001)), rng.uniform(0, 20, 2000),
+                            np.nextafter(grid, 0), np.nextafter(grid, 30)])
+    for decimals, step in [(3, 1), (2, 5), (0, 1), (6, 10)]:
+        for rounding in [ROUND_FLOOR, ROUND_CEILING]:
+            expected = [BybitOrderValidator._round(value, decimals, step, rounding) for value in noisy]
+            assert _round_units(noisy, decimals, step, rounding).tolist() == expected
+    strings = [f"{value:.3f}" for value in grid[::7]]
+    assert _round_units(strings, 3, 1, ROUND_FLOOR).tolist() == [int(value.replace(".", "")) for value in strings]
+    with pytest.raises(ValueError):
+        _round_units([1e20], 3, 1, ROUND_FLOOR)
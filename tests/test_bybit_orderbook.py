@@ -0,0 +1,32 @@
+from utils.bybit_orderbook import BybitOrderbook
+
+
+def _book():
+    book = BybitOrderbook(symbol="BTCUSDT")
+    book.process_update_message({"type": "snapshot", "ts": 0, "data": {
+        "u": 1, "b": [["99.90", "1"], ["99.80", "2"]], "a": [["100.10", "1"], ["100.20", "2"]]}})
+    return book
+
+
+def test_bbo_change_is_flagged():
+    book = _book()
+    event = book.process_update_message({"type": "delta", "ts": 1, "data": {"u": 2, "b": [["99.95", "1"]], "a": []}})
+    assert event is not None and book.bbo_changed
+    event = book.process_update_message({"type": "delta", "ts": 2, "data": {"u": 3, "b": [["99.80", "3"]], "a": []}})
+    assert event is None and not book.bbo_changed
+
+
+def test_sequence_gap_resets_bbo_changed():
+    book = _book()
+    book.process_update_message({"type": "delta", "ts": 1, "data": {"u": 2, "b": [["99.95", "1"]], "a": []}})
+    assert book.bbo_changed
+    event = book.process_update_message({"type": "delta", "ts": 2, "data": {"u": 5, "b": [["99.99", "1"]], "a": []}})
+    assert event is None and not book.bbo_changed
+    assert book.get_bbo()[0] == 99.95
+
+
+def test_message_without_update_id_resets_bbo_changed():
+    book = _book()
+    book.process_update_message({"type": "delta", "ts": 1, "data": {"u": 2, "b": [["99.95", "1"]], "a": []}})
+    event = book.process_update_message({"type": "delta", "ts": 2, "data": {"b": [], "a": []}})
+    assert event is None and not book.bbo_changed
@@ -0,0 +1,135 @@
+import json
+import asyncio
+
+from aiohttp import web
+
+from utils.bybit_async_account import AsyncBybitAccount
+from utils.bybit_private_websocket import BybitPrivateWebSocket
+
+# Exchange clock of the stand-ins, in milliseconds
+SERVER_TIME = 1700000000000
+
+
+class PrivateStandIn:
+    """
+    Local /v5/private endpoint: rejects the first ``reject_auth`` auth
+    attempts, then sends one wallet update after the subscribe.
+    """
+
+    def __init__(self, reject_auth: int = 0, wallet_time: int = SERVER_TIME + 500):
+        self.reject_auth = reject_auth
+        self.wallet_time = wallet_time
+        self.auth_attempts = 0
+        self.runner = None
+        self.url = None
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            data = json.loads(message.data)
+            if data["op"] == "auth":
+                self.auth_attempts += 1
+                rejected = self.auth_attempts <= self.reject_auth
+                await ws.send_str(json.dumps({"op": "auth", "success": not rejected,
+                                              "ret_msg": "Invalid sign" if rejected else ""}))
+                if rejected:
+                    await ws.close()
+            elif data["op"] == "subscribe":
+                await ws.send_str(json.dumps({"op": "subscribe", "success": True}))
+                await ws.send_str(json.dumps({"topic": "wallet", "creationTime": self.wallet_time, "data": [
+                    {"coin": [{"coin": "USDT", "walletBalance": "150", "locked": "10"}]}]}))
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/v5/private", self.handler)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", 0).start()
+        self.url = f"ws://127.0.0.1:{self.runner.addresses[0][1]}/v5/private"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class FlakyAccount(AsyncBybitAccount):
+    """
+    Account whose REST balance call fails ``failures`` times, like a non-200 reply.
+    """
+
+    def __init__(self, failures: int = 0):
+        super().__init__()
+        self.api_key, self.api_secret = "key", "secret"
+        self.failures = failures
+        self.reconciles = 0
+
+    async def get_balance(self):
+        self.reconciles += 1
+        if self.reconciles <= self.failures:
+            raise Exception("Error fetching balance: 502 - Bad Gateway")
+        self.balance_time = SERVER_TIME
+        return {"USDT": {"free": 100.0, "locked": 0.0}}
+
+    async def get_open_orders(self, category, **kwargs):
+        return []
+
+
+class SkewedAccount(FlakyAccount):
+    """
+    FlakyAccount whose local clock runs an hour ahead of the exchange.
+    """
+
+    @staticmethod
+    def _get_timestamp():
+        return SERVER_TIME + 3600 * 1000
+
+
+def _run_until_wallet(stand_in_kwargs, account):
+    async def main():
+        stand_in = PrivateStandIn(**stand_in_kwargs)
+        await stand_in.start()
+        client = BybitPrivateWebSocket(account=account, ws_url=stand_in.url)
+        updated = asyncio.Event()
+
+        async def on_update(data):
+            updated.set()
+
+        client.process_user_update = on_update
+        task = asyncio.ensure_future(client.connect_to_stream(retry_delay=0.01))
+        try:
+            await asyncio.wait_for(updated.wait(), 5)
+        finally:
+            await client.stop()
+            await asyncio.wait_for(task, 2)
+            await stand_in.stop()
+        return client, stand_in, task
+
+    return asyncio.run(main())
+
+
+def test_reconnects_after_rejected_auth():
+    client, stand_in, task = _run_until_wallet({"reject_auth": 2}, FlakyAccount())
+    assert stand_in.auth_attempts == 3
+    assert client.balance["USDT"] == {"free": 150.0, "locked": 10.0}
+    assert task.exception() is None
+
+
+def test_reconnects_after_failed_reconcile():
+    account = FlakyAccount(failures=2)
+    client, stand_in, task = _run_until_wallet({}, account)
+    assert account.reconciles == 3
+    assert stand_in.auth_attempts == 3
+    assert client.balance["USDT"] == {"free": 150.0, "locked": 10.0}
+
+
+def test_wallet_updates_are_applied_when_the_local_clock_is_ahead():
+    client, _, _ = _run_until_wallet({}, SkewedAccount())
+    assert client.balance["USDT"] == {"free": 150.0, "locked": 10.0}
+    assert client.wallet_time == SERVER_TIME + 500
+
+
+def test_wallet_updates_older_than_the_snapshot_are_dropped():
+    account = FlakyAccount()
+    client, _, _ = _run_until_wallet({"wallet_time": SERVER_TIME - 500}, account)
+    assert client.balance["USDT"] == {"free": 100.0, "locked": 0.0}
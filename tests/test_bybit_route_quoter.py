@@ -0,0 +1,120 @@
+import logging
+import numpy as np
+
+from utils.bybit_orderbook import BybitOrderbook
+from utils.bybit_route_quoter import BybitRouteQuoter
+
+PAIRS = {"BTCUSDT": ("BTC", "USDT"), "ETHUSDT": ("ETH", "USDT"), "ETHBTC": ("ETH", "BTC"),
+         "SOLUSDT": ("SOL", "USDT"), "SOLBTC": ("SOL", "BTC"), "SOLETH": ("SOL", "ETH")}
+MIDS = {"BTCUSDT": 60000.0, "ETHUSDT": 3000.0, "ETHBTC": 0.05, "SOLUSDT": 150.0, "SOLBTC": 0.0025, "SOLETH": 0.05}
+
+
+def _levels(prices, quantities):
+    return [[repr(float(price)), repr(float(quantity))] for price, quantity in zip(prices, quantities)]
+
+
+def _books(depth=20, seed=0):
+    rng = np.random.default_rng(seed)
+    logger = logging.getLogger("tests.route_quoter")
+    books = {}
+    for symbol, mid in MIDS.items():
+        offsets = mid * 1e-4 * np.arange(1, depth + 1)
+        book = BybitOrderbook(logger=logger, symbol=symbol)
+        book.process_update_message({"type": "snapshot", "ts": 0, "data": {
+            "u": 1, "b": _levels(mid - offsets, rng.uniform(0.1, 5, depth)),
+            "a": _levels(mid + offsets, rng.uniform(0.1, 5, depth))}})
+        books[symbol] = book
+    return books
+
+
+def _chained_sell(books, legs, amount, fee):
+    for symbol, side in legs:
+        assert side == "bids"
+        _, price, filled = books[symbol].request_quote("SELL", amount, fee=fee)
+        amount = price * filled
+    return amount
+
+
+def _selling_routes(quoter):
+    return [row for row, legs in enumerate(quoter.legs) if all(side == "bids" for _, side in legs)]
+
+
+def test_quote_all_matches_chained_request_quote():
+    books = _books()
+    quoter = BybitRouteQuoter(books, PAIRS, fee=0.001)
+    quoter.find_routes("SOL", "USDT")
+    rows = _selling_routes(quoter)
+    assert len(rows) >= 3
+    sizes = np.linspace(0.5, 20, len(rows))
+    received, filled = quoter.quote_all(sizes, rows)
+    expected = [_chained_sell(books, quoter.legs[row], size, 0.001) for row, size in zip(rows, sizes)]
+    assert np.allclose(received, expected, rtol=1e-12)
+    assert np.allclose(filled, sizes)
+
+
+def test_buying_leg_matches_request_quote_in_quote_size():
+    books = _books()
+    quoter = BybitRouteQuoter(books, PAIRS)
+    received, filled, _ = quoter.quote(["USDT", "BTC"], 100000.0)
+    levels, _, quoted = books["BTCUSDT"].request_quote("BUY", 100000.0, "quote")
+    assert np.isclose(filled, quoted)
+    assert np.isclose(received, (levels["quantity"] / levels["price"]).sum(), rtol=1e-12)
+
+
+def test_changed_leg_is_recomputed_and_others_are_kept():
+    books = _books()
+    quoter = BybitRouteQuoter(books, PAIRS, fee=0.001)
+    quoter.find_routes("SOL", "USDT")
+    rows = _selling_routes(quoter)
+    before, _ = quoter.quote_all(2.0, rows)
+
+    book = books["BTCUSDT"]
+    book.process_update_message({"type": "delta", "ts": 1, "data": {
+        "u": 2, "b": [[repr(float(book.bids["price"][0])), "0"], [repr(float(book.bids["price"][1])), "0.01"]], "a": []}})
+    after, _ = quoter.quote_all(2.0, rows)
+    expected = [_chained_sell(books, quoter.legs[row], 2.0, 0.001) for row in rows]
+    assert np.allclose(after, expected, rtol=1e-12)
+    through_btc = np.array([any(symbol == "BTCUSDT" for symbol, _ in quoter.legs[row]) for row in rows])
+    assert through_btc.any() and (~through_btc).any()
+    assert np.array_equal(after[~through_btc], before[~through_btc])
+    assert (after[through_btc] < before[through_btc]).all()
+
+
+def test_unversioned_change_needs_invalidate():
+    books = _books()
+    quoter = BybitRouteQuoter(books, PAIRS)
+    row = quoter.add_route(["SOL", "USDT"])
+    before, _ = quoter.quote_all(1.0, [row])
+    # Same update id and timestamp: the cached curve is still used
+    books["SOLUSDT"].bids = books["SOLUSDT"].bids[1:]
+    assert np.array_equal(quoter.quote_all(1.0, [row])[0], before)
+    quoter.invalidate("SOLUSDT")
+    after, _ = quoter.quote_all(1.0, [row])
+    assert np.isclose(after[0], _chained_sell(books, quoter.legs[row], 1.0, 0.0))
+    assert after[0] < before[0]
+
+
+def test_size_beyond_the_route_depth_is_partially_filled():
+    books = _books(depth=3)
+    quoter = BybitRouteQuoter(books, PAIRS)
+    received, filled, _ = quoter.quote(["SOL", "USDT"], 1000.0)
+    assert np.isclose(filled, books["SOLUSDT"].bids["quantity"].sum())
+    assert np.isclose(received, (books["SOLUSDT"].bids["quantity"] * books["SOLUSDT"].bids["price"]).sum())
+
+
+def test_synthetic_book_quotes_like_its_routes():
+    books = _books()
+    quoter = BybitRouteQuoter(books, PAIRS, fee=0.001)
+    book = quoter.synthetic_book(["SOL", "BTC", "USDT"])
+    assert book.symbol == "SOLBTC*BTCUSDT"
+    assert book.bids["price"][0] < book.asks["price"][0]
+    assert (np.diff(book.bids["price"]) <= 0).all() and (np.diff(book.asks["price"]) >= 0).all()
+
+    _, price, filled = book.request_quote("SELL", 3.0)
+    received, _, _ = quoter.quote(["SOL", "BTC", "USDT"], 3.0)
+    assert np.isclose(price * filled, received, rtol=1e-12)
+
+    levels, _, spent = book.request_quote("BUY", 500.0, "quote")
+    bought, _, _ = quoter.quote(["USDT", "BTC", "SOL"], 500.0)
+    assert np.isclose(spent, 500.0)
+    assert np.isclose((levels["quantity"] / levels["price"]).sum(), bought, rtol=1e-12)
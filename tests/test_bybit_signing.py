@@ -0,0 +1,76 @@
+import hmac
+import json
+import hashlib
+
+import pytest
+
+from utils import bybit_signing
+from utils.bybit_signing import BybitRequestSigner
+from utils.bybit_async_account import AsyncBybitAccount
+
+TIMESTAMP = 1700000000123
+
+
+def _account(recv_window):
+    account = AsyncBybitAccount(recv_window=recv_window)
+    account.api_key, account.api_secret = "key-é", "secret"
+    return account
+
+
+def _legacy_params_string(params):
+    # The pre-signer body builder, which quoted every value
+    return "{" + ",".join([f'"{key}":"{value}"' for key, value in params.items()]) + "}"
+
+
+@pytest.mark.parametrize("recv_window", [5000, 20000])
+@pytest.mark.parametrize("query_string", ["", "category=spot", "category=linear&symbol=BTCUSDT&limit=50&cursor=a%3D%3D"])
+def test_get_signature_matches_legacy(recv_window, query_string):
+    account = _account(recv_window)
+    headers = account._get_signer().prepare_get(TIMESTAMP, query_string)
+    assert headers["X-BAPI-SIGN"] == account._generate_signature(TIMESTAMP, query_string, recv_window)
+    assert headers["X-BAPI-TIMESTAMP"] == str(TIMESTAMP)
+    assert headers["X-BAPI-RECV-WINDOW"] == str(recv_window)
+    assert headers["X-BAPI-API-KEY"] == account.api_key
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_post_body_of_string_values_matches_legacy(monkeypatch, use_orjson):
+    if use_orjson and bybit_signing.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(bybit_signing, "orjson", None)
+    account = _account(5000)
+    params = {"category": "spot", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Limit", "qty": "0.001",
+              "price": "60000.5", "orderLinkId": "link-1"}
+    body, headers = account._get_signer().prepare_post(TIMESTAMP, params)
+    assert body == _legacy_params_string(params).encode("utf-8")
+    assert headers["X-BAPI-SIGN"] == account._generate_signature(TIMESTAMP, _legacy_params_string(params), 5000)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("params", [
+    {"category": "linear", "symbol": "BTCUSDT", "qty": 0.001, "price": 60000, "reduceOnly": False,
+     "positionIdx": 0, "triggerPrice": None},
+    {"category": "spot", "request": [{"symbol": "BTCUSDT", "qty": "1", "price": 1.5e-05},
+                                     {"symbol": "ÉTHUSDT", "qty": "2", "isLeverage": 1}]},
+])
+def test_post_signature_covers_the_sent_bytes(monkeypatch, use_orjson, params):
+    if use_orjson and bybit_signing.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(bybit_signing, "orjson", None)
+    account = _account(5000)
+    body, headers = account._get_signer().prepare_post(TIMESTAMP, params)
+    assert isinstance(body, bytes)
+    assert json.loads(body) == params
+    assert headers["Content-Type"] == "application/json"
+    assert headers["X-BAPI-SIGN"] == account._generate_signature(TIMESTAMP, body.decode("utf-8"), 5000)
+    # The legacy HMAC over the body bytes, computed independently of both helpers
+    expected = hmac.new(b"secret", f"{TIMESTAMP}{account.api_key}5000".encode("utf-8") + body, hashlib.sha256)
+    assert headers["X-BAPI-SIGN"] == expected.hexdigest()
+
+
+def test_auth_signature():
+    signer = BybitRequestSigner("key", "secret")
+    expected = hmac.new(b"secret", b"GET/realtime1700000010000", hashlib.sha256).hexdigest()
+    assert signer.prepare_auth(1700000010000) == {"op": "auth", "args": ["key", 1700000010000, expected]}
@@ -0,0 +1,85 @@
+import asyncio
+import numpy as np
+
+from utils.bybit_ticker_scanner import BybitTickerScanner
+
+
+class FakeMarketApi:
+    def __init__(self, tickers):
+        self.tickers = tickers
+
+    async def get_tickers(self, category):
+        return {"retCode": 0, "retMsg": "OK", "result": {"category": category, "list": self.tickers}}
+
+
+def _ticker(symbol, last, bid, ask, turnover):
+    return {"symbol": symbol, "lastPrice": str(last), "bid1Price": str(bid), "ask1Price": str(ask),
+            "turnover24h": str(turnover)}
+
+
+def _scanner(capacity=1024, tickers=()):
+    return BybitTickerScanner("linear", market_api=FakeMarketApi(list(tickers)), capacity=capacity)
+
+
+def test_partial_deltas_keep_missing_fields():
+    scanner = _scanner()
+    scanner.update_tickers([_ticker("BTCUSDT", 100, 99.9, 100.1, 1e6)])
+    scanner.reset_changes()
+    rows = scanner.update_tickers([{"symbol": "BTCUSDT", "lastPrice": "101"}])
+    assert rows.tolist() == [0]
+    assert scanner.get("BTCUSDT", "lastPrice") == 101
+    assert scanner.get("BTCUSDT", "bid1Price") == 99.9
+    assert scanner.get("BTCUSDT", "turnover24h") == 1e6
+    # An unchanged value is not flagged
+    scanner.reset_changes()
+    assert scanner.update_tickers([{"symbol": "BTCUSDT", "lastPrice": "101"}]).tolist() == []
+    assert scanner.changed_symbols() == []
+
+
+def test_ticker_messages_apply_snapshots_and_deltas():
+    scanner = _scanner()
+    scanner.on_ticker_message({"topic": "tickers.BTCUSDT", "type": "snapshot",
+                               "data": _ticker("BTCUSDT", 100, 99.9, 100.1, 1e6)})
+    scanner.on_ticker_message({"topic": "tickers.BTCUSDT", "type": "delta",
+                               "data": {"symbol": "BTCUSDT", "bid1Price": "99.95"}})
+    assert scanner.get("BTCUSDT", "bid1Price") == 99.95
+    assert scanner.get("BTCUSDT", "lastPrice") == 100
+
+
+def test_new_symbols_grow_the_table_from_zero_capacity():
+    scanner = _scanner(capacity=0)
+    tickers = [_ticker(f"SYM{i}USDT", i + 1, i + 0.5, i + 1.5, i * 10) for i in range(40)]
+    scanner.update_tickers(tickers[:1])
+    scanner.update_tickers(tickers[1:])
+    assert len(scanner) == 40 and scanner.capacity >= 40
+    assert np.array_equal(scanner.column("lastPrice"), np.arange(1, 41))
+    assert scanner.changed_mask().all()
+    assert scanner.get("SYM39USDT", "turnover24h") == 390
+
+
+def test_top_n_orders_best_first_and_skips_nan():
+    tickers = [_ticker(f"SYM{i}USDT", 1, 1, 1, turnover) for i, turnover in enumerate([5, 1, 9, 3, 7, 2])]
+    tickers.append({"symbol": "NEWUSDT", "lastPrice": "1"})
+    scanner = _scanner(capacity=2, tickers=tickers)
+    asyncio.run(scanner.refresh())
+    symbols, values = scanner.top_n("turnover24h", 3)
+    assert symbols == ["SYM2USDT", "SYM4USDT", "SYM0USDT"] and values.tolist() == [9, 7, 5]
+    symbols, values = scanner.top_n("turnover24h", 2, largest=False)
+    assert symbols == ["SYM1USDT", "SYM5USDT"]
+    symbols, _ = scanner.top_n("turnover24h", 100)
+    assert len(symbols) == 6 and "NEWUSDT" not in symbols
+    mask = np.array([symbol in ("SYM1USDT", "SYM3USDT") for symbol in scanner.symbols])
+    assert scanner.top_n("turnover24h", 5, mask=mask)[0] == ["SYM3USDT", "SYM1USDT"]
+
+
+def test_change_mask_tracks_changes_since_reset():
+    scanner = _scanner(tickers=[_ticker("BTCUSDT", 100, 99, 101, 1), _ticker("ETHUSDT", 10, 9, 11, 1)])
+    asyncio.run(scanner.refresh())
+    assert scanner.changed_symbols() == ["BTCUSDT", "ETHUSDT"]
+    scanner.market_api.tickers = [_ticker("BTCUSDT", 100, 99, 101, 1), _ticker("ETHUSDT", 12, 9, 11, 1)]
+    rows = asyncio.run(scanner.refresh())
+    assert rows.tolist() == [1]
+    assert scanner.changed_mask().tolist() == [False, True]
+    scanner.update_tickers([{"symbol": "BTCUSDT", "ask1Price": "102"}])
+    assert scanner.changed_symbols() == ["BTCUSDT", "ETHUSDT"]
+    assert np.allclose(scanner.column("spread"), [3, 2])
@@ -0,0 +1,145 @@
+import json
+import time
+import asyncio
+
+from aiohttp import web
+
+from utils.bybit_async_account import AsyncBybitAccount
+from utils.bybit_trade_websocket import BybitTradeWebSocket
+
+
+class TradeStandIn:
+    """
+    Local /v5/trade endpoint: rejects the first ``reject_auth`` auth attempts,
+    then acks orders, or drops the connection on the first order if ``drop``.
+    """
+
+    def __init__(self, reject_auth: int = 0, drop: bool = False):
+        self.reject_auth = reject_auth
+        self.drop = drop
+        self.auth_attempts = 0
+        self.runner = None
+        self.url = None
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            data = json.loads(message.data)
+            if data["op"] == "auth":
+                self.auth_attempts += 1
+                rejected = self.auth_attempts <= self.reject_auth
+                await ws.send_str(json.dumps({"op": "auth", "retCode": 10004 if rejected else 0,
+                                              "retMsg": "Invalid sign" if rejected else "OK"}))
+                if rejected:
+                    await ws.close()
+            elif self.drop:
+                self.drop = False
+                await ws.close()
+            else:
+                await ws.send_str(json.dumps({"reqId": data["reqId"], "retCode": 0, "retMsg": "OK",
+                                              "op": data["op"], "data": {"orderId": "1"}}))
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/v5/trade", self.handler)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", 0).start()
+        self.url = f"ws://127.0.0.1:{self.runner.addresses[0][1]}/v5/trade"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+def _client(url):
+    account = AsyncBybitAccount()
+    account.api_key, account.api_secret = "key", "secret"
+    return BybitTradeWebSocket(account=account, ws_url=url)
+
+
+def test_reconnects_after_rejected_auth():
+    async def main():
+        stand_in = TradeStandIn(reject_auth=2)
+        await stand_in.start()
+        client = _client(stand_in.url)
+        task = asyncio.ensure_future(client.connect_to_stream(retry_delay=0.01))
+        try:
+            ack = await client.send_request("order.create", [{"symbol": "BTCUSDT"}], timeout=2)
+        finally:
+            await client.stop()
+            await asyncio.wait_for(task, 2)
+            await stand_in.stop()
+        return ack, stand_in.auth_attempts, task
+
+    ack, attempts, task = asyncio.run(main())
+    assert ack["retCode"] == 0
+    assert attempts == 3
+    assert task.exception() is None
+
+
+def test_in_flight_request_fails_when_socket_drops():
+    async def main():
+        stand_in = TradeStandIn(drop=True)
+        await stand_in.start()
+        client = _client(stand_in.url)
+        task = asyncio.ensure_future(client.connect_to_stream(retry_delay=0.01))
+        t1 = time.perf_counter()
+        try:
+            await client.send_request("order.create", [{"symbol": "BTCUSDT"}], timeout=5)
+            error = None
+        except ConnectionError as e:
+            error = e
+        elapsed = time.perf_counter() - t1
+        # The next connection serves requests again
+        ack = await client.send_request("order.create", [{"symbol": "BTCUSDT"}], timeout=2)
+        await client.stop()
+        await asyncio.wait_for(task, 2)
+        await stand_in.stop()
+        return error, elapsed, ack
+
+    error, elapsed, ack = asyncio.run(main())
+    assert isinstance(error, ConnectionError)
+    assert elapsed < 1
+    assert ack["retCode"] == 0
+
+
+def test_request_fails_when_socket_drops_before_it_is_sent():
+    async def main():
+        client = _client("ws://127.0.0.1:1/v5/trade")
+        # Ready but already disconnected, as when the reader task runs first
+        client.ready.set()
+        try:
+            await client.send_request("order.create", [{"symbol": "BTCUSDT"}], timeout=1)
+        except ConnectionError as e:
+            return e, client.pending
+
+    error, pending = asyncio.run(main())
+    assert isinstance(error, ConnectionError)
+    assert pending == {}
+
+
+def test_amend_and_cancel_require_an_order_reference():
+    async def main():
+        stand_in = TradeStandIn()
+        await stand_in.start()
+        client = _client(stand_in.url)
+        task = asyncio.ensure_future(client.connect_to_stream(retry_delay=0.01))
+        errors = []
+        try:
+            for request in [client.amend_order("BTCUSDT", price=60000), client.cancel_order("BTCUSDT")]:
+                try:
+                    await request
+                except ValueError as e:
+                    errors.append(e)
+            ack = await client.cancel_order("BTCUSDT", order_link_id="link-1")
+        finally:
+            await client.stop()
+            await asyncio.wait_for(task, 2)
+            await stand_in.stop()
+        return errors, ack
+
+    errors, ack = asyncio.run(main())
+    assert len(errors) == 2
+    assert ack["retCode"] == 0
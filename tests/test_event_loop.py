@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+import types
+
+import pytest
+
+from utils import event_loop
+from utils.event_loop import LoopLagMonitor
+
+
+class UvloopStandIn(asyncio.SelectorEventLoop):
+    pass
+
+
+# Stands in for the uvloop module, whose loops live in a uvloop.* module
+UvloopStandIn.__module__ = "uvloop.loop"
+UVLOOP = types.SimpleNamespace(new_event_loop=UvloopStandIn)
+
+
+def _backend(backend):
+    loop = event_loop.new_event_loop(backend)
+    try:
+        return event_loop.loop_backend(loop)
+    finally:
+        loop.close()
+
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.setattr(event_loop, "_uvloop", lambda: None)
+    assert _backend("asyncio") == "asyncio"
+    assert _backend("auto") == "asyncio"
+    with pytest.raises(ImportError):
+        event_loop.new_event_loop("uvloop")
+    with pytest.raises(AssertionError):
+        event_loop.new_event_loop("trio")
+
+    monkeypatch.setattr(event_loop, "_uvloop", lambda: UVLOOP)
+    assert _backend("uvloop") == "uvloop"
+    assert _backend("auto") == "uvloop"
+    assert _backend("asyncio") == "asyncio"
+    monkeypatch.setattr(event_loop, "DEFAULT_BACKEND", "asyncio")
+    assert _backend(None) == "asyncio"
+
+
+def test_run_uses_the_requested_backend(monkeypatch):
+    monkeypatch.setattr(event_loop, "_uvloop", lambda: UVLOOP)
+
+    async def main():
+        return event_loop.loop_backend()
+
+    assert event_loop.run(main(), backend="uvloop") == "uvloop"
+    assert event_loop.run(main(), backend="asyncio") == "asyncio"
+
+
+def _monitor(caplog, log_interval):
+    logger = logging.getLogger("tests.event_loop")
+    caplog.set_level(logging.WARNING, logger="tests.event_loop")
+    return LoopLagMonitor(slow_threshold=0.01, samples=8, log_interval=log_interval, logger=logger)
+
+
+def test_lag_spikes_are_logged_once_per_interval(caplog):
+    monitor = _monitor(caplog, log_interval=3600)
+    monitor.record("orderbook.50.BTCUSDT", 0.02)
+    monitor._add_lag(0.02)
+    for lag in [0.001, 0.05, 0.03, 0.002]:
+        monitor.record("tickers.BTCUSDT", lag)
+        monitor._add_lag(lag)
+    # The first spike is logged right away, the next two are held back
+    assert len(caplog.records) == 1
+    assert "20.0 ms" in caplog.messages[0]
+    assert monitor._spike_count == 2
+
+    monitor._last_log -= 3600
+    monitor._add_lag(0.0)
+    assert len(caplog.records) == 2
+    assert "2 time(s)" in caplog.messages[1] and "max 50.0 ms" in caplog.messages[1]
+    assert "tickers.BTCUSDT" in caplog.messages[1]
+    assert len(monitor.lag_events) == 3
+
+    monitor._add_lag(0.04)
+    monitor.stop()
+    assert len(caplog.records) == 3 and "max 40.0 ms" in caplog.messages[2]
+
+
+def test_lag_stats_and_sections(caplog):
+    monitor = _monitor(caplog, log_interval=0)
+    for lag in range(10):
+        monitor._add_lag(lag / 1000)
+    stats = monitor.lag_stats()
+    # Only the 8 most recent samples are kept
+    assert stats["samples"] == 8 and stats["max_ms"] == pytest.approx(9.0)
+    assert stats["mean_ms"] == pytest.approx(5.5)
+
+    monitor.record("a", 0.001)
+    monitor.record("a", 0.003)
+    monitor.record("b", 0.02)
+    assert monitor.top_sections(key="total") == [("b", 1, 0.02, 0.02), ("a", 2, 0.004, 0.003)]
+    assert [event.name for event in monitor.slow_events] == ["b"]
+    monitor.reset()
+    assert monitor.lag_stats() == {"samples": 0} and monitor.sections == {}
+
+
+def test_monitor_measures_a_blocked_loop(caplog):
+    monitor = _monitor(caplog, log_interval=3600)
+    monitor.interval = 0.01
+
+    async def main():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        monitor.record("blocking", 0.1)
+        # Keeps the loop busy past the next sample
+        time.sleep(0.1)
+        await asyncio.sleep(0.05)
+        monitor.stop()
+        return monitor.report()
+
+    report = asyncio.run(main())
+    assert report["backend"] == "asyncio"
+    assert report["lag"]["max_ms"] >= 50
+    assert report["lag_events"][0]["name"] == "blocking"
+    assert len(caplog.records) == 1
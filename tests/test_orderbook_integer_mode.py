@@ -0,0 +1,66 @@
+import numpy as np
+
+from utils.bybit_orderbook import BybitOrderbook
+
+SNAPSHOT = {"type": "snapshot", "ts": 0, "data": {
+    "u": 1, "b": [["29999.99", "0.123456"], ["29999.50", "1.5"], ["29998.01", "2.000001"]],
+    "a": [["30000.01", "0.5"], ["30000.02", "0.75"], ["30001.10", "3.25"]]}}
+DELTA = {"type": "delta", "ts": 1, "data": {
+    "u": 2, "b": [["29999.50", "0"], ["29999.98", "0.4"]], "a": [["30000.01", "0.6"]]}}
+
+
+def _books(int_dtype="i8", qty_step="0.000001"):
+    float_book = BybitOrderbook(symbol="BTCUSDT")
+    int_book = BybitOrderbook(symbol="BTCUSDT", tick_size="0.01", qty_step=qty_step, int_dtype=int_dtype)
+    for book in (float_book, int_book):
+        book.process_update_message(SNAPSHOT)
+        book.process_update_message(DELTA)
+    return float_book, int_book
+
+
+def test_integer_book_stores_counts_and_round_trips_to_floats():
+    float_book, int_book = _books()
+    assert int_book.bids.dtype["price"] == np.int64
+    assert int_book.bids["price"].tolist() == [2999999, 2999998, 2999801]
+    assert int_book.asks["quantity"].tolist() == [600000, 750000, 3250000]
+    for side in ["bids", "asks"]:
+        converted = int_book.get_float_book(side)
+        assert np.allclose(converted["price"], float_book.get_book_type(side)["price"], rtol=0, atol=1e-9)
+        assert np.allclose(converted["quantity"], float_book.get_book_type(side)["quantity"], rtol=0, atol=1e-12)
+        assert np.array_equal(int_book.to_book_units(converted), int_book.get_book_type(side))
+    # Float books are returned unchanged
+    assert float_book.to_book_units(float_book.bids) is float_book.bids
+
+
+def test_set_integer_mode_converts_existing_levels():
+    float_book, _ = _books()
+    book = BybitOrderbook(symbol="BTCUSDT")
+    book.process_update_message(SNAPSHOT)
+    book.process_update_message(DELTA)
+    book.set_integer_mode("0.01", "0.000001")
+    assert book.bids["price"].tolist() == [2999999, 2999998, 2999801]
+    assert np.allclose(book.get_float_book("asks")["price"], float_book.asks["price"])
+
+
+def test_request_quote_matches_the_float_book():
+    float_book, int_book = _books()
+    for order_type, side, size in [("BUY", None, 1.0), ("SELL", None, 0.3), ("BUY", "quote", 40000.0),
+                                   ("SELL", None, 100.0)]:
+        expected = float_book.request_quote(order_type, size, side, fee=0.001)
+        actual = int_book.request_quote(order_type, size, side, fee=0.001)
+        assert np.allclose(actual[0]["price"], expected[0]["price"])
+        assert np.allclose(actual[0]["quantity"], expected[0]["quantity"])
+        assert np.isclose(actual[1], expected[1]) and np.isclose(actual[2], expected[2])
+
+
+def test_int32_book_widens_on_overflow():
+    book = BybitOrderbook(symbol="BTCUSDT", tick_size="0.01", qty_step="0.00000001", int_dtype="i4")
+    book.process_update_message(SNAPSHOT)
+    assert book.bids.dtype["price"] == np.int32
+    # 25 BTC is 2.5e9 lots of 1e-8, above the int32 maximum
+    book.process_update_message({"type": "delta", "ts": 1, "data": {"u": 2, "b": [["29999.97", "25"]], "a": []}})
+    assert book.bids.dtype["price"] == np.int64 and book.asks.dtype["price"] == np.int64
+    bids = book.get_float_book("bids")
+    assert bids["price"].tolist() == [29999.99, 29999.97, 29999.5, 29998.01]
+    assert np.allclose(bids["quantity"], [0.123456, 25, 1.5, 2.000001])
+    assert book.get_bbo()[0] == 2999999
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+from utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"retCode": 0}
+
+    async def main():
+        return await asyncio.gather(*[flight.do("key", fetch) for _ in range(10)])
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_expired_entries_are_pruned_on_insert(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("utils.single_flight.time.monotonic", lambda: now[0])
+    flight = SingleFlight(cache_ttl=1.0)
+
+    async def fetch():
+        return 1
+
+    async def main():
+        for i in range(100):
+            await flight.do(("cursor", i), fetch)
+            now[0] += 0.1
+
+    asyncio.run(main())
+    # Only the results of the last second are still cached
+    assert len(flight._cache) == 10
+
+
+def test_cache_size_is_capped():
+    flight = SingleFlight(cache_ttl=60.0, max_entries=8)
+
+    async def fetch():
+        return 1
+
+    async def main():
+        for i in range(100):
+            await flight.do(("symbol", i), fetch)
+
+    asyncio.run(main())
+    assert len(flight._cache) == 8
+    assert ("symbol", 99) in flight._cache
+
+
+def test_calls_from_two_loops_do_not_share_a_future():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(threading.get_ident())
+        started.set()
+        await asyncio.get_running_loop().run_in_executor(None, release.wait)
+        return len(calls)
+
+    results = {}
+
+    def other_loop():
+        results["other"] = asyncio.run(flight.do("key", fetch))
+
+    thread = threading.Thread(target=other_loop)
+    thread.start()
+    assert started.wait(2)
+
+    async def main():
+        task = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await task
+
+    results["main"] = asyncio.run(main())
+    thread.join(2)
+    assert len(calls) == 2
+    assert set(results) == {"main", "other"}
@@ -0,0 +1,17 @@
+from benchmarks.stand_ins import synthetic_frames
+from utils.bybit_orderbook import BybitOrderbook
+
+
+def test_synthetic_frames_never_cross_or_repeat_prices():
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    books = {symbol: BybitOrderbook(symbol=symbol) for symbol in symbols}
+    for frame in synthetic_frames(symbols, messages=3000, trade_ratio=0.1):
+        if not frame["topic"].startswith("orderbook"):
+            continue
+        for side in ["b", "a"]:
+            prices = [price for price, _ in frame["data"][side]]
+            assert len(prices) == len(set(prices))
+        book = books[frame["data"]["s"]]
+        book.process_update_message(frame)
+        bid_price, _, ask_price, _ = book.get_bbo()
+        assert bid_price < ask_price
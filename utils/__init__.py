@@ -0,0 +1,50 @@
+"""
+Bybit clients, books and tools.
+
+The public classes can be imported from the package, e.g.
+``from utils import BybitWebSocket``; each is loaded from its module on first
+access, so importing the package costs nothing and heavy dependencies
+(NumPy, aiohttp, websockets) are only imported by the parts that use them.
+Importing has no side effects such as logging configuration.
+"""
+import importlib
+
+_EXPORTS = {
+    "AsyncBybitAccount": "utils.bybit_async_account",
+    "BybitAccount": "utils.bybit_account",
+    "BybitBookFeatures": "utils.bybit_book_features",
+    "BybitBookSampler": "utils.bybit_book_sampler",
+    "BybitDepthBuckets": "utils.bybit_depth_buckets",
+    "BybitFeedManager": "utils.bybit_feed_manager",
+    "BybitInstrumentRegistry": "utils.bybit_instruments",
+    "get_instrument_registry": "utils.bybit_instruments",
+    "BybitMarketApi": "utils.bybit_market",
+    "BybitOrderManager": "utils.bybit_order_manager",
+    "BybitOrderValidator": "utils.bybit_order_validator",
+    "BBOEvent": "utils.bybit_orderbook",
+    "BybitOrderbook": "utils.bybit_orderbook",
+    "BybitStoreOrderbook": "utils.bybit_orderbook",
+    "BybitPrivateWebSocket": "utils.bybit_private_websocket",
+    "BybitWebSocket": "utils.bybit_public_websocket",
+    "BybitRequestSigner": "utils.bybit_signing",
+    "BybitRouteQuoter": "utils.bybit_route_quoter",
+    "BybitTickerScanner": "utils.bybit_ticker_scanner",
+    "BybitTradeWebSocket": "utils.bybit_trade_websocket",
+    "LoopLagMonitor": "utils.event_loop",
+    "SingleFlight": "utils.single_flight",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'utils' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
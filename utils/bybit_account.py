@@ -1,210 +1,155 @@
-import os
-import requests
-import aiohttp
-import time
-import hashlib
-import hmac
 import logging
 import asyncio
-import uuid
-import json
+import threading
+
+from utils.bybit_async_account import AsyncBybitAccount
 
 
 class BybitAccount:
-    def __init__(self, user_stream=None, logger=None):
+    """
+    Synchronous facade over AsyncBybitAccount.
+
+    The async client runs on a private event loop in a daemon thread, so the
+    blocking methods wait on that loop and the ``async`` ones (cancel_order)
+    await it without ever blocking the caller's loop.
+    """
+
+    def __init__(self, user_stream=None, logger=None, instruments=None, validator=None, fetch_on_init: bool = False):
+        """
+        Initializes an instance of BybitAccount. No request is sent unless
+        fetch_on_init is set; balance and exchange_info are fetched on demand.
+
+        :param user_stream: Optional BybitPrivateWebSocket keeping the balance fresh.
+        :param logger: Optional logger instance for logging purposes.
+        :param instruments: Optional BybitInstrumentRegistry; defaults to the shared one.
+        :param validator: Optional BybitOrderValidator applied to placed orders.
+        :param fetch_on_init: Fetch the balance and exchange info right away, as earlier versions did.
+        """
         self.user_stream = user_stream
-        self.api_secret = os.getenv("BYBIT_SECRET_KEY")
-        self.api_key = os.getenv("BYBIT_API_KEY")
-        self.base_url = "https://api.bybit.com"
-        self.headers = {
-            "X-BAPI-API-KEY": os.getenv("BYBIT_API_KEY"),
-        }
 
         if not logger:
             self.logger = logging.getLogger(__name__)
         else:
             self.logger = logger
 
-        self.balance = {}
-        self.get_balance()
-        self.exchange_info = self.get_exchange_info()
+        self.client = AsyncBybitAccount(logger=self.logger, instruments=instruments, validator=validator)
+        self.api_secret = self.client.api_secret
+        self.api_key = self.client.api_key
+        self.base_url = self.client.base_url
+        self.headers = {
+            "X-BAPI-API-KEY": self.api_key,
+        }
+
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._exchange_info = None
+
+        if fetch_on_init:
+            self.get_balance()
+            self.exchange_info = self.get_exchange_info()
+
+    @property
+    def instruments(self):
+        return self.client.instruments
+
+    @property
+    def exchange_info(self):
+        """
+        Spot instruments-info, fetched on first access.
+        """
+        if self._exchange_info is None:
+            self._exchange_info = self.get_exchange_info()
+        return self._exchange_info
+
+    @exchange_info.setter
+    def exchange_info(self, value):
+        self._exchange_info = value
+
+    @property
+    def balance(self):
+        """
+        Balances kept fresh by the private user stream when one was given,
+        otherwise the result of the last get_balance call.
+        """
+        if self.user_stream is not None:
+            return self.user_stream.balance
+        return self.client.balance
+
+    @balance.setter
+    def balance(self, value):
+        self.client.balance = value
+
+    def _get_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="bybit-account-io", daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    async def _run_async(self, coro):
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._get_loop()))
+
+    def close(self):
+        """
+        Closes the pooled session and stops the I/O thread.
+        """
+        if self._loop is None:
+            return
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
 
     def _generate_signature(self, timestamp, query_string, recv_window:int=5000):
-        param_str = f"{timestamp}{self.api_key}{recv_window}{query_string}"
-        return hmac.new(
-            self.api_secret.encode("utf-8"), param_str.encode("utf-8"), hashlib.sha256
-        ).hexdigest()
+        return self.client._generate_signature(timestamp, query_string, recv_window)
 
     @staticmethod
     def _get_timestamp():
-        return int(time.time() * 1000)
+        return AsyncBybitAccount._get_timestamp()
 
     @staticmethod
     def _generate_params_string(params: dict):
-        return "{" + ",".join([f'"{key}":"{value}"' for key, value in params.items()]) + "}"
+        return AsyncBybitAccount._generate_params_string(params)
 
     def get_trading_fees(self, symbol: str):
-        endpoint = "/v5/account/fee-rate"
-        timestamp = self._get_timestamp()
-        recv_window = 5000
-        query_string = f"category=spot&symbol={symbol}"
-        signature = self._generate_signature(timestamp, query_string, recv_window)
-        url = f"{self.base_url}{endpoint}?{query_string}"
-        
-        headers = {
-            "X-BAPI-API-KEY": os.getenv("BYBIT_API_KEY"),
-            "X-BAPI-SIGN": signature,
-            "X-BAPI-TIMESTAMP": str(timestamp),
-            "X-BAPI-RECV-WINDOW": str(recv_window),
-        }
-
-        response = requests.get(url, headers=headers)
-        self.logger.info(response)
-        if response.status_code == 200:
-            data = response.json()
-            result = data["result"]["list"][0]
-            return float(result["makerFeeRate"]), float(result["takerFeeRate"])
-        else:
-            self.logger.info(
-                f"Error fetching trading fees: {response.status_code} - {response.text}"
-            )
-            return None
+        return self._run(self.client.get_trading_fees(symbol))
 
     def get_exchange_info(self):
-        endpoint = "/v5/market/instruments-info"
-        timestamp = self._get_timestamp()
-        recv_window = 5000
-        query_string = f"category=spot"
-        signature = self._generate_signature(timestamp, query_string, recv_window)
-        url = f"{self.base_url}{endpoint}?{query_string}"
-
-        headers = {
-            "X-BAPI-API-KEY": os.getenv("BYBIT_API"),
-            "X-BAPI-SIGN": signature,
-            "X-BAPI-TIMESTAMP": str(timestamp),
-            "X-BAPI-RECV-WINDOW": str(recv_window),
-        }
-
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            self.logger.info(
-                f"Error fetching exchange info: {response.status_code} - {response.text}"
-            )
-            return None
+        """
+        Returns the spot instruments-info, served from the instrument registry
+        while it is fresh and fetched (following the cursor) otherwise.
+        """
+        return self._run(self.client.get_exchange_info())
 
     def place_order(self, symbol, side, order_type, qty, price=None, params:dict={}):
-        endpoint = "/v5/order/create"
-        timestamp = self._get_timestamp()
-        recv_window = 5000
-        query_params = {
-            "category": "spot",
-            "symbol": symbol,
-            "side": side,
-            "orderType": order_type,
-            "qty": f'{qty}',
-        }
-
-        # Add price if order type is Limit
-        if order_type == "Limit" and price:
-            query_params["price"] = f'{price}'
-
-        # Add any additional params
-        query_params.update(params)
-
-        # Convert params dictionary to query string format
-        query_string = self._generate_params_string(query_params)
-        signature = self._generate_signature(timestamp, query_string)
-
-        url = f"{self.base_url}{endpoint}"
-        
-        # Prepare headers with correct signature
-        headers = {
-            "X-BAPI-API-KEY": os.getenv("BYBIT_API_KEY"),
-            "X-BAPI-SIGN": signature,
-            "X-BAPI-SIGN-TYPE": "2",
-            "X-BAPI-TIMESTAMP": str(timestamp),
-            "X-BAPI-RECV-WINDOW": str(recv_window),
-            "Content-Type": "application/json", 
-        }
-
-        # Post request with JSON payload rather than form data
-        response = requests.post(url, headers=headers, data=query_string)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(
-                f"Error placing bybit order: {response.status_code} - {response.text}"
-            )
+        return self._run(self.client.place_order(symbol, side, order_type, qty, price, params))
 
     async def cancel_order(self, symbol, order_id):
-        endpoint = "/v5/order/cancel"
-        timestamp = self._get_timestamp()
-        recv_window = 5000
-        query_params = {
-            "category": "spot",
-            "symbol": symbol,
-            "orderId": order_id,
-        }
+        return await self._run_async(self.client.cancel_order(symbol, order_id))
 
-        query_string = self._generate_params_string(query_params)
-        signature = self._generate_signature(timestamp, query_string)
+    def place_orders(self, orders: list, category: str = "spot"):
+        return self._run(self.client.place_orders(orders, category))
 
-        url = f"{self.base_url}{endpoint}"
+    def amend_orders(self, amendments: list, category: str = "spot"):
+        return self._run(self.client.amend_orders(amendments, category))
 
-        headers = {
-            "X-BAPI-API-KEY": os.getenv("BYBIT_API_KEY"),
-            "X-BAPI-SIGN": signature,
-            "X-BAPI-SIGN-TYPE": "2",
-            "X-BAPI-TIMESTAMP": str(timestamp),
-            "X-BAPI-RECV-WINDOW": str(recv_window),
-            "Content-Type": "application/json",
-        }
+    async def cancel_orders(self, cancels: list, category: str = "spot"):
+        return await self._run_async(self.client.cancel_orders(cancels, category))
 
-        response = requests.post(url, headers=headers, data=query_string)
-        if response.status_code == 200:
-            self.logger.info(f"Order {order_id} cancelled successfully.")
-            return response.json()
-        else:
-            self.logger.info(
-                f"Error cancelling order: {response.status_code} - {response.text}"
-            )
-            raise Exception("Error cancelling order")
+    async def cancel_all_orders(self, category: str = "spot", symbol: str = None, params: dict = {}):
+        return await self._run_async(self.client.cancel_all_orders(category, symbol, params))
 
     def get_balance(self):
-        endpoint = "/v5/account/wallet-balance"
-        query_string = f"accountType=UNIFIED"
-        timestamp = self._get_timestamp()
-        recv_window = 5000
-        signature = self._generate_signature(timestamp, query_string, recv_window)
-        url = f"{self.base_url}{endpoint}?{query_string}"
-
-        headers = {
-            "X-BAPI-API-KEY": os.getenv("BYBIT_API_KEY"),
-            "X-BAPI-SIGN": signature,
-            "X-BAPI-TIMESTAMP": str(timestamp),
-            "X-BAPI-RECV-WINDOW": str(recv_window),
-        }
-
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
-            self.balance = {}
-            if data["retMsg"] == "OK":
-                for balance in data["result"]["list"][0]["coin"]:
-                    self.balance[balance["coin"]] = {}
-                    self.balance[balance["coin"]]["free"] = float(balance["walletBalance"])
-                    self.balance[balance["coin"]]["locked"] = float(balance["locked"])
-            else:
-                self.logger.info(f"Error fetching balance: {data['retMsg']}")
-        else:
-            self.logger.info(
-                f"Error fetching balance: {response.status_code} - {response.text}"
-            )
-            raise Exception(
-                f"Error fetching balance: {response.status_code} - {response.text}"
-            )
+        return self._run(self.client.get_balance())
 
     def get_locked_amount(self, coin: str):
         return float(self.balance.get(coin, {}).get("locked", 0.0))
@@ -0,0 +1,369 @@
+import os
+import time
+import json
+import hashlib
+import hmac
+import logging
+import asyncio
+import uuid
+
+from utils.bybit_signing import BybitRequestSigner
+
+# Maximum number of orders per batch request, by category
+BATCH_LIMITS = {"spot": 10, "linear": 20, "inverse": 20, "option": 20}
+
+
+class AsyncBybitAccount:
+    """
+    Asyncio-native Bybit account client.
+
+    Every request goes through one pooled aiohttp session (keep-alive
+    connections, cached DNS) that is created lazily on the running loop, so
+    awaiting an order never blocks the websocket feeds sharing that loop.
+    """
+
+    def __init__(self, logger=None, instruments=None, connection_limit: int = 100, recv_window: int = 5000,
+                 validator=None):
+        """
+        Initializes an instance of AsyncBybitAccount.
+
+        :param logger: Optional logger instance for logging purposes.
+        :param instruments: Optional BybitInstrumentRegistry; defaults to the shared one.
+        :param connection_limit: Maximum number of pooled connections.
+        :param recv_window: Receive window in milliseconds sent with signed requests.
+        :param validator: Optional BybitOrderValidator rounding and checking orders before they are sent.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self._instruments = instruments
+        self.api_secret = os.getenv("BYBIT_SECRET_KEY")
+        self.api_key = os.getenv("BYBIT_API_KEY")
+        self.base_url = "https://api.bybit.com"
+        self.recv_window = recv_window
+        self.validator = validator
+        self.connection_limit = connection_limit
+        self.session = None
+        self.signer = None
+        self.balance = {}
+        # Server time (ms) of the last wallet-balance response, 0 if unknown
+        self.balance_time = 0
+
+    @property
+    def instruments(self):
+        """
+        The instrument registry, resolved to the shared one on first use.
+        """
+        if self._instruments is None:
+            from utils.bybit_instruments import get_instrument_registry
+
+            self._instruments = get_instrument_registry()
+        return self._instruments
+
+    async def _get_session(self):
+        if self.session is None or self.session.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(limit=self.connection_limit, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _generate_signature(self, timestamp, query_string, recv_window: int = 5000):
+        param_str = f"{timestamp}{self.api_key}{recv_window}{query_string}"
+        return hmac.new(
+            self.api_secret.encode("utf-8"), param_str.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+
+    @staticmethod
+    def _get_timestamp():
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def _generate_params_string(params: dict):
+        return BybitRequestSigner.serialize(params).decode("utf-8")
+
+    def _get_signer(self):
+        if self.signer is None:
+            self.signer = BybitRequestSigner(self.api_key, self.api_secret, self.recv_window)
+        return self.signer
+
+    async def _signed_get(self, endpoint: str, query_string: str):
+        """
+        Sends a signed GET request.
+
+        :return: Tuple of (status code, response text).
+        """
+        session = await self._get_session()
+        headers = self._get_signer().prepare_get(self._get_timestamp(), query_string)
+        async with session.get(f"{self.base_url}{endpoint}?{query_string}", headers=headers) as response:
+            return response.status, await response.text()
+
+    async def _signed_post(self, endpoint: str, params: dict):
+        """
+        Sends a signed POST request with a JSON body. The signature covers the
+        exact serialized bytes that are sent.
+
+        :return: Tuple of (status code, response text).
+        """
+        session = await self._get_session()
+        body, headers = self._get_signer().prepare_post(self._get_timestamp(), params)
+        async with session.post(f"{self.base_url}{endpoint}", headers=headers, data=body) as response:
+            return response.status, await response.text()
+
+    async def get_trading_fees(self, symbol: str):
+        status, text = await self._signed_get("/v5/account/fee-rate", f"category=spot&symbol={symbol}")
+        if status == 200:
+            result = json.loads(text)["result"]["list"][0]
+            return float(result["makerFeeRate"]), float(result["takerFeeRate"])
+        else:
+            self.logger.info(f"Error fetching trading fees: {status} - {text}")
+            return None
+
+    async def get_exchange_info(self):
+        """
+        Returns the spot instruments-info, served from the instrument registry
+        while it is fresh and fetched (following the cursor) otherwise.
+        """
+        tables = await self.instruments.load(["spot"])
+        if "spot" not in tables:
+            return None
+        return {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {
+                "category": "spot",
+                "list": tables["spot"].instruments,
+            },
+        }
+
+    async def place_order(self, symbol, side, order_type, qty, price=None, params: dict = {}):
+        query_params = {
+            "category": "spot",
+            "symbol": symbol,
+            "side": side,
+            "orderType": order_type,
+            "qty": f'{qty}',
+        }
+
+        # Add price if order type is Limit
+        if order_type == "Limit" and price:
+            query_params["price"] = f'{price}'
+
+        # Round to tick/step and reject filter violations before the round trip
+        if self.validator is not None:
+            qty_str, price_str = self.validator.validate(symbol, side, qty, query_params.get("price"), order_type,
+                                                         params.get("marketUnit"))
+            query_params["qty"] = qty_str
+            if price_str is not None:
+                query_params["price"] = price_str
+
+        # Add any additional params
+        query_params.update(params)
+
+        status, text = await self._signed_post("/v5/order/create", query_params)
+        if status == 200:
+            return json.loads(text)
+        else:
+            raise Exception(f"Error placing bybit order: {status} - {text}")
+
+    async def cancel_order(self, symbol, order_id):
+        query_params = {
+            "category": "spot",
+            "symbol": symbol,
+            "orderId": order_id,
+        }
+
+        status, text = await self._signed_post("/v5/order/cancel", query_params)
+        if status == 200:
+            self.logger.info(f"Order {order_id} cancelled successfully.")
+            return json.loads(text)
+        else:
+            self.logger.info(f"Error cancelling order: {status} - {text}")
+            raise Exception("Error cancelling order")
+
+    async def _post_batch(self, endpoint: str, category: str, requests: list):
+        """
+        Splits requests into chunks under the category batch limit, sends the
+        chunks concurrently and maps every result back to its request.
+
+        :return: List aligned with requests of dicts holding the request, the
+            exchange result item and its retCode/retMsg.
+        """
+        assert category in BATCH_LIMITS, "Invalid category"
+        limit = BATCH_LIMITS[category]
+        chunks = [requests[i:i + limit] for i in range(0, len(requests), limit)]
+        responses = await asyncio.gather(
+            *[
+                self._signed_post(endpoint, {"category": category, "request": chunk})
+                for chunk in chunks
+            ],
+            return_exceptions=True,
+        )
+
+        results = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                results.extend(
+                    {"request": request, "result": None, "retCode": -1, "retMsg": str(response)}
+                    for request in chunk
+                )
+                continue
+            status, text = response
+            try:
+                data = json.loads(text) if status == 200 else {"retCode": status, "retMsg": text}
+            except ValueError:
+                # A truncated or non-JSON body only fails its own chunk
+                data = {"retCode": -1, "retMsg": f"Invalid response body: {text[:200]}"}
+            if data.get("retCode") != 0:
+                self.logger.info(f"Error in batch request {endpoint}: {data.get('retCode')} - {data.get('retMsg')}")
+                results.extend(
+                    {"request": request, "result": None, "retCode": data.get("retCode"), "retMsg": data.get("retMsg")}
+                    for request in chunk
+                )
+                continue
+            items = data["result"].get("list", [])
+            infos = data.get("retExtInfo", {}).get("list", [])
+            for i, request in enumerate(chunk):
+                info = infos[i] if i < len(infos) else {"code": 0, "msg": "OK"}
+                results.append({
+                    "request": request,
+                    "result": items[i] if i < len(items) else None,
+                    "retCode": info.get("code"),
+                    "retMsg": info.get("msg"),
+                })
+        return results
+
+    async def place_orders(self, orders: list, category: str = "spot"):
+        """
+        Places many orders through /v5/order/create-batch.
+
+        :param orders: List of order dicts (symbol, side, orderType, qty, price, ...).
+            Orders without an orderLinkId get a generated one.
+        :param category: Bybit category of the orders.
+        :return: List aligned with orders, see _post_batch.
+        """
+        requests = []
+        for order in orders:
+            request = {key: value if isinstance(value, (str, bool)) else f'{value}' for key, value in order.items()}
+            if self.validator is not None and self.validator.category == category:
+                qty_str, price_str = self.validator.validate(
+                    request["symbol"], request["side"], request["qty"], request.get("price"),
+                    request.get("orderType", "Limit"), request.get("marketUnit")
+                )
+                request["qty"] = qty_str
+                if price_str is not None:
+                    request["price"] = price_str
+            request.setdefault("orderLinkId", uuid.uuid4().hex)
+            requests.append(request)
+        return await self._post_batch("/v5/order/create-batch", category, requests)
+
+    async def amend_orders(self, amendments: list, category: str = "spot"):
+        """
+        Amends many orders through /v5/order/amend-batch.
+
+        :param amendments: List of dicts with symbol, orderId or orderLinkId and the new qty/price.
+        :param category: Bybit category of the orders.
+        :return: List aligned with amendments, see _post_batch.
+        """
+        requests = [
+            {key: value if isinstance(value, (str, bool)) else f'{value}' for key, value in amendment.items()}
+            for amendment in amendments
+        ]
+        return await self._post_batch("/v5/order/amend-batch", category, requests)
+
+    async def cancel_orders(self, cancels: list, category: str = "spot"):
+        """
+        Cancels many orders through /v5/order/cancel-batch.
+
+        :param cancels: List of dicts with symbol and orderId or orderLinkId.
+        :param category: Bybit category of the orders.
+        :return: List aligned with cancels, see _post_batch.
+        """
+        requests = [{key: f'{value}' for key, value in cancel.items()} for cancel in cancels]
+        return await self._post_batch("/v5/order/cancel-batch", category, requests)
+
+    async def cancel_all_orders(self, category: str = "spot", symbol: str = None, params: dict = {}):
+        """
+        Cancels every open order of a category, optionally restricted to a symbol.
+        """
+        query_params = {"category": category}
+        if symbol:
+            query_params["symbol"] = symbol
+        query_params.update(params)
+
+        status, text = await self._signed_post("/v5/order/cancel-all", query_params)
+        if status == 200:
+            return json.loads(text)
+        else:
+            self.logger.info(f"Error cancelling all orders: {status} - {text}")
+            raise Exception("Error cancelling all orders")
+
+    async def get_balance(self):
+        status, text = await self._signed_get("/v5/account/wallet-balance", "accountType=UNIFIED")
+        if status == 200:
+            data = json.loads(text)
+            balance = {}
+            self.balance_time = int(data.get("time") or 0)
+            if data["retMsg"] == "OK":
+                for coin in data["result"]["list"][0]["coin"]:
+                    balance[coin["coin"]] = {
+                        "free": float(coin["walletBalance"]),
+                        "locked": float(coin["locked"]),
+                    }
+            else:
+                self.logger.info(f"Error fetching balance: {data['retMsg']}")
+            self.balance = balance
+            return balance
+        else:
+            self.logger.info(f"Error fetching balance: {status} - {text}")
+            raise Exception(f"Error fetching balance: {status} - {text}")
+
+    async def _get_paginated(self, endpoint: str, params: dict, name: str):
+        items = []
+        params = dict(params)
+        while True:
+            query_string = "&".join(f"{key}={value}" for key, value in params.items())
+            status, text = await self._signed_get(endpoint, query_string)
+            data = json.loads(text) if status == 200 else {}
+            if data.get("retCode") != 0:
+                self.logger.info(f"Error fetching {name}: {status} - {text}")
+                raise Exception(f"Error fetching {name}: {status} - {text}")
+            items.extend(data["result"].get("list", []))
+            if not data["result"].get("nextPageCursor"):
+                return items
+            params["cursor"] = data["result"]["nextPageCursor"]
+
+    async def get_open_orders(self, category: str = "spot", symbol: str = None, settleCoin: str = None):
+        """
+        Returns every open order of a category, following the cursor.
+        """
+        params = {"category": category, "limit": 50}
+        if symbol:
+            params["symbol"] = symbol
+        if settleCoin:
+            params["settleCoin"] = settleCoin
+        return await self._get_paginated("/v5/order/realtime", params, "open orders")
+
+    async def get_positions(self, category: str = "linear", symbol: str = None, settleCoin: str = None):
+        """
+        Returns every position of a category, following the cursor.
+        """
+        params = {"category": category, "limit": 200}
+        if symbol:
+            params["symbol"] = symbol
+        if settleCoin:
+            params["settleCoin"] = settleCoin
+        return await self._get_paginated("/v5/position/list", params, "positions")
+
+    def get_locked_amount(self, coin: str):
+        return float(self.balance.get(coin, {}).get("locked", 0.0))
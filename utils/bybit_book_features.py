@@ -0,0 +1,149 @@
+import numpy as np
+
+
+def _side_keys(book, side):
+    # Bids are sorted descending; negate them so both sides search ascending
+    return -book["price"] if side == "bids" else book["price"]
+
+
+class BybitBookFeatures:
+    """
+    Microstructure features of a BybitOrderbook, maintained from its deltas.
+
+    Mid, spread and microprice come from the top of book. The depth-weighted
+    imbalance over the top N levels is only recomputed (over N levels) when a
+    delta touches those levels. The notional within X bps of mid is adjusted
+    by price * quantity change for every delta level inside the band, and
+    recomputed from the book only when the mid moves. All values are in the
+    units of the book and are read in O(1) as attributes or via to_dict.
+    """
+
+    def __init__(self, levels=(1, 5, 10), bands_bps=(5, 10, 25)):
+        """
+        Initializes an instance of BybitBookFeatures.
+
+        :param levels: Numbers of top levels N for the depth-weighted imbalance.
+        :param bands_bps: Band widths X, in basis points from mid, for the notional features.
+        """
+        self.levels = tuple(levels)
+        self.bands_bps = tuple(bands_bps)
+        self.mid = np.nan
+        self.spread = np.nan
+        self.microprice = np.nan
+        self.imbalance = {n: np.nan for n in self.levels}
+        self.weighted_depth = {"bids": {n: 0.0 for n in self.levels}, "asks": {n: 0.0 for n in self.levels}}
+        self.notional = {"bids": {x: 0.0 for x in self.bands_bps}, "asks": {x: 0.0 for x in self.bands_bps}}
+        self._dirty_sides = set()
+
+    @staticmethod
+    def _weights(n):
+        # Linearly decaying weights: the best level counts n times the Nth one
+        return (n - np.arange(n)) / n
+
+    def _top_depth(self, book, side):
+        levels = book.get_book_type(side)
+        for n in self.levels:
+            top = levels["quantity"][:n]
+            self.weighted_depth[side][n] = float(np.dot(top, self._weights(n)[: len(top)]))
+
+    def _band_notional(self, book, side):
+        levels = book.get_book_type(side)
+        for x in self.bands_bps:
+            if np.isnan(self.mid):
+                self.notional[side][x] = 0.0
+                continue
+            if side == "bids":
+                count = np.searchsorted(-levels["price"], -self.mid * (1 - x / 1e4), side="right")
+            else:
+                count = np.searchsorted(levels["price"], self.mid * (1 + x / 1e4), side="right")
+            self.notional[side][x] = float(np.dot(levels["price"][:count], levels["quantity"][:count]))
+
+    def _update_top(self, book):
+        bid_price, bid_quantity, ask_price, ask_quantity = book.get_bbo()
+        if bid_price is None or ask_price is None:
+            self.mid = self.spread = self.microprice = np.nan
+        else:
+            self.mid = (bid_price + ask_price) / 2
+            self.spread = ask_price - bid_price
+            total = bid_quantity + ask_quantity
+            self.microprice = (bid_price * ask_quantity + ask_price * bid_quantity) / total if total else self.mid
+
+    def _update_imbalance(self):
+        for n in self.levels:
+            bids = self.weighted_depth["bids"][n]
+            asks = self.weighted_depth["asks"][n]
+            self.imbalance[n] = (bids - asks) / (bids + asks) if bids + asks else np.nan
+
+    def reset(self, book):
+        """
+        Recomputes every feature from scratch, e.g. after a snapshot.
+        """
+        self._update_top(book)
+        for side in ["bids", "asks"]:
+            self._top_depth(book, side)
+            self._band_notional(book, side)
+        self._update_imbalance()
+        self._dirty_sides.clear()
+
+    def on_side_update(self, book, side, updates, old_levels):
+        """
+        Applies the delta levels of one side; called by BybitOrderbook.update_book
+        right before the side is replaced.
+
+        :param book: The updated BybitOrderbook.
+        :param side: 'bids' or 'asks'.
+        :param updates: Structured array of the (price, new quantity) delta levels.
+        :param old_levels: The side before the update.
+        """
+        if len(updates) == 0:
+            return
+        # A price repeated within a delta is applied once, like update_book does
+        _, first = np.unique(updates["price"], return_index=True)
+        if len(first) < len(updates):
+            updates = updates[np.sort(first)]
+        keys = _side_keys(old_levels, side)
+        targets = _side_keys(updates, side)
+
+        # Top-N depth only changes if a delta is at or above the old Nth level
+        deepest = max(self.levels)
+        if len(keys) < deepest or targets.min() <= keys[deepest - 1]:
+            self._dirty_sides.add(side)
+
+        if np.isnan(self.mid):
+            return
+        old_quantities = np.zeros(len(updates))
+        if len(keys):
+            positions = np.searchsorted(keys, targets).clip(max=len(keys) - 1)
+            match = keys[positions] == targets
+            old_quantities[match] = old_levels["quantity"][positions[match]]
+        changes = updates["price"] * (updates["quantity"] - old_quantities)
+        for x in self.bands_bps:
+            if side == "bids":
+                inside = updates["price"] >= self.mid * (1 - x / 1e4)
+            else:
+                inside = updates["price"] <= self.mid * (1 + x / 1e4)
+            self.notional[side][x] += float(changes[inside].sum())
+
+    def on_book_update(self, book):
+        """
+        Finishes an applied delta: refreshes the top-of-book features, the
+        touched top-N depths and, if the mid moved, the band notionals.
+        """
+        mid = self.mid
+        self._update_top(book)
+        for side in self._dirty_sides:
+            self._top_depth(book, side)
+        self._dirty_sides.clear()
+        if not (self.mid == mid):
+            for side in ["bids", "asks"]:
+                self._band_notional(book, side)
+        self._update_imbalance()
+
+    def to_dict(self):
+        features = {"mid": self.mid, "spread": self.spread, "microprice": self.microprice}
+        for n in self.levels:
+            features[f"imbalance_{n}"] = self.imbalance[n]
+        for side in ["bids", "asks"]:
+            for x in self.bands_bps:
+                features[f"{side}_notional_{x}bps"] = self.notional[side][x]
+        return features
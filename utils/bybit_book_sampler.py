@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import queue
+import asyncio
+import logging
+import threading
+import numpy as np
+
+
+class BybitBookSampler:
+    """
+    Samples the top levels of several books at a fixed cadence into
+    preallocated tensors.
+
+    Each sample writes the top ``levels`` bids/asks of every symbol into row
+    ``t`` of a ``(chunk_size, n_symbols, levels, 4)`` float buffer holding
+    (bid price, bid quantity, ask price, ask quantity); missing levels are nan
+    and integer-mode books are converted to float prices and quantities.
+    Full chunks are handed to a background thread that writes them to .npy
+    files (optionally through a memory map) and returns the buffer to a pool,
+    so sampling neither allocates nor blocks the event loop.
+    """
+
+    def __init__(self, books: dict, symbols: list, output_dir: str, levels: int = 10,
+                 chunk_size: int = 600, interval: float = 0.1, n_buffers: int = 2,
+                 use_memmap: bool = False, prefix: str = "l2", logger=None):
+        """
+        Initializes an instance of BybitBookSampler.
+
+        :param books: Mapping of symbol to Orderbook, e.g. BybitWebSocket.books.
+        :param symbols: Symbols sampled, in tensor order.
+        :param output_dir: Directory the chunk files are written to.
+        :param levels: Number of top levels N sampled per side.
+        :param chunk_size: Number of samples T per chunk file.
+        :param interval: Seconds between samples.
+        :param n_buffers: Number of preallocated chunk buffers.
+        :param use_memmap: Write chunks through np.lib.format.open_memmap instead of np.save.
+        :param prefix: File name prefix of the chunks.
+        :param logger: Optional logger instance for logging purposes.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.books = books
+        self.symbols = list(symbols)
+        self.output_dir = output_dir
+        self.levels = levels
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self.use_memmap = use_memmap
+        self.prefix = prefix
+        self.stop_execution = True
+
+        self._free = queue.Queue()
+        for _ in range(n_buffers):
+            self._free.put(self._allocate())
+        self._pending = queue.Queue()
+        self._writer = None
+        self.chunk_index = 0
+        self.position = 0
+        self.buffer, self.timestamps = self._free.get()
+
+    def _allocate(self):
+        return (
+            np.full((self.chunk_size, len(self.symbols), self.levels, 4), np.nan),
+            np.zeros(self.chunk_size, dtype="f8"),
+        )
+
+    def _write_meta(self):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, f"{self.prefix}_meta.json"), "w") as f:
+                json.dump({
+                    "symbols": self.symbols,
+                    "levels": self.levels,
+                    "interval": self.interval,
+                    "fields": ["bid_price", "bid_quantity", "ask_price", "ask_quantity"],
+                }, f)
+        except OSError as e:
+            self.logger.warning(f"Could not write sampler metadata to {self.output_dir}: {e}")
+
+    def _write_chunks(self):
+        # Runs on the writer thread, so no file system call is made on the event loop
+        self._write_meta()
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            index, buffer, timestamps, size = item
+            path = os.path.join(self.output_dir, f"{self.prefix}_{index:06d}")
+            try:
+                if self.use_memmap:
+                    books = np.lib.format.open_memmap(f"{path}.npy", mode="w+", dtype=buffer.dtype,
+                                                      shape=(size,) + buffer.shape[1:])
+                    books[:] = buffer[:size]
+                    books.flush()
+                    del books
+                else:
+                    np.save(f"{path}.npy", buffer[:size])
+                np.save(f"{path}_timestamps.npy", timestamps[:size])
+            except OSError as e:
+                self.logger.warning(f"Could not write chunk {path}: {e}")
+            self._free.put((buffer, timestamps))
+
+    def _start_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_chunks, name="bybit-book-sampler", daemon=True)
+            self._writer.start()
+
+    def _flush(self):
+        if self.position == 0:
+            return
+        self._start_writer()
+        self._pending.put((self.chunk_index, self.buffer, self.timestamps, self.position))
+        self.chunk_index += 1
+        self.position = 0
+        try:
+            self.buffer, self.timestamps = self._free.get_nowait()
+        except queue.Empty:
+            self.logger.warning("Book sampler writer is behind, allocating an extra buffer.")
+            self.buffer, self.timestamps = self._allocate()
+
+    def sample(self, timestamp: float):
+        """
+        Copies the top levels of every book into the next row of the buffer.
+        """
+        row = self.buffer[self.position]
+        for i, symbol in enumerate(self.symbols):
+            book = self.books.get(symbol)
+            out = row[i]
+            if book is None:
+                out[:] = np.nan
+                continue
+            for side, column in (("bids", 0), ("asks", 2)):
+                levels = book.get_book_type(side)[:self.levels]
+                if book.price_scale is not None:
+                    # Integer-mode books hold tick and lot counts
+                    levels = book.to_float(levels)
+                size = len(levels)
+                out[:size, column] = levels["price"][:size]
+                out[:size, column + 1] = levels["quantity"][:size]
+                out[size:, column:column + 2] = np.nan
+        self.timestamps[self.position] = timestamp
+        self.position += 1
+        if self.position == self.chunk_size:
+            self._flush()
+
+    async def run(self):
+        """
+        Samples every ``interval`` seconds, on a fixed schedule that does not
+        drift with the time spent sampling, until stop is called.
+        """
+        self.stop_execution = False
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while not self.stop_execution:
+            self.sample(time.time())
+            next_time += self.interval
+            delay = next_time - loop.time()
+            if delay < 0:
+                # Skip the samples we are too late for instead of bursting
+                next_time += -delay // self.interval * self.interval + self.interval
+                delay = next_time - loop.time()
+            await asyncio.sleep(delay)
+
+    async def stop(self):
+        """
+        Stops sampling, flushes the partial chunk and waits for the writer
+        in an executor, so that the event loop keeps running meanwhile.
+        """
+        self.stop_execution = True
+        self._flush()
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._pending.put(None)
+            await asyncio.get_running_loop().run_in_executor(None, writer.join)
@@ -0,0 +1,159 @@
+import numpy as np
+
+from utils.bybit_book_features import _side_keys
+
+SIDES = ["bids", "asks"]
+
+
+class BybitDepthBuckets:
+    """
+    Depth of a BybitOrderbook aggregated into fixed-width price buckets out
+    to a range from mid, maintained from its deltas.
+
+    Buckets are laid out from an anchor mid: bid bucket i holds the levels in
+    (anchor - (i + 1) * width, anchor - i * width], ask bucket i the levels in
+    [anchor + i * width, anchor + (i + 1) * width); levels on the wrong side of
+    the anchor count in bucket 0. Every delta level adds its quantity (and
+    notional) change to its bucket only, in one np.bincount per side. When the
+    mid moves away from the anchor by more than ``reanchor``, the buckets are
+    re-anchored on the new mid and rebuilt from the book.
+
+    The quantity and notional arrays are updated in place and can be read
+    without copying; they are only replaced when a re-anchor changes the
+    number of buckets. Prices and quantities are in the units of the book.
+    """
+
+    def __init__(self, width: float = 1.0, unit: str = "bps", range_bps: float = 200.0, reanchor: float = None):
+        """
+        Initializes an instance of BybitDepthBuckets.
+
+        :param width: Bucket width, in basis points of the anchor mid or in price.
+        :param unit: 'bps' or 'price', the unit of width and reanchor.
+        :param range_bps: How far from the anchor mid the buckets reach, in basis points.
+        :param reanchor: Mid move that triggers a re-anchor; defaults to one bucket width.
+        """
+        if unit not in ["bps", "price"]:
+            raise ValueError("Invalid unit, expected 'bps' or 'price'.")
+        if width <= 0 or range_bps <= 0:
+            raise ValueError("Bucket width and range must be positive.")
+        self.width = width
+        self.unit = unit
+        self.range_bps = range_bps
+        self.reanchor = reanchor if reanchor is not None else width
+        self.anchor = np.nan
+        self.price_width = np.nan
+        self.size = 0
+        self.quantity = {side: np.zeros(0) for side in SIDES}
+        self.notional = {side: np.zeros(0) for side in SIDES}
+        self.anchors = 0
+
+    def _price_amount(self, amount):
+        return self.anchor * amount / 1e4 if self.unit == "bps" else amount
+
+    def _buckets(self, prices, side):
+        if side == "bids":
+            index = np.floor((self.anchor - prices) / self.price_width)
+        else:
+            index = np.floor((prices - self.anchor) / self.price_width)
+        return index.clip(min=0).astype(np.intp)
+
+    def _anchor(self, book):
+        bid_price, _, ask_price, _ = book.get_bbo()
+        if bid_price is None or ask_price is None:
+            self.anchor = np.nan
+            return
+        self.anchor = (bid_price + ask_price) / 2
+        self.price_width = self._price_amount(self.width)
+        size = int(np.ceil(self.range_bps / 1e4 * self.anchor / self.price_width))
+        if size != self.size:
+            self.size = size
+            self.quantity = {side: np.zeros(size) for side in SIDES}
+            self.notional = {side: np.zeros(size) for side in SIDES}
+        self.anchors += 1
+
+    def _accumulate(self, side, prices, quantities):
+        index = self._buckets(prices, side)
+        inside = index < self.size
+        index, prices, quantities = index[inside], prices[inside], quantities[inside]
+        self.quantity[side] += np.bincount(index, weights=quantities, minlength=self.size)
+        self.notional[side] += np.bincount(index, weights=prices * quantities, minlength=self.size)
+
+    def reset(self, book):
+        """
+        Re-anchors on the current mid and rebuilds every bucket from the book,
+        e.g. after a snapshot.
+        """
+        self._anchor(book)
+        self.rebuild(book)
+
+    def rebuild(self, book):
+        """
+        Recomputes every bucket from the book around the current anchor.
+        """
+        for side in SIDES:
+            self.quantity[side][:] = 0.0
+            self.notional[side][:] = 0.0
+            if np.isnan(self.anchor):
+                continue
+            levels = book.get_book_type(side)
+            self._accumulate(side, levels["price"].astype("f8"), levels["quantity"].astype("f8"))
+
+    def on_side_update(self, book, side, updates, old_levels):
+        """
+        Applies the delta levels of one side; called by BybitOrderbook.update_book
+        right before the side is replaced.
+
+        :param book: The updated BybitOrderbook.
+        :param side: 'bids' or 'asks'.
+        :param updates: Structured array of the (price, new quantity) delta levels.
+        :param old_levels: The side before the update.
+        """
+        if len(updates) == 0 or np.isnan(self.anchor):
+            return
+        # A price repeated within a delta is applied once, like update_book does
+        _, first = np.unique(updates["price"], return_index=True)
+        if len(first) < len(updates):
+            updates = updates[np.sort(first)]
+        old_quantities = np.zeros(len(updates))
+        keys = _side_keys(old_levels, side)
+        if len(keys):
+            targets = _side_keys(updates, side)
+            positions = np.searchsorted(keys, targets).clip(max=len(keys) - 1)
+            match = keys[positions] == targets
+            old_quantities[match] = old_levels["quantity"][positions[match]]
+        self._accumulate(side, updates["price"].astype("f8"), updates["quantity"] - old_quantities)
+
+    def on_book_update(self, book):
+        """
+        Finishes an applied delta: re-anchors if the mid moved past the threshold.
+        """
+        bid_price, _, ask_price, _ = book.get_bbo()
+        if bid_price is None or ask_price is None:
+            return
+        mid = (bid_price + ask_price) / 2
+        if np.isnan(self.anchor) or abs(mid - self.anchor) > self._price_amount(self.reanchor):
+            self.reset(book)
+
+    def edges(self, side: str):
+        """
+        Returns the price bounds of the buckets of a side, from the anchor
+        outwards (size + 1 values).
+        """
+        offsets = np.arange(self.size + 1) * self.price_width
+        return self.anchor - offsets if side == "bids" else self.anchor + offsets
+
+    def column(self, side: str, field: str = "quantity"):
+        """
+        Returns the bucketed quantity or notional of a side as a read-only view
+        of the live array.
+        """
+        view = getattr(self, field)[side].view()
+        view.flags.writeable = False
+        return view
+
+    def to_dict(self):
+        return {
+            "anchor": self.anchor,
+            "price_width": self.price_width,
+            **{f"{side}_{field}": getattr(self, field)[side].tolist() for side in SIDES for field in ["quantity", "notional"]},
+        }
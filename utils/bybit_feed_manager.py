@@ -0,0 +1,217 @@
+import time
+import asyncio
+import logging
+import functools
+import numpy as np
+
+from utils.bybit_public_websocket import BybitWebSocket
+from utils.bybit_ticker_scanner import BybitTickerScanner
+
+# Bybit category -> BybitWebSocket _type
+CATEGORY_TYPES = {"spot": "spot", "linear": "futures", "inverse": "inverse", "option": "options"}
+
+BASIS_FIELDS = [
+    "spot_bid", "spot_ask", "derivative_bid", "derivative_ask", "funding_rate",
+    "basis_bps", "funding_adjusted_bps", "carry_bps", "reverse_carry_bps",
+    "spot_updated_at", "derivative_updated_at", "leg_lag_ms", "updated_at",
+]
+
+
+class BybitFeedManager:
+    """
+    Runs the public streams of several categories (spot, linear, inverse,
+    option) together, with one dispatch path and one clock.
+
+    Each category gets one BybitWebSocket, created when first used, whose BBO
+    and message callbacks all go through the manager. Books are keyed by
+    (category, symbol). A basis pair lines up the spot book of an underlying
+    with a linear or inverse contract; its row in the columnar basis table
+    (one float column per BASIS_FIELDS entry) is recomputed in O(1) only
+    when the top of book of one of its legs, or the funding rate of the
+    contract, changes.
+
+    Basis values, in basis points of the spot mid:
+      - basis_bps: derivative mid against spot mid.
+      - funding_adjusted_bps: basis_bps minus the next funding payment
+        (fundingRate), i.e. the premium left after one funding period.
+      - carry_bps: executable cash and carry, buying spot at the ask and
+        selling the contract at the bid.
+      - reverse_carry_bps: selling spot at the bid and buying the contract at the ask.
+      - leg_lag_ms: age difference of the two legs' tops of book, to discard
+        values computed from one stale leg.
+    """
+
+    def __init__(self, logger=None, loop_monitor=None, capacity: int = 64, clock=time.time):
+        """
+        Initializes an instance of BybitFeedManager.
+
+        :param logger: Optional logger instance for logging purposes.
+        :param loop_monitor: Optional LoopLagMonitor shared by every connection.
+        :param capacity: Initial number of basis rows; the table grows as pairs are added.
+        :param clock: Function returning the time stamped on every update.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.loop_monitor = loop_monitor
+        self.clock = clock
+        self.sockets = {}
+        self.scanners = {}
+        self.books = {}
+
+        self.capacity = capacity
+        self.keys = []
+        self.index = {}
+        self.legs = []
+        self.rows_by_leg = {}
+        self.columns = {field: np.full(capacity, np.nan) for field in BASIS_FIELDS}
+
+        # Optional async callbacks: (category, BBOEvent) and (key, basis dict)
+        self.process_bbo_update = None
+        self.process_basis_update = None
+
+    def socket(self, category: str):
+        """
+        Returns the BybitWebSocket of a category, creating it on first use.
+        """
+        ws = self.sockets.get(category)
+        if ws is None:
+            assert category in CATEGORY_TYPES, "Invalid category"
+            ws = BybitWebSocket(CATEGORY_TYPES[category], logger=self.logger, loop_monitor=self.loop_monitor)
+            ws.process_bbo_update = functools.partial(self._on_bbo, category)
+            ws.process_book_update = functools.partial(self._on_message, category)
+            self.sockets[category] = ws
+        return ws
+
+    def add_book(self, category: str, symbol: str, depth: int = 50):
+        """
+        Subscribes to the orderbook of a symbol in a category, once.
+
+        :return: The BybitOrderbook.
+        """
+        book = self.books.get((category, symbol))
+        if book is None:
+            ws = self.socket(category)
+            ws.add_orderbook_stream(symbol, depth, _type=category)
+            book = self.books[(category, symbol)] = ws.books[symbol]
+        return book
+
+    def _add_funding_stream(self, category, symbol):
+        scanner = self.scanners.get(category)
+        if scanner is None:
+            scanner = self.scanners[category] = BybitTickerScanner(category, logger=self.logger)
+        if symbol not in scanner.index:
+            scanner._row(symbol)
+            self.socket(category).add_ticker_stream(symbol, scanner)
+
+    def _grow(self, capacity):
+        for field, column in self.columns.items():
+            grown = np.full(capacity, np.nan)
+            grown[: self.capacity] = column
+            self.columns[field] = grown
+        self.capacity = capacity
+
+    def add_basis(self, base: str, quote: str = "USDT", derivative: str = "linear", spot_symbol: str = None,
+                  derivative_symbol: str = None, depth: int = 50):
+        """
+        Lines up the spot book of an underlying with a perpetual (or future)
+        and tracks their basis.
+
+        :param base: Underlying coin, e.g. 'BTC'.
+        :param quote: Quote coin of the spot book.
+        :param derivative: 'linear' or 'inverse'.
+        :param spot_symbol: Spot symbol; defaults to base + quote.
+        :param derivative_symbol: Contract symbol; defaults to base + quote (linear) or base + 'USD' (inverse).
+        :param depth: Orderbook depth subscribed for both legs.
+        :return: Key of the basis row, (base, derivative).
+        """
+        assert derivative in ["linear", "inverse"], "Invalid category"
+        key = (base, derivative)
+        if key in self.index:
+            return key
+        spot_symbol = spot_symbol if spot_symbol else base + quote
+        if not derivative_symbol:
+            derivative_symbol = base + (quote if derivative == "linear" else "USD")
+        self.add_book("spot", spot_symbol, depth)
+        self.add_book(derivative, derivative_symbol, depth)
+        self._add_funding_stream(derivative, derivative_symbol)
+
+        row = len(self.keys)
+        if row == self.capacity:
+            self._grow(self.capacity * 2)
+        self.keys.append(key)
+        self.index[key] = row
+        self.legs.append((spot_symbol, derivative, derivative_symbol))
+        self.rows_by_leg.setdefault(("spot", spot_symbol), []).append(row)
+        self.rows_by_leg.setdefault((derivative, derivative_symbol), []).append(row)
+        return key
+
+    def _update_row(self, row):
+        columns = self.columns
+        spot_bid, spot_ask = columns["spot_bid"][row], columns["spot_ask"][row]
+        derivative_bid, derivative_ask = columns["derivative_bid"][row], columns["derivative_ask"][row]
+        spot_mid = (spot_bid + spot_ask) / 2
+        basis = ((derivative_bid + derivative_ask) / 2 - spot_mid) / spot_mid * 1e4
+        funding = columns["funding_rate"][row]
+        columns["basis_bps"][row] = basis
+        columns["funding_adjusted_bps"][row] = basis - (funding if funding == funding else 0.0) * 1e4
+        columns["carry_bps"][row] = (derivative_bid - spot_ask) / spot_mid * 1e4
+        columns["reverse_carry_bps"][row] = (spot_bid - derivative_ask) / spot_mid * 1e4
+        columns["leg_lag_ms"][row] = abs(columns["spot_updated_at"][row] - columns["derivative_updated_at"][row]) * 1e3
+        columns["updated_at"][row] = self.clock()
+
+    async def _publish(self, rows):
+        for row in rows:
+            self._update_row(row)
+            if self.process_basis_update is not None:
+                await self.process_basis_update(self.keys[row], self.get_row(row))
+
+    async def _on_bbo(self, category, event):
+        rows = self.rows_by_leg.get((category, event.symbol))
+        if rows:
+            side = "spot" if category == "spot" else "derivative"
+            now = self.clock()
+            bid = event.bid_price if event.bid_price is not None else np.nan
+            ask = event.ask_price if event.ask_price is not None else np.nan
+            for row in rows:
+                self.columns[f"{side}_bid"][row] = bid
+                self.columns[f"{side}_ask"][row] = ask
+                self.columns[f"{side}_updated_at"][row] = now
+            await self._publish(rows)
+        if self.process_bbo_update is not None:
+            await self.process_bbo_update(category, event)
+
+    async def _on_message(self, category, data):
+        topic = data.get("topic", "")
+        if not topic.startswith("tickers") or "fundingRate" not in data.get("data", {}):
+            return
+        symbol = data["data"]["symbol"]
+        rows = self.rows_by_leg.get((category, symbol), [])
+        funding = self.scanners[category].get(symbol, "fundingRate")
+        for row in rows:
+            self.columns["funding_rate"][row] = funding
+        await self._publish(rows)
+
+    def get_row(self, row: int):
+        return {field: float(self.columns[field][row]) for field in BASIS_FIELDS}
+
+    def get(self, base: str, derivative: str = "linear"):
+        """
+        Returns the basis values of a pair as a dict, or None if it is not tracked.
+        """
+        row = self.index.get((base, derivative))
+        return self.get_row(row) if row is not None else None
+
+    def column(self, field: str):
+        """
+        Returns a basis field for every pair, in the order of ``keys``.
+        """
+        return self.columns[field][: len(self.keys)]
+
+    async def start(self):
+        """
+        Runs every category connection until stop is called.
+        """
+        await asyncio.gather(*[ws.start() for ws in self.sockets.values()])
+
+    def stop(self):
+        for ws in self.sockets.values():
+            ws.stop_execution = True
@@ -0,0 +1,293 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import numpy as np
+
+from utils.bybit_market import BybitMarketApi
+
+CATEGORIES = ["spot", "linear", "inverse", "option"]
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "BYBIT_INSTRUMENTS_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "bybit_api", "instruments.json"),
+)
+
+
+class InstrumentTable:
+    """
+    Precomputed index over the instruments of a single category.
+
+    Symbols map to a row number; the trading filters are stored as columnar
+    float arrays so that a whole set of symbols can be checked at once.
+    """
+
+    def __init__(self, category: str, instruments: list, fetched_at: float = 0.0):
+        """
+        Builds the lookups for a category.
+
+        :param category: Bybit category ('spot', 'linear', 'inverse' or 'option').
+        :param instruments: List of instrument dicts as returned by instruments-info.
+        :param fetched_at: Epoch seconds at which the list was fetched.
+        """
+        self.category = category
+        self.instruments = instruments
+        self.fetched_at = fetched_at
+
+        size = len(instruments)
+        self.symbols = []
+        self.index = {}
+        self.by_base = {}
+        self.by_quote = {}
+        self.by_pair = {}
+        self.tick_size = np.zeros(size, dtype="f8")
+        self.qty_step = np.zeros(size, dtype="f8")
+        self.min_order_qty = np.zeros(size, dtype="f8")
+        self.max_order_qty = np.zeros(size, dtype="f8")
+        self.min_notional = np.zeros(size, dtype="f8")
+
+        for row, info in enumerate(instruments):
+            symbol = info["symbol"]
+            base = info.get("baseCoin", "")
+            quote = info.get("quoteCoin", "")
+            self.symbols.append(symbol)
+            self.index[symbol] = row
+            self.by_base.setdefault(base, []).append(row)
+            self.by_quote.setdefault(quote, []).append(row)
+            self.by_pair.setdefault((base, quote), []).append(row)
+
+            filters = self.get_filters(info)
+            self.tick_size[row] = float(filters["tickSize"])
+            self.qty_step[row] = float(filters["qtyStep"])
+            self.min_order_qty[row] = float(filters["minOrderQty"])
+            self.max_order_qty[row] = float(filters["maxOrderQty"])
+            self.min_notional[row] = float(filters["minNotional"])
+
+    @staticmethod
+    def get_filters(info: dict):
+        """
+        Normalizes the price and lot filters of an instrument across categories.
+
+        Spot instruments expose ``basePrecision``/``minOrderAmt`` where derivatives
+        use ``qtyStep``/``minNotionalValue``; values are kept as the exchange strings.
+
+        :param info: Instrument dict as returned by instruments-info.
+        :return: Dict with tickSize, qtyStep, minOrderQty, maxOrderQty and minNotional.
+        """
+        price_filter = info.get("priceFilter", {})
+        lot_filter = info.get("lotSizeFilter", {})
+        return {
+            "tickSize": price_filter.get("tickSize") or "0",
+            "qtyStep": lot_filter.get("qtyStep") or lot_filter.get("basePrecision") or "0",
+            "minOrderQty": lot_filter.get("minOrderQty") or "0",
+            "maxOrderQty": lot_filter.get("maxOrderQty") or "0",
+            "minNotional": lot_filter.get("minNotionalValue") or lot_filter.get("minOrderAmt") or "0",
+        }
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def get(self, symbol: str):
+        """
+        Returns the raw instrument dict of a symbol, or None if it is unknown.
+        """
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        return self.instruments[row]
+
+    def rows(self, symbols):
+        """
+        Returns the row numbers of a list of symbols as an integer array.
+
+        :raises KeyError: If one of the symbols is not listed in this category.
+        """
+        return np.fromiter((self.index[symbol] for symbol in symbols), dtype=np.intp, count=len(symbols))
+
+    def symbols_for(self, base: str = None, quote: str = None):
+        """
+        Returns the symbols trading a base coin, a quote coin, or both.
+        """
+        if base is not None and quote is not None:
+            rows = self.by_pair.get((base, quote), [])
+        elif base is not None:
+            rows = self.by_base.get(base, [])
+        elif quote is not None:
+            rows = self.by_quote.get(quote, [])
+        else:
+            rows = range(len(self.symbols))
+        return [self.symbols[row] for row in rows]
+
+
+class BybitInstrumentRegistry:
+    """
+    Process-wide registry of Bybit instruments backed by a TTL cache on disk.
+
+    Tables are loaded lazily: fresh entries from the cache file are used as-is
+    and only expired categories are fetched again (with cursor pagination).
+    """
+
+    def __init__(self, market_api=None, cache_path=DEFAULT_CACHE_PATH, ttl: float = 3600, logger=None):
+        """
+        Initializes an instance of BybitInstrumentRegistry.
+
+        :param market_api: Optional BybitMarketApi used to fetch instruments.
+        :param cache_path: Path of the JSON cache file, or None to keep it in memory only.
+        :param ttl: Seconds after which a category is considered stale.
+        :param logger: Optional logger instance for logging purposes.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.market_api = market_api
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.tables = {}
+        self._disk_loaded = False
+
+    def is_fresh(self, category: str):
+        """
+        Checks whether a category is loaded and younger than the TTL.
+        """
+        self._load_disk_cache()
+        table = self.tables.get(category)
+        return table is not None and time.time() - table.fetched_at < self.ttl
+
+    def update(self, category: str, instruments: list, fetched_at: float = None):
+        """
+        Replaces the instruments of a category and persists the cache.
+
+        :param category: Bybit category of the instruments.
+        :param instruments: List of instrument dicts as returned by instruments-info.
+        :param fetched_at: Optional epoch seconds of the fetch; defaults to now.
+        :return: The new InstrumentTable.
+        """
+        assert category in CATEGORIES, "Invalid category"
+        self._load_disk_cache()
+        table = InstrumentTable(category, instruments, fetched_at if fetched_at else time.time())
+        self.tables[category] = table
+        self._save_disk_cache()
+        return table
+
+    async def _fetch_instruments(self, category: str):
+        """
+        Fetches every page of a category.
+
+        :return: List of instrument dicts.
+        :raises Exception: If a page is an error payload; nothing is kept from a failed fetch.
+        """
+        if self.market_api is None:
+            self.market_api = BybitMarketApi(logger=self.logger)
+        response = await self.market_api.get_all_instruments_info(category)
+        if response.get("retCode") != 0:
+            raise Exception(
+                f"Error fetching {category} instruments: {response.get('retCode')} - {response.get('retMsg')}"
+            )
+        instruments = (response.get("result") or {}).get("list")
+        if instruments is None:
+            raise Exception(f"Error fetching {category} instruments: response holds no instrument list")
+        return instruments
+
+    async def load(self, categories=None, force: bool = False):
+        """
+        Makes sure the given categories are loaded, fetching stale ones concurrently.
+
+        :param categories: Optional list of categories; defaults to all of them.
+        :param force: Fetch from the exchange even if the cache is fresh.
+        :return: Dict of category to InstrumentTable.
+        :raises Exception: If a category could not be fetched; the categories that were
+            fetched are still updated, the failed ones keep their previous table.
+        """
+        categories = categories if categories else CATEGORIES
+        stale = [category for category in categories if force or not self.is_fresh(category)]
+        if stale:
+            results = await asyncio.gather(
+                *[self._fetch_instruments(category) for category in stale], return_exceptions=True
+            )
+            errors = []
+            for category, result in zip(stale, results):
+                if isinstance(result, BaseException):
+                    self.logger.warning(f"Error fetching {category} instruments: {result}")
+                    errors.append(result)
+                    continue
+                self.update(category, result)
+            if errors:
+                raise errors[0]
+        return {category: self.tables[category] for category in categories if category in self.tables}
+
+    def table(self, category: str = "spot"):
+        """
+        Returns the InstrumentTable of a category.
+
+        :raises KeyError: If the category has not been loaded.
+        """
+        self._load_disk_cache()
+        return self.tables[category]
+
+    def get(self, symbol: str, category: str = "spot"):
+        """
+        Returns the raw instrument dict of a symbol, or None if it is unknown.
+        """
+        self._load_disk_cache()
+        table = self.tables.get(category)
+        return table.get(symbol) if table is not None else None
+
+    def get_filters(self, symbol: str, category: str = "spot"):
+        """
+        Returns the normalized filters of a symbol, or None if it is unknown.
+        """
+        info = self.get(symbol, category)
+        return InstrumentTable.get_filters(info) if info is not None else None
+
+    def symbols_for(self, base: str = None, quote: str = None, category: str = "spot"):
+        """
+        Returns the symbols of a category trading a base coin, a quote coin, or both.
+        """
+        return self.table(category).symbols_for(base=base, quote=quote)
+
+    def _load_disk_cache(self):
+        if self._disk_loaded:
+            return
+        self._disk_loaded = True
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable instruments cache {self.cache_path}: {e}")
+            return
+        for category, entry in cache.items():
+            if category in CATEGORIES and category not in self.tables:
+                self.tables[category] = InstrumentTable(category, entry["list"], entry["fetched_at"])
+
+    def _save_disk_cache(self):
+        if not self.cache_path:
+            return
+        cache = {
+            category: {"fetched_at": table.fetched_at, "list": table.instruments}
+            for category, table in self.tables.items()
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write instruments cache {self.cache_path}: {e}")
+
+
+_default_registry = None
+
+
+def get_instrument_registry():
+    """
+    Returns the registry shared by every module of the package.
+    """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = BybitInstrumentRegistry()
+    return _default_registry
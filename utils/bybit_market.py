@@ -1,20 +1,45 @@
 import logging
-import aiohttp
+
+from utils.single_flight import SingleFlight
 
 class BybitMarketApi:
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, coalesce: bool=True, cache_ttl: float=0.0):
+        """
+        Initializes an instance of BybitMarketApi.
+
+        :param logger: Optional logger instance for logging purposes.
+        :param coalesce: Share one HTTP request between identical concurrent calls.
+        :param cache_ttl: Seconds a coalesced response stays reusable after completion.
+        """
         self.base_url = "https://api.bybit.com"
+        self.single_flight = SingleFlight(cache_ttl=cache_ttl) if coalesce else None
 
         if not logger:
             self.logger = logging.getLogger(__name__)
         else:
             self.logger = logger
 
-    async def get_server_time(self):
-        endpoint = "/v5/market/time"
+    async def _get(self, endpoint: str, params: dict=None):
+        """
+        Sends a public GET request. Identical concurrent requests are coalesced,
+        so the returned dict may be shared and must not be mutated.
+        """
+        if self.single_flight is None:
+            return await self._request(endpoint, params)
+        key = SingleFlight.make_key(endpoint, params)
+        return await self.single_flight.do(key, lambda: self._request(endpoint, params))
+
+    async def _request(self, endpoint: str, params: dict=None):
+        # Imported on first use; aiohttp dominates the import time of the package
+        import aiohttp
+
         async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}") as response:
+            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
                 return await response.json()
+
+    async def get_server_time(self):
+        endpoint = "/v5/market/time"
+        return await self._get(endpoint)
     
     async def get_kline(self,
                         symbol: str,
@@ -38,9 +63,7 @@ class BybitMarketApi:
             params["end"] = end
         if limit:
             params["limit"] = limit
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
 
     async def get_mark_price_kline(self,
                                    symbol: str,
@@ -64,9 +87,7 @@ class BybitMarketApi:
             params["end"] = end
         if limit:
             params["limit"] = limit
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
             
     async def get_index_price_kline(self,
                                     symbol: str,
@@ -90,9 +111,7 @@ class BybitMarketApi:
             params["end"] = end
         if limit:
             params["limit"] = limit
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
 
     async def get_premium_index_price_kline(self,
                                             symbol: str,
@@ -116,9 +135,7 @@ class BybitMarketApi:
             params["end"] = end
         if limit:
             params["limit"] = limit
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
             
     async def get_instruments_info(self,
                                    category: str,
@@ -142,10 +159,36 @@ class BybitMarketApi:
             params["limit"] = limit
         if cursor:
             params["cursor"] = cursor
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
-            
+        return await self._get(endpoint, params)
+
+    async def get_all_instruments_info(self,
+                                       category: str,
+                                       status: str=None,
+                                       baseCoin: str=None,
+                                       limit: int=1000):
+        """
+        Fetches every instrument of a category, following ``nextPageCursor``
+        until the exchange stops returning one.
+
+        :return: The first response with ``result.list`` holding all pages.
+        """
+        response = await self.get_instruments_info(category, status=status,
+                                                   baseCoin=baseCoin, limit=limit)
+        if response.get("retCode") != 0:
+            return response
+        instruments = list(response["result"].get("list", []))
+        cursor = response["result"].get("nextPageCursor")
+        while cursor:
+            page = await self.get_instruments_info(category, status=status,
+                                                   baseCoin=baseCoin, limit=limit,
+                                                   cursor=cursor)
+            if page.get("retCode") != 0:
+                self.logger.warning(f"Error paginating instruments-info: {page.get('retMsg')}")
+                return page
+            instruments.extend(page["result"].get("list", []))
+            cursor = page["result"].get("nextPageCursor")
+        return {**response, "result": {**response["result"], "list": instruments, "nextPageCursor": ""}}
+
     async def get_orderbook(self,
                             symbol: str,
                             category: str,
@@ -158,9 +201,7 @@ class BybitMarketApi:
         }
         if limit:
             params["limit"] = limit
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
 
     async def get_tickers(self,
                           category: str,
@@ -178,9 +219,7 @@ class BybitMarketApi:
             params["baseCoin"] = baseCoin
         if expDate:
             params["expDate"] = expDate
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
             
     async def get_funding_history(self,
                                   category: str,
@@ -200,9 +239,7 @@ class BybitMarketApi:
             params["endTime"] = endTime
         if limit:
             params["limit"] = limit
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
             
     async def get_recent_trades(self,
                                 category: str,
@@ -223,9 +260,7 @@ class BybitMarketApi:
             params["optionType"] = optionType
         if limit:
             params["limit"] = limit
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
 
     async def get_open_interest(self,
                                 category: str,
@@ -251,9 +286,7 @@ class BybitMarketApi:
             params["limit"] = limit
         if cursor:
             params["cursor"] = cursor
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
             
     async def get_historical_volatility(self,
                                         category: str,
@@ -275,9 +308,7 @@ class BybitMarketApi:
             params["startTime"] = startTime
         if endTime:
             params["endTime"] = endTime
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
 
     async def get_insurance(self,
                             coin: str=None):
@@ -285,9 +316,7 @@ class BybitMarketApi:
         if coin:
             params["coin"] = coin
         endpoint = "/v5/market/insurance"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
 
     async def get_risk_limit(self,
                              category: str,
@@ -302,9 +331,7 @@ class BybitMarketApi:
             params["symbol"] = symbol
         if cursor:
             params["cursor"] = cursor
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
             
     async def get_delivery_price(self,
                                  category: str,
@@ -325,9 +352,7 @@ class BybitMarketApi:
             params["limit"] = limit
         if coin:
             params["coin"] = coin
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
             
     async def get_long_short_ratio(self,
                                    category: str,
@@ -352,7 +377,5 @@ class BybitMarketApi:
             params["limit"] = limit
         if cursor:
             params["cursor"] = cursor
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}{endpoint}", params=params) as response:
-                return await response.json()
+        return await self._get(endpoint, params)
 
@@ -0,0 +1,352 @@
+import uuid
+import bisect
+import logging
+import collections
+import numpy as np
+
+from models.orderbook import Orderbook
+
+PENDING = "pending"
+ACKED = "acked"
+PARTIAL = "partial"
+FILLED = "filled"
+CANCELLED = "cancelled"
+REJECTED = "rejected"
+
+TERMINAL_STATUSES = {FILLED, CANCELLED, REJECTED}
+
+# Order of the lifecycle statuses; an order never moves back to a lower rank
+STATUS_RANK = {PENDING: 0, ACKED: 1, PARTIAL: 2, FILLED: 3, CANCELLED: 3, REJECTED: 3}
+
+# Bybit orderStatus -> local lifecycle status
+STATUS_MAP = {
+    "Created": PENDING,
+    "New": ACKED,
+    "Untriggered": ACKED,
+    "Triggered": ACKED,
+    "PartiallyFilled": PARTIAL,
+    "Filled": FILLED,
+    "Cancelled": CANCELLED,
+    "PartiallyFilledCanceled": CANCELLED,
+    "Deactivated": CANCELLED,
+    "Rejected": REJECTED,
+}
+
+
+class ManagedOrder:
+    """
+    Lifecycle record of a single order.
+    """
+
+    __slots__ = ("symbol", "side", "price", "qty", "filled_qty", "status",
+                 "order_id", "order_link_id", "category", "updated_time")
+
+    def __init__(self, symbol, side, price, qty, order_link_id=None, order_id=None, category="spot"):
+        self.symbol = symbol
+        self.side = side
+        self.price = float(price) if price else 0.0
+        self.qty = float(qty)
+        self.filled_qty = 0.0
+        self.status = PENDING
+        self.order_id = order_id
+        self.order_link_id = order_link_id
+        self.category = category
+        self.updated_time = 0
+
+    @property
+    def remaining(self):
+        return max(self.qty - self.filled_qty, 0.0) if self.status not in TERMINAL_STATUSES else 0.0
+
+    @property
+    def key(self):
+        return self.order_link_id or self.order_id
+
+    def __repr__(self):
+        return (f"ManagedOrder({self.symbol} {self.side} {self.filled_qty}/{self.qty}@{self.price} "
+                f"{self.status} orderId={self.order_id} orderLinkId={self.order_link_id})")
+
+
+class BybitOrderManager:
+    """
+    In-process order management system.
+
+    Tracks every order from submission to a terminal state, fed by REST
+    responses (on_rest_response, on_batch_results) and private stream order
+    events (on_order_update). Active orders are indexed by orderId,
+    orderLinkId, symbol and price level, and the remaining quantity per price
+    level is kept as a price-sorted own-order book for each symbol side, which
+    only touches the levels an event changes (see own_orders).
+    """
+
+    def __init__(self, logger=None, max_closed: int = 10000):
+        """
+        Initializes an instance of BybitOrderManager.
+
+        :param logger: Optional logger instance for logging purposes.
+        :param max_closed: Number of terminal orders kept for lookups.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.max_closed = max_closed
+        self.orders = {}
+        self.by_order_id = {}
+        self.by_link_id = {}
+        self.by_symbol = collections.defaultdict(set)
+        self.by_level = collections.defaultdict(set)
+        self.closed = collections.OrderedDict()
+
+        # (symbol, side) -> {price: remaining qty} and its ascending price list
+        self.levels = collections.defaultdict(dict)
+        self.level_prices = collections.defaultdict(list)
+        self._own_books = {}
+
+    @staticmethod
+    def _book_side(side: str):
+        return "bids" if side in ["Buy", "BUY", "buy", "bids"] else "asks"
+
+    def _add_level(self, order, sign):
+        quantity = order.remaining * sign
+        if order.price <= 0 or quantity == 0:
+            return
+        book_key = (order.symbol, self._book_side(order.side))
+        levels = self.levels[book_key]
+        prices = self.level_prices[book_key]
+        own_book = self._own_books.get(book_key)
+        total = levels.get(order.price, 0.0) + quantity
+        if total > 1e-12:
+            if order.price not in levels:
+                index = bisect.bisect_left(prices, order.price)
+                prices.insert(index, order.price)
+                if own_book is not None:
+                    position = self._own_position(book_key, index)
+                    self._own_books[book_key] = np.insert(own_book, position, (order.price, total))
+            elif own_book is not None:
+                own_book["quantity"][self._own_position(book_key, bisect.bisect_left(prices, order.price))] = total
+            levels[order.price] = total
+        elif order.price in levels:
+            del levels[order.price]
+            index = bisect.bisect_left(prices, order.price)
+            if own_book is not None:
+                self._own_books[book_key] = np.delete(own_book, self._own_position(book_key, index))
+            prices.pop(index)
+
+        level_key = book_key + (order.price,)
+        if sign > 0:
+            self.by_level[level_key].add(order.key)
+        else:
+            level_orders = self.by_level.get(level_key)
+            if level_orders is not None:
+                level_orders.discard(order.key)
+                if not level_orders:
+                    del self.by_level[level_key]
+
+    def _own_position(self, book_key, index):
+        # Row in the own-order book of the index-th price in ascending order; bids are stored descending
+        return len(self.level_prices[book_key]) - 1 - index if book_key[1] == "bids" else index
+
+    def _index(self, order):
+        self.orders[order.key] = order
+        if order.order_id:
+            self.by_order_id[order.order_id] = order
+        if order.order_link_id:
+            self.by_link_id[order.order_link_id] = order
+        self.by_symbol[order.symbol].add(order.key)
+
+    def _close(self, order):
+        self.orders.pop(order.key, None)
+        self.by_symbol[order.symbol].discard(order.key)
+        self.closed[order.key] = order
+        while len(self.closed) > self.max_closed:
+            _, old = self.closed.popitem(last=False)
+            self.by_order_id.pop(old.order_id, None)
+            self.by_link_id.pop(old.order_link_id, None)
+
+    def get(self, order_id: str = None, order_link_id: str = None):
+        """
+        Returns an order by orderId or orderLinkId, or None if it is unknown.
+        """
+        if order_link_id:
+            return self.by_link_id.get(order_link_id)
+        return self.by_order_id.get(order_id)
+
+    def get_open_orders(self, symbol: str = None):
+        """
+        Returns the non-terminal orders, optionally restricted to a symbol.
+        """
+        keys = self.by_symbol.get(symbol, ()) if symbol is not None else self.orders
+        return [self.orders[key] for key in keys]
+
+    def get_level_orders(self, symbol: str, side: str, price: float):
+        """
+        Returns the active orders resting at a price level.
+        """
+        keys = self.by_level.get((symbol, self._book_side(side), float(price)), ())
+        return [self.orders[key] for key in keys if key in self.orders]
+
+    def track_pending(self, symbol, side, qty, price=None, order_link_id=None, category="spot"):
+        """
+        Registers an order about to be sent, so that it already counts in the
+        own-order book while its ack is in flight.
+
+        :param order_link_id: orderLinkId sent with the order; generated if not given.
+        :return: The new ManagedOrder.
+        """
+        order_link_id = order_link_id if order_link_id else uuid.uuid4().hex
+        order = ManagedOrder(symbol, side, price, qty, order_link_id=order_link_id, category=category)
+        self._index(order)
+        self._add_level(order, 1)
+        return order
+
+    def _transition(self, order, status=None, price=None, qty=None, filled_qty=None, updated_time=None):
+        self._add_level(order, -1)
+        if status is not None:
+            order.status = status
+        if price is not None:
+            order.price = price
+        if qty is not None:
+            order.qty = qty
+        if filled_qty is not None:
+            order.filled_qty = filled_qty
+        if updated_time is not None:
+            order.updated_time = updated_time
+        if order.status in TERMINAL_STATUSES:
+            self._close(order)
+        else:
+            self._add_level(order, 1)
+
+    def on_rest_response(self, response: dict, order_link_id: str = None):
+        """
+        Applies the response of a REST (or trade websocket) create request.
+
+        :param response: Response dict with retCode and result.orderId/orderLinkId.
+        :param order_link_id: orderLinkId of the request, if the response lacks it.
+        """
+        result = response.get("result") or response.get("data") or {}
+        order_link_id = result.get("orderLinkId") or order_link_id
+        order = self.by_link_id.get(order_link_id)
+        if order is None:
+            self.logger.warning(f"Response for unknown order {order_link_id}: {response}")
+            return
+        if response.get("retCode") != 0:
+            self._transition(order, status=REJECTED)
+            return
+        order.order_id = result.get("orderId") or order.order_id
+        if order.order_id:
+            self.by_order_id[order.order_id] = order
+        if order.status == PENDING:
+            self._transition(order, status=ACKED)
+
+    def on_batch_results(self, results: list):
+        """
+        Applies the entries returned by AsyncBybitAccount.place_orders.
+        """
+        for entry in results:
+            self.on_rest_response(
+                {"retCode": entry["retCode"], "result": entry["result"] or {}},
+                order_link_id=entry["request"].get("orderLinkId"),
+            )
+
+    def on_order_update(self, update: dict):
+        """
+        Applies an order event from the private stream (or a REST order dict).
+
+        Events for an order that already reached a terminal status are ignored,
+        as are events older than the last applied one. An event with the same
+        or no updatedTime is only applied if it does not move the order back
+        in its lifecycle (status or filled quantity), so a late 'New' cannot
+        reopen a cancelled order.
+        """
+        order = self.by_link_id.get(update.get("orderLinkId")) or self.by_order_id.get(update.get("orderId"))
+        updated_time = int(update.get("updatedTime") or 0)
+        if order is None:
+            order = ManagedOrder(
+                update["symbol"], update["side"], update.get("price"), update.get("qty") or 0,
+                order_link_id=update.get("orderLinkId") or None, order_id=update.get("orderId"),
+                category=update.get("category", "spot"),
+            )
+            self._index(order)
+        elif order.status in TERMINAL_STATUSES:
+            return
+        elif updated_time and updated_time < order.updated_time:
+            return
+        elif not updated_time or updated_time == order.updated_time:
+            status = STATUS_MAP.get(update.get("orderStatus"), order.status)
+            filled_qty = float(update["cumExecQty"]) if update.get("cumExecQty") else order.filled_qty
+            if STATUS_RANK[status] < STATUS_RANK[order.status] or filled_qty < order.filled_qty:
+                return
+        if order.order_id is None and update.get("orderId"):
+            order.order_id = update["orderId"]
+            self.by_order_id[order.order_id] = order
+
+        self._transition(
+            order,
+            status=STATUS_MAP.get(update.get("orderStatus"), order.status),
+            price=float(update["price"]) if update.get("price") else None,
+            qty=float(update["qty"]) if update.get("qty") else None,
+            filled_qty=float(update["cumExecQty"]) if update.get("cumExecQty") else None,
+            updated_time=updated_time,
+        )
+
+    async def process_user_update(self, data):
+        """
+        Handler for BybitPrivateWebSocket.process_user_update.
+        """
+        if data.get("topic", "").startswith("order"):
+            for update in data["data"]:
+                self.on_order_update(update)
+
+    def own_orders(self, symbol: str, side: str):
+        """
+        Returns the remaining own quantity per price level of a book side,
+        sorted like the book (bids descending, asks ascending).
+
+        The array is built on the first call, then kept up to date by every
+        order event: a quantity change at a level that stays is written in
+        place, and a level that appears or disappears (an order re-priced,
+        or the update of the only order at its level) costs one O(k) insert
+        or delete for the k own levels of the side. The returned array may
+        therefore change after the call; copy it to keep a snapshot.
+
+        :param side: 'Buy'/'bids' or 'Sell'/'asks'.
+        :return: Structured array with Orderbook.dtype.
+        """
+        book_key = (symbol, self._book_side(side))
+        own_book = self._own_books.get(book_key)
+        if own_book is None:
+            prices = self.level_prices.get(book_key, [])
+            levels = self.levels.get(book_key, {})
+            if book_key[1] == "bids":
+                prices = prices[::-1]
+            own_book = np.array([(price, levels[price]) for price in prices], dtype=Orderbook.dtype)
+            self._own_books[book_key] = own_book
+        return own_book
+
+    def subtract_from(self, book, side: str):
+        """
+        Returns a side of an Orderbook with the own orders removed.
+
+        Costs one copy of the book side (O(n) for its n levels) plus a binary
+        search per own level (O(k log n)); the book side itself is not sorted
+        or scanned in Python.
+
+        :param book: Orderbook (e.g. BybitOrderbook) of the order symbol.
+        :param side: 'bids' or 'asks'.
+        """
+        side = self._book_side(side)
+        own_book = self.own_orders(book.symbol, side)
+        adjusted_book = book.get_book_type(side).copy()
+        if len(own_book) == 0 or len(adjusted_book) == 0:
+            return adjusted_book
+        own_book = book.to_book_units(own_book)
+        if side == "bids":
+            # Both are sorted descending; search them as ascending
+            positions = len(adjusted_book) - np.searchsorted(adjusted_book["price"][::-1], own_book["price"],
+                                                             side="right")
+        else:
+            positions = np.searchsorted(adjusted_book["price"], own_book["price"])
+        inside = positions < len(adjusted_book)
+        positions, own_book = positions[inside], own_book[inside]
+        match = adjusted_book["price"][positions] == own_book["price"]
+        adjusted_book["quantity"][positions[match]] -= own_book["quantity"][match].astype(adjusted_book["quantity"].dtype)
+        if (adjusted_book["quantity"][positions[match]] <= 0).any():
+            adjusted_book = adjusted_book[adjusted_book["quantity"] > 0]
+        return adjusted_book
@@ -0,0 +1,252 @@
+import numpy as np
+from decimal import Decimal, ROUND_FLOOR, ROUND_CEILING
+
+from utils.bybit_instruments import get_instrument_registry
+
+
+def _decimals_and_units(value: str):
+    """
+    Splits an exchange decimal string into its number of decimals and its
+    value in units of 10**-decimals, e.g. "0.0050" -> (3, 5).
+    """
+    number = Decimal(value).normalize()
+    decimals = max(0, -number.as_tuple().exponent)
+    return decimals, int(number.scaleb(decimals))
+
+
+def _format_units(units: int, decimals: int):
+    if decimals == 0:
+        return str(units)
+    return f"{Decimal(units).scaleb(-decimals):f}"
+
+
+def _limit_units(limit: Decimal, decimals: int, rounding):
+    """
+    Converts a filter limit to a whole number of 10**-decimals units, rounding
+    it so that comparing integer counts against it is exact.
+    """
+    return int(limit.scaleb(decimals).to_integral_value(rounding=rounding))
+
+
+def _round_units(values, decimals: int, step: int, rounding):
+    """
+    Rounds an array of numbers to whole multiples of ``step`` units of
+    10**-decimals, down (ROUND_FLOOR) or up (ROUND_CEILING), like
+    BybitOrderValidator._round does for one value with Decimal.
+
+    The unit count is first taken from the float product, then corrected by
+    comparing the neighbouring counts with the input: ``count / 10**decimals``
+    is a correctly rounded division, so a count whose value rounds to the
+    input itself (e.g. 0.29 -> 29 hundredths, although 0.29 * 100 is
+    28.999999999999996) is kept, and no tolerance is needed.
+
+    :raises ValueError: If a count is beyond 2**53, where floats stop being exact.
+    """
+    values = np.asarray(values, dtype="f8")
+    scale = 10.0 ** decimals
+    scaled = values * scale
+    if len(values) and not np.all(np.abs(scaled) < 2.0 ** 53):
+        raise ValueError("Values are too large (or not finite) to be rounded exactly.")
+    if rounding == ROUND_FLOOR:
+        units = np.floor(scaled)
+        units += (units + 1) / scale <= values
+        units -= units / scale > values
+    else:
+        units = np.ceil(scaled)
+        units -= (units - 1) / scale >= values
+        units += units / scale < values
+    units = units.astype(np.int64)
+    if rounding == ROUND_FLOOR:
+        return units // step * step
+    return -(-units // step) * step
+
+
+class BybitOrderValidator:
+    """
+    Pre-trade validation and rounding against instrument filters.
+
+    Per-symbol filters from the instrument registry are precomputed as integer
+    arrays (tick and step in units of their own number of decimals), so a price
+    or quantity is rounded to an exact multiple of its tick/step and formatted
+    canonically before it is sent, instead of being rejected by the exchange.
+
+    Spot market buys are sized in the quote coin unless ``marketUnit`` is
+    'baseCoin', so their quantity is rounded to ``quotePrecision`` and checked
+    against ``minOrderAmt``/``maxOrderAmt`` instead of the base-coin filters.
+    """
+
+    def __init__(self, instruments=None, category: str = "spot"):
+        """
+        Initializes an instance of BybitOrderValidator.
+
+        :param instruments: Optional BybitInstrumentRegistry; defaults to the shared one.
+        :param category: Bybit category of the validated orders.
+        """
+        self.instruments = instruments if instruments else get_instrument_registry()
+        self.category = category
+        self._table = None
+
+    def _build(self, table):
+        size = len(table)
+        self.price_decimals = np.zeros(size, dtype=np.int64)
+        self.tick_units = np.ones(size, dtype=np.int64)
+        self.qty_decimals = np.zeros(size, dtype=np.int64)
+        self.step_units = np.ones(size, dtype=np.int64)
+        self.min_qty = [Decimal(0)] * size
+        self.max_qty = [Decimal(0)] * size
+        self.min_notional = [Decimal(0)] * size
+        self.quote_decimals = np.zeros(size, dtype=np.int64)
+        self.quote_units = np.ones(size, dtype=np.int64)
+        self.min_amount = [Decimal(0)] * size
+        self.max_amount = [Decimal(0)] * size
+
+        for row, info in enumerate(table.instruments):
+            filters = table.get_filters(info)
+            if Decimal(filters["tickSize"]) > 0:
+                self.price_decimals[row], self.tick_units[row] = _decimals_and_units(filters["tickSize"])
+            if Decimal(filters["qtyStep"]) > 0:
+                self.qty_decimals[row], self.step_units[row] = _decimals_and_units(filters["qtyStep"])
+            self.min_qty[row] = Decimal(filters["minOrderQty"])
+            self.max_qty[row] = Decimal(filters["maxOrderQty"])
+            self.min_notional[row] = Decimal(filters["minNotional"])
+            lot_filter = info.get("lotSizeFilter", {})
+            if Decimal(lot_filter.get("quotePrecision") or "0") > 0:
+                self.quote_decimals[row], self.quote_units[row] = _decimals_and_units(lot_filter["quotePrecision"])
+            else:
+                # Amounts are in the quote coin, like prices
+                self.quote_decimals[row] = self.price_decimals[row]
+            self.min_amount[row] = Decimal(lot_filter.get("minOrderAmt") or "0")
+            self.max_amount[row] = Decimal(lot_filter.get("maxOrderAmt") or "0")
+        self._table = table
+
+    def _row(self, symbol: str):
+        table = self.instruments.table(self.category)
+        if table is not self._table:
+            self._build(table)
+        row = table.index.get(symbol)
+        if row is None:
+            raise ValueError(f"Unknown {self.category} symbol: {symbol}")
+        return row
+
+    @staticmethod
+    def _round(value, decimals, step, rounding):
+        units = Decimal(str(value)).scaleb(int(decimals))
+        return int((units / int(step)).to_integral_value(rounding=rounding)) * int(step)
+
+    def round_price(self, symbol: str, side: str, price):
+        """
+        Rounds a price to the symbol tick, towards the passive side (down for
+        buys, up for sells).
+
+        :return: Canonical price string.
+        """
+        row = self._row(symbol)
+        rounding = ROUND_FLOOR if side in ["Buy", "BUY", "buy"] else ROUND_CEILING
+        units = self._round(price, self.price_decimals[row], self.tick_units[row], rounding)
+        return _format_units(units, int(self.price_decimals[row]))
+
+    def round_qty(self, symbol: str, qty):
+        """
+        Rounds a quantity down to the symbol qtyStep.
+
+        :return: Canonical quantity string.
+        """
+        row = self._row(symbol)
+        units = self._round(qty, self.qty_decimals[row], self.step_units[row], ROUND_FLOOR)
+        return _format_units(units, int(self.qty_decimals[row]))
+
+    def is_quote_sized(self, side: str, order_type: str, market_unit: str = None):
+        """
+        Tells whether an order quantity is in the quote coin: spot market buys,
+        unless marketUnit is 'baseCoin'.
+        """
+        return self.category == "spot" and order_type == "Market" and side in ["Buy", "BUY", "buy"] \
+            and market_unit != "baseCoin"
+
+    def round_amount(self, symbol: str, amount):
+        """
+        Rounds a quote-coin amount down to the symbol quotePrecision.
+
+        :return: Canonical amount string.
+        """
+        row = self._row(symbol)
+        units = self._round(amount, self.quote_decimals[row], self.quote_units[row], ROUND_FLOOR)
+        return _format_units(units, int(self.quote_decimals[row]))
+
+    def validate(self, symbol: str, side: str, qty, price=None, order_type: str = "Limit", market_unit: str = None):
+        """
+        Rounds an order to the symbol filters and checks its limits.
+
+        :param symbol: Symbol of the order.
+        :param side: 'Buy' or 'Sell'.
+        :param qty: Order quantity (number or string).
+        :param price: Optional limit price (number or string).
+        :param order_type: 'Limit' or 'Market'.
+        :param market_unit: marketUnit of a spot market order, 'baseCoin' or 'quoteCoin'.
+        :return: Tuple of canonical (qty, price) strings; price is None if not given. For
+            quote-sized orders (see is_quote_sized) qty is the order value in the quote coin.
+        :raises ValueError: If the rounded order breaks a min/max quantity, min notional
+            or min/max order value filter.
+        """
+        row = self._row(symbol)
+        if self.is_quote_sized(side, order_type, market_unit):
+            amount_str = self.round_amount(symbol, qty)
+            amount = Decimal(amount_str)
+            if amount <= 0 or amount < self.min_amount[row]:
+                raise ValueError(f"{symbol}: order value {qty} is below minOrderAmt {self.min_amount[row]}")
+            if self.max_amount[row] > 0 and amount > self.max_amount[row]:
+                raise ValueError(f"{symbol}: order value {qty} is above maxOrderAmt {self.max_amount[row]}")
+            return amount_str, None
+
+        qty_str = self.round_qty(symbol, qty)
+        price_str = self.round_price(symbol, side, price) if price is not None else None
+
+        rounded_qty = Decimal(qty_str)
+        if rounded_qty <= 0 or rounded_qty < self.min_qty[row]:
+            raise ValueError(f"{symbol}: quantity {qty} is below minOrderQty {self.min_qty[row]}")
+        if self.max_qty[row] > 0 and rounded_qty > self.max_qty[row]:
+            raise ValueError(f"{symbol}: quantity {qty} is above maxOrderQty {self.max_qty[row]}")
+        if price_str is not None:
+            if Decimal(price_str) <= 0:
+                raise ValueError(f"{symbol}: price {price} rounds to zero")
+            if rounded_qty * Decimal(price_str) < self.min_notional[row]:
+                raise ValueError(f"{symbol}: notional {rounded_qty * Decimal(price_str)} is below {self.min_notional[row]}")
+        return qty_str, price_str
+
+    def validate_ladder(self, symbol: str, side: str, qtys, prices):
+        """
+        Validates a ladder of limit orders on one symbol.
+
+        Prices and quantities are rounded as arrays to whole numbers of ticks
+        and steps (see _round_units), giving the same counts as validate; the
+        limits are then checked on those integer counts, and rows breaking a
+        filter are flagged instead of raising. Only the output strings are
+        built per order.
+
+        :param symbol: Symbol of the orders.
+        :param side: 'Buy' or 'Sell'.
+        :param qtys: Iterable of quantities (numbers or strings).
+        :param prices: Iterable of limit prices (numbers or strings).
+        :return: Tuple of (qty strings, price strings, boolean mask of valid rows).
+        :raises ValueError: If a price or quantity is too large to be rounded exactly.
+        """
+        row = self._row(symbol)
+        qty_decimals = int(self.qty_decimals[row])
+        price_decimals = int(self.price_decimals[row])
+        rounding = ROUND_FLOOR if side in ["Buy", "BUY", "buy"] else ROUND_CEILING
+        qty_units = _round_units(qtys, qty_decimals, int(self.step_units[row]), ROUND_FLOOR)
+        price_units = _round_units(prices, price_decimals, int(self.tick_units[row]), rounding)
+
+        valid = (qty_units > 0) & (price_units > 0)
+        valid &= qty_units >= _limit_units(self.min_qty[row], qty_decimals, ROUND_CEILING)
+        if self.max_qty[row] > 0:
+            valid &= qty_units <= _limit_units(self.max_qty[row], qty_decimals, ROUND_FLOOR)
+        # qty * price >= min notional, as qty units >= ceil(min notional units / price units)
+        min_notional = _limit_units(self.min_notional[row], qty_decimals + price_decimals, ROUND_CEILING)
+        valid &= qty_units >= -(-min_notional // np.maximum(price_units, 1))
+
+        return (
+            [_format_units(int(units), qty_decimals) for units in qty_units],
+            [_format_units(int(units), price_decimals) for units in price_units],
+            valid,
+        )
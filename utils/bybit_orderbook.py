@@ -4,44 +4,117 @@ import logging
 
 from models.orderbook import Orderbook
 
+
+class BBOEvent:
+    """
+    Top-of-book event, in the units of the book; sides that are empty hold None.
+    """
+
+    __slots__ = ("symbol", "bid_price", "bid_quantity", "ask_price", "ask_quantity", "update_id", "timestamp")
+
+    def __init__(self, symbol, bid_price, bid_quantity, ask_price, ask_quantity, update_id, timestamp=None):
+        self.symbol = symbol
+        self.bid_price = bid_price
+        self.bid_quantity = bid_quantity
+        self.ask_price = ask_price
+        self.ask_quantity = ask_quantity
+        self.update_id = update_id
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    def __repr__(self):
+        return (f"BBOEvent({self.symbol} {self.bid_quantity}@{self.bid_price} / {self.ask_quantity}@{self.ask_price} "
+                f"u={self.update_id} ts={self.timestamp})")
+
+
 class BybitOrderbook(Orderbook):
-    def __init__(self, logger=None, **kwargs):
+    logger: logging.Logger = None
+    last_update_id: int = 0
+    store_message: bool = True
+    bbo: tuple = (None, None, None, None)
+    bbo_changed: bool = False
+    features: object = None
+    depth_buckets: object = None
+
+    def __init__(self, logger=None, tick_size=None, qty_step=None, int_dtype="i8", **kwargs):
         """
         Initializes an instance of BybitOrderbook.
 
         :param logger: Optional logger instance for logging purposes.
+        :param tick_size: Optional instrument tickSize; with qty_step, stores the book in integer mode.
+        :param qty_step: Optional instrument qtyStep (or basePrecision).
+        :param int_dtype: Integer dtype of the integer mode, 'i8' or 'i4'.
         :param kwargs: Additional arguments passed to the parent Orderbook class.
         """
+        # Initialize parent Orderbook with any provided arguments
+        super().__init__(**kwargs)
+
         if not logger:
             self.logger = logging.getLogger(__name__)
         else:
             self.logger = logger
 
-        # Initialize parent Orderbook with any provided arguments
-        super().__init__(**kwargs)
-
-        self.last_update_id = None
-        self.store_message = True
-        self.last_update_id = 0
+        if tick_size and qty_step:
+            self.set_integer_mode(tick_size, qty_step, int_dtype)
 
     # Add any Bybit-specific methods or override existing methods here
 
     def process_update_message(self, data):
+        """
+        Applies a snapshot or delta message.
+
+        :return: A BBOEvent if the best bid/ask price or size changed, None otherwise.
+        """
         t1 = time.perf_counter()
+        if "ts" in data:
+            self.timestamp = data["ts"] / 1000
         if data["type"] == "snapshot":
             self.logger.info("Snapshot received.")
-            self.set_book("bids", np.array([(float(price), float(quantity)) for price, quantity in data['data']['b']], dtype=self.dtype))
-            self.set_book("asks", [(float(price), float(quantity)) for price, quantity in data['data']['a']])
+            self.set_book("bids", self.parse_levels(data['data']['b']))
+            self.set_book("asks", self.parse_levels(data['data']['a']))
             self.last_update_id = data["data"]["u"]
+            if self.features is not None:
+                self.features.reset(self)
+            if self.depth_buckets is not None:
+                self.depth_buckets.reset(self)
         elif not data["data"].get("u", None):
-            return
+            self.bbo_changed = False
+            return None
         else:
             if data["data"]["u"] == self.last_update_id + 1:
                 self.update_book(data["data"])
             else:
                 self.logger.warning(f'Expected id {self.last_update_id + 1} but got {data["data"]["u"]}')
+                # Nothing was applied, so a flag left set by the previous message must not be read again
+                self.bbo_changed = False
+                return None
         t2 = time.perf_counter()
         # self.logger.info(f"Time taken to process message: {t2 - t1}")
+        return self.check_bbo()
+
+    def get_bbo(self):
+        """
+        Returns (bid price, bid quantity, ask price, ask quantity) without
+        copying the book; empty sides give None.
+        """
+        bids = self.bids
+        asks = self.asks
+        bid_price, bid_quantity = bids[0].item() if len(bids) else (None, None)
+        ask_price, ask_quantity = asks[0].item() if len(asks) else (None, None)
+        return bid_price, bid_quantity, ask_price, ask_quantity
+
+    def check_bbo(self):
+        """
+        Compares the top of book with the one seen at the previous call.
+
+        :return: A BBOEvent if it changed, None if only deeper levels did.
+        """
+        bbo = self.get_bbo()
+        if bbo == self.bbo:
+            self.bbo_changed = False
+            return None
+        self.bbo = bbo
+        self.bbo_changed = True
+        return BBOEvent(self.symbol, *bbo, self.last_update_id)
 
     def update_book(self, data):
         for book_type in ['b', 'a']:
@@ -49,18 +122,70 @@ class BybitOrderbook(Orderbook):
             if not updates:
                 continue
             
-            adds = [(float(price), float(quantity)) for price, quantity in updates]
+            adds = self.parse_levels(updates)
             book_side = 'bids' if book_type == 'b' else 'asks'
             book = self.get_book_type(book_side)
             
-            concatenated_array = np.array([*adds, *book], dtype=self.dtype)
+            concatenated_array = np.concatenate([adds, book])
             _, ind = np.unique(concatenated_array["price"], return_index=True)
             new_book = concatenated_array[ind][:: -1 if book_side == "bids" else 1]
             new_book = new_book[new_book["quantity"] > 0]
-            
+
+            if self.features is not None:
+                self.features.on_side_update(self, book_side, adds, book)
+            if self.depth_buckets is not None:
+                self.depth_buckets.on_side_update(self, book_side, adds, book)
             self.set_book(book_side, new_book)
             self.last_update_id = data["u"]
+        if self.features is not None:
+            self.features.on_book_update(self)
+        if self.depth_buckets is not None:
+            self.depth_buckets.on_book_update(self)
+
+    def attach_features(self, features):
+        """
+        Attaches a BybitBookFeatures engine, kept up to date by every applied message.
+        """
+        self.features = features
+        features.reset(self)
+
+    def attach_depth_buckets(self, depth_buckets):
+        """
+        Attaches a BybitDepthBuckets view, kept up to date by every applied message.
+        """
+        self.depth_buckets = depth_buckets
+        depth_buckets.reset(self)
     
+    def parse_levels(self, levels):
+        """
+        Parses Bybit [price, quantity] string pairs into a structured array in
+        the units of the book (floats, or tick and lot counts in integer mode).
+        """
+        values = np.array(levels, dtype="f8").reshape(-1, 2)
+        result = np.empty(len(values), dtype=self.dtype)
+        if self.price_scale is None:
+            result["price"] = values[:, 0]
+            result["quantity"] = values[:, 1]
+            return result
+
+        units, decimals = self.price_scale
+        prices = np.rint(values[:, 0] * 10**decimals / units)
+        units, decimals = self.quantity_scale
+        quantities = np.rint(values[:, 1] * 10**decimals / units)
+        if result.dtype["price"] == np.int32 and len(values) and \
+                max(prices.max(), quantities.max()) > np.iinfo(np.int32).max:
+            self._widen()
+            result = np.empty(len(values), dtype=self.dtype)
+        result["price"] = prices
+        result["quantity"] = quantities
+        return result
+
+    def _widen(self):
+        self.logger.warning(f"{self.symbol}: tick or lot counts overflow int32, switching to int64.")
+        self.dtype = [("price", "i8"), ("quantity", "i8")]
+        self.set_book("bids", self.bids.astype(self.dtype))
+        self.set_book("asks", self.asks.astype(self.dtype))
+
     def some_bybit_specific_method(self):
         """
         Example method specific to Bybit.
@@ -68,3 +193,44 @@ class BybitOrderbook(Orderbook):
         if self.logger:
             self.logger.info("Executing Bybit-specific method.")
         # Bybit-specific logic here
+
+
+class BybitStoreOrderbook(BybitOrderbook):
+    """
+    BybitOrderbook whose sides live in a shared BookStore row.
+
+    ``bids``/``asks`` are zero-copy views into the store, and assigning them
+    (as set_book and update_book do) copies the levels into the row, so the
+    Orderbook API keeps working while cross-symbol metrics are read from the
+    store in one call.
+    """
+
+    def __init__(self, store, logger=None, **kwargs):
+        """
+        Initializes an instance of BybitStoreOrderbook.
+
+        :param store: BookStore holding the book.
+        :param logger: Optional logger instance for logging purposes.
+        :param kwargs: Additional arguments passed to BybitOrderbook; 'depth' sizes the store row.
+        """
+        if kwargs.get("tick_size"):
+            raise ValueError("BookStore holds float books; integer mode is not supported.")
+        self.store = store
+        self.row = store.add_symbol(kwargs["symbol"], kwargs.get("depth"))
+        super().__init__(logger=logger, **kwargs)
+
+    @property
+    def bids(self):
+        return self.store.get_book(self.row, "bids")
+
+    @bids.setter
+    def bids(self, book):
+        self.store.set_book(self.row, "bids", book)
+
+    @property
+    def asks(self):
+        return self.store.get_book(self.row, "asks")
+
+    @asks.setter
+    def asks(self, book):
+        self.store.set_book(self.row, "asks", book)
@@ -0,0 +1,195 @@
+import json
+import asyncio
+import logging
+import collections
+
+from utils.bybit_async_account import AsyncBybitAccount
+from utils.bybit_signing import authenticate_websocket
+
+OPEN_ORDER_STATUSES = {"New", "PartiallyFilled", "Untriggered"}
+
+
+class BybitPrivateWebSocket:
+    """
+    Authenticated private stream keeping account state up to date.
+
+    Balances, open orders and positions are updated incrementally from the
+    ``wallet``, ``order``, ``execution`` and ``position`` topics. Updates
+    older than the state they would replace (by creationTime, updatedTime or
+    seq) are ignored. REST is only used to reconcile after each (re)connect.
+    """
+
+    def __init__(self, account=None, logger=None, ws_url="wss://stream.bybit.com/v5/private",
+                 categories=("spot",), position_settle_coin="USDT", max_executions: int = 1000):
+        """
+        Initializes an instance of BybitPrivateWebSocket.
+
+        :param account: Optional AsyncBybitAccount providing credentials and REST reconciliation.
+        :param logger: Optional logger instance for logging purposes.
+        :param ws_url: Websocket URL of the private endpoint.
+        :param categories: Categories whose open orders (and, except spot, positions) are reconciled.
+        :param position_settle_coin: Settle coin used to list positions when reconciling.
+        :param max_executions: Number of recent executions kept in ``executions``.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.account = account if account else AsyncBybitAccount(logger=self.logger)
+        self.ws_url = ws_url
+        self.categories = categories
+        self.position_settle_coin = position_settle_coin
+        self.stop_execution = True
+        self.ws = None
+
+        self.args = ["wallet", "order", "execution", "position"]
+        self.balance = {}
+        self.orders = {}
+        self.positions = {}
+        self.executions = collections.deque(maxlen=max_executions)
+        self.wallet_time = 0
+        self._execution_ids = set()
+
+        self.process_user_update = self.default_process_user_update_function
+
+    async def _authenticate(self, ws):
+        await authenticate_websocket(ws, self.account._get_signer(), self.account._get_timestamp() + 10000)
+        self.logger.info("Private websocket authenticated.")
+
+    async def reconcile(self):
+        """
+        Replaces the local state with a REST snapshot. Stream messages queued
+        meanwhile are applied afterwards and dropped if they are older, by the
+        exchange timestamps only: wallet messages are compared with the server
+        time of the balance response, never with the local clock.
+        """
+        balance = await self.account.get_balance()
+        self.balance.clear()
+        self.balance.update(balance)
+        # Wallet messages carry the exchange clock, so compare them with the server time of the
+        # snapshot (0, i.e. apply them all, if the response had none) rather than the local clock
+        self.wallet_time = self.account.balance_time
+
+        orders = {}
+        positions = {}
+        for category in self.categories:
+            settle_coin = None if category == "spot" else self.position_settle_coin
+            for order in await self.account.get_open_orders(category, settleCoin=settle_coin):
+                order.setdefault("category", category)
+                orders[order["orderId"]] = order
+            if category != "spot":
+                for position in await self.account.get_positions(category, settleCoin=settle_coin):
+                    position.setdefault("category", category)
+                    if float(position.get("size") or 0) != 0:
+                        positions[self._position_key(position)] = position
+        self.orders = orders
+        self.positions = positions
+        self.logger.info(f"Reconciled {len(orders)} open orders and {len(positions)} positions.")
+
+    async def connect_to_stream(self, retry_delay=1):
+        import websockets
+
+        self.stop_execution = False
+        while not self.stop_execution:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20) as ws:
+                    await self._authenticate(ws)
+                    await ws.send(json.dumps({"op": "subscribe", "args": self.args}))
+                    self.ws = ws
+                    await self.reconcile()
+                    retry_delay = 1
+                    async for message in ws:
+                        data = json.loads(message)
+                        if "topic" in data:
+                            self.on_message(data)
+                            await self.process_user_update(data)
+            except (websockets.exceptions.ConnectionClosedError, OSError) as e:
+                self.logger.info(f"Private connection closed: {str(e)}")
+            except Exception as e:
+                # A rejected auth or a failed REST reconcile would otherwise end the task and leave the state stale
+                self.logger.warning(f"Private websocket error: {str(e)}")
+            finally:
+                self.ws = None
+            if not self.stop_execution:
+                self.logger.info(f"Reconnecting private websocket in {retry_delay} seconds...")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 60)
+        self.logger.info("Stopped private websocket")
+
+    def on_message(self, data):
+        topic = data["topic"]
+        if topic == "wallet":
+            self._on_wallet(data)
+        elif topic.startswith("order"):
+            self._on_orders(data["data"])
+        elif topic.startswith("execution"):
+            self._on_executions(data["data"])
+        elif topic.startswith("position"):
+            self._on_positions(data["data"])
+
+    def _on_wallet(self, data):
+        creation_time = int(data.get("creationTime", 0))
+        if creation_time < self.wallet_time:
+            return
+        self.wallet_time = creation_time
+        for account in data["data"]:
+            for coin in account.get("coin", []):
+                self.balance[coin["coin"]] = {
+                    "free": float(coin["walletBalance"] or 0),
+                    "locked": float(coin["locked"] or 0),
+                }
+
+    def _on_orders(self, orders):
+        for order in orders:
+            order_id = order["orderId"]
+            current = self.orders.get(order_id)
+            if current is not None and int(order["updatedTime"]) < int(current["updatedTime"]):
+                continue
+            if order["orderStatus"] in OPEN_ORDER_STATUSES:
+                self.orders[order_id] = order
+            else:
+                self.orders.pop(order_id, None)
+
+    def _on_executions(self, executions):
+        for execution in executions:
+            if execution["execId"] in self._execution_ids:
+                continue
+            if len(self.executions) == self.executions.maxlen:
+                self._execution_ids.discard(self.executions[0]["execId"])
+            self._execution_ids.add(execution["execId"])
+            self.executions.append(execution)
+
+    @staticmethod
+    def _position_key(position):
+        return position.get("category"), position["symbol"], position.get("positionIdx", 0)
+
+    def _on_positions(self, positions):
+        for position in positions:
+            key = self._position_key(position)
+            current = self.positions.get(key)
+            if current is not None and (int(position.get("seq", 0)), int(position["updatedTime"])) < \
+                    (int(current.get("seq", 0)), int(current["updatedTime"])):
+                continue
+            if float(position.get("size") or 0) != 0:
+                self.positions[key] = position
+            else:
+                self.positions.pop(key, None)
+
+    async def default_process_user_update_function(self, data):
+        return
+
+    def get_locked_amount(self, coin: str):
+        return self.balance.get(coin, {}).get("locked", 0.0)
+
+    def get_open_orders(self, symbol: str = None):
+        """
+        Returns the open orders, optionally restricted to a symbol.
+        """
+        if symbol is None:
+            return list(self.orders.values())
+        return [order for order in self.orders.values() if order["symbol"] == symbol]
+
+    async def stop(self):
+        self.stop_execution = True
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def start(self):
+        await self.connect_to_stream()
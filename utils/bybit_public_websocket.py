@@ -1,25 +1,25 @@
 import asyncio
-import websockets
 import json
-import numpy as np
 import logging
 import time
-from datetime import datetime
 
-from models.orderbook import Orderbook
-from utils.bybit_orderbook import BybitOrderbook
-
-logging.basicConfig(level=logging.INFO)
+from models.trade import Trade
 
 class BybitWebSocket:
-    def __init__(self, _type='spot', logger=None):
+    def __init__(self, _type='spot', logger=None, book_store=None, loop_monitor=None):
         self.logger = logger if logger else logging.getLogger(__name__)
         if _type == "spot":
             self.ws_url = f"wss://stream.bybit.com/v5/public/spot"
+            self.category = "spot"
         elif _type == "futures":
             self.ws_url = f"wss://stream.bybit.com/v5/public/linear"
+            self.category = "linear"
+        elif _type == "inverse":
+            self.ws_url = f"wss://stream.bybit.com/v5/public/inverse"
+            self.category = "inverse"
         elif _type == "options":
             self.ws_url = f"wss://stream.bybit.com/v5/public/option"
+            self.category = "option"
         else:
             raise ValueError("Invalid type")
         
@@ -28,21 +28,72 @@ class BybitWebSocket:
 
         self.args = []
         self.books = {}
+        self.book_store = book_store
+        self.ticker_scanner = None
+        # Optional LoopLagMonitor; receives the handling time of every message by topic
+        self.loop_monitor = loop_monitor
 
         self.process_book_update = self.default_process_book_update_function
+        # Optional async callback receiving a BBOEvent on top-of-book changes only
+        self.process_bbo_update = None
+        # Optional async callback receiving each publicTrade entry as a Trade
+        self.process_trade_update = None
+
+    def add_orderbook_stream(self, symbol, depth=1, _type="spot", integer_mode=False, int_dtype="i8"):
+        """
+        Subscribes to orderbook.{depth}.{symbol}.
+
+        :param integer_mode: Store prices and quantities as int tick and lot
+            counts, using the tickSize/qtyStep of the instrument registry.
+        :param int_dtype: Integer dtype of the integer mode, 'i8' or 'i4'.
+        """
+        # Books (and NumPy) are only loaded once a book is subscribed
+        from utils.bybit_orderbook import BybitOrderbook, BybitStoreOrderbook
 
-    def add_orderbook_stream(self, symbol, depth=1, _type="spot"):
-        self.books[symbol] = BybitOrderbook(
-            symbol=symbol,
-            depth=depth,
-            _type=_type
-        )
+        if integer_mode:
+            from utils.bybit_instruments import get_instrument_registry
+
+            filters = get_instrument_registry().get_filters(symbol, self.category)
+            if filters is None:
+                raise ValueError(f"No {self.category} instrument filters loaded for {symbol}")
+            self.books[symbol] = BybitOrderbook(
+                symbol=symbol,
+                depth=depth,
+                _type=_type,
+                tick_size=filters["tickSize"],
+                qty_step=filters["qtyStep"],
+                int_dtype=int_dtype,
+            )
+        elif self.book_store is not None:
+            self.books[symbol] = BybitStoreOrderbook(
+                self.book_store,
+                symbol=symbol,
+                depth=depth,
+                _type=_type
+            )
+        else:
+            self.books[symbol] = BybitOrderbook(
+                symbol=symbol,
+                depth=depth,
+                _type=_type
+            )
         self.args.append(f"orderbook.{depth}.{symbol}")
 
     def add_trade_stream(self, symbol):
         self.args.append(f"publicTrade.{symbol}")
 
+    def add_ticker_stream(self, symbol, scanner=None):
+        """
+        Subscribes to tickers.{symbol}; messages are applied to the attached
+        BybitTickerScanner, if any.
+        """
+        if scanner is not None:
+            self.ticker_scanner = scanner
+        self.args.append(f"tickers.{symbol}")
+
     async def connect_to_stream(self, retry_delay=1):
+        import websockets
+
         self.stop_execution = False
         while not self.stop_execution:
             try:
@@ -53,10 +104,18 @@ class BybitWebSocket:
                     }))
                     while not self.stop_execution:
                         message = await ws.recv()
+                        t1 = time.perf_counter()
                         data = json.loads(message)
                         if 'data' in data:
-                            self.on_message(data)
+                            bbo = self.on_message(data)
+                            if bbo is not None and self.process_bbo_update is not None:
+                                await self.process_bbo_update(bbo)
+                            if self.process_trade_update is not None and data['topic'].startswith('publicTrade'):
+                                for trade in self.parse_trades(data):
+                                    await self.process_trade_update(trade)
                         await self.process_book_update(data)
+                        if self.loop_monitor is not None:
+                            self.loop_monitor.record(data.get('topic', data.get('op')), time.perf_counter() - t1)
             except websockets.exceptions.ConnectionClosedError as e:
                 self.logger.info(f"Connection closed, retrying in {retry_delay} seconds...")
                 await asyncio.sleep(retry_delay)
@@ -67,18 +126,36 @@ class BybitWebSocket:
         self.logger.info("Stopped Book Fetcher")
 
     def on_message(self, data):
+        """
+        Routes a message to its book or scanner.
+
+        :return: The BBOEvent of an orderbook message that moved the top of book, None otherwise.
+        """
         if 'orderbook' in data['topic']:
             symbol = data['data']['s']
-            self.books[symbol].process_update_message(data)
-        else:
-            return
+            return self.books[symbol].process_update_message(data)
+        elif 'tickers' in data['topic'] and self.ticker_scanner is not None:
+            self.ticker_scanner.on_ticker_message(data)
+        return None
+
+    @staticmethod
+    def parse_trades(data):
+        """
+        Converts the entries of a publicTrade message into Trade objects.
+        """
+        return [
+            Trade(trade["s"], trade["S"], float(trade["p"]), float(trade["v"]), trade["i"],
+                  trade.get("BT", False), trade["T"] / 1000)
+            for trade in data["data"]
+        ]
 
     async def default_process_book_update_function(self, data):
         if 'data' not in data:
             return
         if 'orderbook' in data['topic']:
-            symbol = data['data']['s']
-            self.logger.info(f"{symbol}: {self.books[symbol].bids}")
+            book = self.books[data['data']['s']]
+            if book.bbo_changed:
+                self.logger.info(f"{book.symbol}: {book.bbo}")
         else:
             self.logger.info(data)
 
@@ -0,0 +1,289 @@
+import logging
+import numpy as np
+
+from models.orderbook import Orderbook
+
+_EMPTY_CURVE = (np.zeros(1), np.zeros(1))
+
+
+def _compose(first, second):
+    """
+    Composes two conversion curves: the output of ``first`` is the input of
+    ``second``. Breakpoints of both legs are kept, so the result is exact for
+    piecewise-linear legs.
+    """
+    x1, y1 = first
+    x2, y2 = second
+    # Largest amount of the middle coin both legs can handle
+    middle_cap = min(y1[-1], x2[-1])
+    input_cap = np.interp(middle_cap, y1, x1)
+    x = np.union1d(x1[x1 <= input_cap], np.interp(x2[x2 <= middle_cap], y1, x1))
+    return x, np.interp(np.interp(x, x1, y1), x2, y2)
+
+
+class BybitRouteQuoter:
+    """
+    Quotes conversions across chains of two or three spot books, e.g.
+    ETH -> BTC -> USDT through ETHBTC and BTCUSDT.
+
+    Every leg is a conversion curve (cumulative input -> cumulative output,
+    piecewise linear with one breakpoint per level, net of fees) walked on the
+    bids when selling the base coin and on the asks when buying it. A route's
+    curve is the composition of its legs, and is only rebuilt when the book of
+    one of its legs changed (its update id or timestamp moved, or invalidate
+    was called). Route curves are kept in padded ``(n_routes, n_breakpoints)``
+    arrays, so quote_all fills a size on every route in one NumPy pass.
+    """
+
+    def __init__(self, books: dict, pairs: dict = None, fee: float = 0.0, instruments=None, logger=None):
+        """
+        Initializes an instance of BybitRouteQuoter.
+
+        :param books: Mapping of symbol to live BybitOrderbook, e.g. BybitWebSocket.books.
+        :param pairs: Optional mapping of symbol to (base coin, quote coin); defaults to the spot instrument registry.
+        :param fee: Taker fee rate charged on the output of every leg.
+        :param instruments: Optional BybitInstrumentRegistry used when pairs is not given.
+        :param logger: Optional logger instance for logging purposes.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.books = books
+        self.fee = fee
+        if pairs is None:
+            if instruments is None:
+                from utils.bybit_instruments import get_instrument_registry
+
+                instruments = get_instrument_registry()
+            table = instruments.table("spot")
+            pairs = {}
+            for symbol in books:
+                info = table.get(symbol)
+                if info is not None:
+                    pairs[symbol] = (info["baseCoin"], info["quoteCoin"])
+        self.pairs = dict(pairs)
+        self.by_pair = {pair: symbol for symbol, pair in self.pairs.items()}
+
+        self.routes = []
+        self.route_index = {}
+        self.legs = []
+        self.routes_by_symbol = {}
+        self.versions = {}
+        self._stale = set()
+        self._leg_curves = {}
+        self.inputs = np.full((0, 2), np.inf)
+        self.outputs = np.zeros((0, 2))
+        self.lengths = np.zeros(0, dtype=np.intp)
+
+    def _route_legs(self, coins):
+        legs = []
+        for source, target in zip(coins[:-1], coins[1:]):
+            if (source, target) in self.by_pair:
+                legs.append((self.by_pair[(source, target)], "bids"))
+            elif (target, source) in self.by_pair:
+                legs.append((self.by_pair[(target, source)], "asks"))
+            else:
+                raise ValueError(f"No book converts {source} to {target}")
+        return legs
+
+    def add_route(self, coins):
+        """
+        Registers a route given as the list of coins it converts through.
+
+        :param coins: E.g. ["ETH", "BTC", "USDT"]; two to four coins.
+        :return: Row number of the route.
+        """
+        coins = tuple(coins)
+        row = self.route_index.get(coins)
+        if row is not None:
+            return row
+        if not 2 <= len(coins) <= 4:
+            raise ValueError("A route has one to three legs.")
+        legs = self._route_legs(coins)
+        row = len(self.routes)
+        self.routes.append(coins)
+        self.route_index[coins] = row
+        self.legs.append(legs)
+        for symbol, _ in legs:
+            self.routes_by_symbol.setdefault(symbol, set()).add(row)
+        if row == len(self.lengths):
+            self._resize(max(2 * row, 8), self.inputs.shape[1])
+        self._stale.add(row)
+        return row
+
+    def find_routes(self, start: str, end: str, max_legs: int = 3):
+        """
+        Registers every route from start to end over the known pairs, without
+        visiting a coin twice.
+
+        :return: List of the route coin tuples.
+        """
+        neighbours = {}
+        for base, quote in self.pairs.values():
+            neighbours.setdefault(base, set()).add(quote)
+            neighbours.setdefault(quote, set()).add(base)
+
+        routes = []
+        stack = [(start,)]
+        while stack:
+            path = stack.pop()
+            for coin in sorted(neighbours.get(path[-1], ())):
+                if coin == end:
+                    routes.append(path + (coin,))
+                elif coin not in path and len(path) < max_legs:
+                    stack.append(path + (coin,))
+        for route in routes:
+            self.add_route(route)
+        return routes
+
+    def _resize(self, routes, breakpoints):
+        inputs = np.full((routes, breakpoints), np.inf)
+        outputs = np.zeros((routes, breakpoints))
+        size = len(self.lengths)
+        inputs[:size, : self.inputs.shape[1]] = self.inputs
+        outputs[:size, : self.outputs.shape[1]] = self.outputs
+        lengths = np.zeros(routes, dtype=np.intp)
+        lengths[:size] = self.lengths
+        self.inputs, self.outputs, self.lengths = inputs, outputs, lengths
+
+    @staticmethod
+    def _version(book):
+        return getattr(book, "last_update_id", None), getattr(book, "timestamp", None)
+
+    def invalidate(self, symbol: str):
+        """
+        Marks the routes through a symbol for recomputation, for books whose
+        update id and timestamp do not change with their content.
+        """
+        self.versions.pop(symbol, None)
+
+    def leg_curve(self, symbol: str, side: str):
+        """
+        Returns the (cumulative input, cumulative output) curve of one leg:
+        selling base for quote on the bids, or buying base with quote on the asks.
+        """
+        curve = self._leg_curves.get((symbol, side))
+        if curve is not None:
+            return curve
+        book = self.books.get(symbol)
+        if book is None:
+            return _EMPTY_CURVE
+        levels = book.get_float_book(side)
+        if len(levels) == 0:
+            return _EMPTY_CURVE
+        notional = levels["price"] * levels["quantity"]
+        spent, received = (levels["quantity"], notional) if side == "bids" else (notional, levels["quantity"])
+        curve = (
+            np.concatenate([[0.0], np.cumsum(spent)]),
+            np.concatenate([[0.0], np.cumsum(received) * (1 - self.fee)]),
+        )
+        self._leg_curves[(symbol, side)] = curve
+        return curve
+
+    def refresh(self):
+        """
+        Rebuilds the curves of the routes whose legs changed since the last
+        call; routes over unchanged books are left as they are.
+        """
+        for symbol, rows in self.routes_by_symbol.items():
+            version = self._version(self.books.get(symbol))
+            if self.versions.get(symbol) != version or symbol not in self.versions:
+                self.versions[symbol] = version
+                self._leg_curves.pop((symbol, "bids"), None)
+                self._leg_curves.pop((symbol, "asks"), None)
+                self._stale.update(rows)
+
+        for row in self._stale:
+            curve = None
+            for symbol, side in self.legs[row]:
+                leg = self.leg_curve(symbol, side)
+                curve = leg if curve is None else _compose(curve, leg)
+            inputs, outputs = curve
+            if len(inputs) > self.inputs.shape[1]:
+                self._resize(self.inputs.shape[0], 2 * len(inputs))
+            self.inputs[row, : len(inputs)] = inputs
+            self.inputs[row, len(inputs):] = np.inf
+            self.outputs[row, : len(outputs)] = outputs
+            self.outputs[row, len(outputs):] = outputs[-1]
+            self.lengths[row] = len(inputs)
+        self._stale.clear()
+
+    def quote_all(self, size, rows=None):
+        """
+        Fills a size on many routes at once.
+
+        :param size: Amount of the start coin, a scalar or one value per route.
+        :param rows: Optional route rows; defaults to every route.
+        :return: Tuple of (amounts received, amounts filled) arrays; filled is
+            below size where the route does not have enough depth.
+        """
+        self.refresh()
+        rows = np.arange(len(self.routes)) if rows is None else np.asarray(rows, dtype=np.intp)
+        size = np.broadcast_to(np.asarray(size, dtype="f8"), rows.shape)
+        inputs = self.inputs[rows]
+        outputs = self.outputs[rows]
+        lengths = self.lengths[rows]
+        index = np.arange(len(rows))
+
+        filled = np.minimum(size, inputs[index, lengths - 1])
+        upper = np.clip((inputs < filled[:, None]).sum(axis=1), 1, np.maximum(lengths - 1, 1))
+        x0, x1 = inputs[index, upper - 1], inputs[index, upper]
+        y0, y1 = outputs[index, upper - 1], outputs[index, upper]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(x1 > x0, (filled - x0) / (x1 - x0), 0.0)
+        received = np.where(lengths > 1, y0 + weight * (y1 - y0), 0.0)
+        return received, filled
+
+    def quote(self, coins, size: float):
+        """
+        Fills a size on one route.
+
+        :return: Tuple of (amount received, amount filled, average price in end coin per start coin).
+        """
+        row = self.add_route(coins)
+        received, filled = self.quote_all(size, [row])
+        return float(received[0]), float(filled[0]), float(received[0] / filled[0]) if filled[0] else np.nan
+
+    def best_route(self, start: str, end: str, size: float):
+        """
+        Returns the (route, amount received, amount filled) giving the most of
+        ``end`` for ``size`` of ``start`` among the registered routes.
+        """
+        rows = [row for row, coins in enumerate(self.routes) if coins[0] == start and coins[-1] == end]
+        if not rows:
+            return None
+        received, filled = self.quote_all(size, rows)
+        best = int(np.argmax(received))
+        return self.routes[rows[best]], float(received[best]), float(filled[best])
+
+    def _levels(self, row, buy):
+        self.refresh()
+        inputs = self.inputs[row, : self.lengths[row]]
+        outputs = self.outputs[row, : self.lengths[row]]
+        spent, received = np.diff(inputs), np.diff(outputs)
+        keep = (spent > 0) & (received > 0)
+        spent, received = spent[keep], received[keep]
+        levels = np.empty(len(spent), dtype=Orderbook.dtype)
+        if buy:
+            # Spending the end coin for the start coin: price is spent per received
+            levels["price"] = spent / received
+            levels["quantity"] = received
+        else:
+            levels["price"] = received / spent
+            levels["quantity"] = spent
+        return levels
+
+    def synthetic_book(self, coins):
+        """
+        Builds the synthetic orderbook of the first coin against the last one,
+        e.g. ETH/USDT from ["ETH", "BTC", "USDT"]. Bids come from the route and
+        asks from the reverse route, with fees included, so request_quote works
+        on it like on a live book.
+
+        :return: An Orderbook named after its legs.
+        """
+        coins = tuple(coins)
+        forward = self.add_route(coins)
+        backward = self.add_route(coins[::-1])
+        book = Orderbook(symbol="*".join(symbol for symbol, _ in self.legs[forward]), exchange="bybit-synthetic")
+        book.set_book("bids", self._levels(forward, buy=False))
+        book.set_book("asks", self._levels(backward, buy=True))
+        return book
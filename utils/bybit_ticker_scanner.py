@@ -0,0 +1,226 @@
+import time
+import asyncio
+import logging
+import numpy as np
+
+from utils.bybit_market import BybitMarketApi
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class BybitTickerScanner:
+    """
+    Columnar snapshot of every ticker of a category.
+
+    Each numeric ticker field is a float column indexed by symbol row, so a
+    whole market can be ranked or filtered with a single NumPy call. Rows are
+    refreshed by REST polling (``refresh``/``poll``) or by ``tickers.*``
+    websocket messages (``on_ticker_message``); only values that changed are
+    written and flagged in ``changed``.
+    """
+
+    def __init__(self, category: str = "spot", market_api=None, capacity: int = 1024, logger=None):
+        """
+        Initializes an instance of BybitTickerScanner.
+
+        :param category: Bybit category scanned ('spot', 'linear', 'inverse' or 'option').
+        :param market_api: Optional BybitMarketApi used by refresh.
+        :param capacity: Initial number of rows; the table grows as symbols appear.
+        :param logger: Optional logger instance for logging purposes.
+        """
+        assert category in ["spot", "linear", "inverse", "option"], "Invalid category"
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.category = category
+        self.market_api = market_api if market_api else BybitMarketApi(logger=self.logger)
+        self.capacity = capacity
+        self.symbols = []
+        self.index = {}
+        self.columns = {}
+        self.changed = np.zeros(capacity, dtype=bool)
+        self.updated_at = np.zeros(capacity, dtype="f8")
+        self.last_refresh = 0.0
+        self.stop_execution = True
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _grow(self, capacity):
+        for field, column in self.columns.items():
+            grown = np.full(capacity, np.nan)
+            grown[: self.capacity] = column
+            self.columns[field] = grown
+        self.changed = np.concatenate([self.changed, np.zeros(capacity - self.capacity, dtype=bool)])
+        self.updated_at = np.concatenate([self.updated_at, np.zeros(capacity - self.capacity, dtype="f8")])
+        self.capacity = capacity
+
+    def _row(self, symbol):
+        row = self.index.get(symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row == self.capacity:
+                self._grow(max(self.capacity * 2, 16))
+            self.symbols.append(symbol)
+            self.index[symbol] = row
+        return row
+
+    def _column(self, field):
+        column = self.columns.get(field)
+        if column is None:
+            column = self.columns[field] = np.full(self.capacity, np.nan)
+        return column
+
+    def update_tickers(self, tickers: list):
+        """
+        Applies a list of (possibly partial) ticker dicts to the table.
+
+        Fields missing from a dict keep their current value, which is how the
+        linear/inverse ``tickers`` deltas are delivered.
+
+        :param tickers: List of ticker dicts, each holding at least 'symbol'.
+        :return: Row numbers whose values changed.
+        """
+        if not tickers:
+            return np.array([], dtype=np.intp)
+        rows = np.fromiter((self._row(ticker["symbol"]) for ticker in tickers), dtype=np.intp, count=len(tickers))
+        fields = []
+        for ticker in tickers:
+            fields.extend(field for field in ticker if field != "symbol" and field not in fields)
+
+        changed = np.zeros(len(tickers), dtype=bool)
+        for field in fields:
+            column = self._column(field)
+            old = column[rows]
+            values = np.fromiter(
+                (_to_float(ticker[field]) if field in ticker else old[i] for i, ticker in enumerate(tickers)),
+                dtype="f8",
+                count=len(tickers),
+            )
+            diff = (old != values) & ~(np.isnan(old) & np.isnan(values))
+            if diff.any():
+                column[rows[diff]] = values[diff]
+                changed |= diff
+
+        changed_rows = rows[changed]
+        self.changed[changed_rows] = True
+        self.updated_at[changed_rows] = time.time()
+        return changed_rows
+
+    def on_ticker_message(self, data: dict):
+        """
+        Applies a ``tickers.{symbol}`` websocket message (snapshot or delta).
+        """
+        ticker = data.get("data")
+        if not ticker:
+            return
+        self.update_tickers(ticker if isinstance(ticker, list) else [ticker])
+
+    async def refresh(self):
+        """
+        Fetches every ticker of the category over REST and applies it. The
+        change mask is reset first, so it reflects this refresh only.
+
+        :return: Row numbers whose values changed.
+        """
+        response = await self.market_api.get_tickers(self.category)
+        if response.get("retCode") != 0:
+            self.logger.warning(f"Error fetching {self.category} tickers: {response.get('retMsg')}")
+            return np.array([], dtype=np.intp)
+        self.reset_changes()
+        self.last_refresh = time.time()
+        return self.update_tickers(response["result"]["list"])
+
+    async def poll(self, interval: float = 1.0):
+        """
+        Calls refresh every ``interval`` seconds until stop is called.
+        """
+        self.stop_execution = False
+        while not self.stop_execution:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.logger.info(f"An error occurred while polling tickers: {str(e)}")
+            await asyncio.sleep(interval)
+
+    def stop(self):
+        self.stop_execution = True
+
+    def reset_changes(self):
+        """
+        Clears the change mask, e.g. after a consumer has processed it.
+        """
+        self.changed[:] = False
+
+    def changed_mask(self):
+        """
+        Returns a boolean mask over the symbol rows changed since the last reset.
+        """
+        return self.changed[: len(self.symbols)]
+
+    def changed_symbols(self):
+        """
+        Returns the symbols changed since the last reset.
+        """
+        return [self.symbols[row] for row in np.flatnonzero(self.changed_mask())]
+
+    def column(self, field: str):
+        """
+        Returns the values of a field for every symbol row.
+
+        Besides the raw ticker fields, 'spread' (ask1Price - bid1Price) and
+        'spreadBps' (spread relative to mid, in basis points) are derived.
+
+        :raises KeyError: If the field has never been received.
+        """
+        size = len(self.symbols)
+        if field == "spread":
+            return self.columns["ask1Price"][:size] - self.columns["bid1Price"][:size]
+        if field == "spreadBps":
+            bid = self.columns["bid1Price"][:size]
+            ask = self.columns["ask1Price"][:size]
+            return (ask - bid) / ((ask + bid) / 2) * 1e4
+        return self.columns[field][:size]
+
+    def get(self, symbol: str, field: str):
+        """
+        Returns a single value, or nan if the symbol or field is unknown.
+        """
+        row = self.index.get(symbol)
+        column = self.columns.get(field)
+        if row is None or column is None:
+            return np.nan
+        return column[row]
+
+    def top_n(self, field: str, n: int = 10, largest: bool = True, mask=None):
+        """
+        Returns the n symbols with the largest (or smallest) values of a field.
+
+        Uses ``np.argpartition`` so only the selected rows are sorted. Rows with
+        nan values are skipped.
+
+        :param field: Ticker field or derived field (see column).
+        :param n: Number of symbols to return.
+        :param largest: Rank from the largest value if True, from the smallest otherwise.
+        :param mask: Optional boolean mask over symbol rows restricting the candidates.
+        :return: Tuple of (symbols, values) ordered best first.
+        """
+        values = self.column(field)
+        valid = ~np.isnan(values)
+        if mask is not None:
+            valid &= mask
+        rows = np.flatnonzero(valid)
+        if rows.size == 0:
+            return [], np.array([], dtype="f8")
+        keys = -values[rows] if largest else values[rows]
+        n = min(n, rows.size)
+        if n < rows.size:
+            selected = np.argpartition(keys, n - 1)[:n]
+        else:
+            selected = np.arange(rows.size)
+        selected = selected[np.argsort(keys[selected], kind="stable")]
+        top_rows = rows[selected]
+        return [self.symbols[row] for row in top_rows], values[top_rows]
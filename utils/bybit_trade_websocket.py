@@ -0,0 +1,167 @@
+import json
+import uuid
+import asyncio
+import logging
+
+from utils.bybit_async_account import AsyncBybitAccount
+from utils.bybit_signing import authenticate_websocket
+
+
+class BybitTradeWebSocket:
+    """
+    Persistent, authenticated order-entry channel over Bybit's /v5/trade websocket.
+
+    Every request carries a reqId; the matching ack resolves the future the
+    caller is awaiting. The connection re-authenticates after every reconnect,
+    also after a failed auth, and requests in flight when a connection drops
+    fail with ConnectionError right away since their outcome is unknown.
+    """
+
+    def __init__(self, account=None, logger=None, ws_url="wss://stream.bybit.com/v5/trade", recv_window: int = 5000):
+        """
+        Initializes an instance of BybitTradeWebSocket.
+
+        :param account: Optional AsyncBybitAccount providing the credentials and signing.
+        :param logger: Optional logger instance for logging purposes.
+        :param ws_url: Websocket URL of the trade endpoint.
+        :param recv_window: Receive window in milliseconds sent with every request.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.account = account if account else AsyncBybitAccount(logger=self.logger)
+        self.ws_url = ws_url
+        self.recv_window = recv_window
+        self.stop_execution = True
+
+        self.ws = None
+        self.ready = asyncio.Event()
+        self.pending = {}
+
+    async def _authenticate(self, ws):
+        await authenticate_websocket(ws, self.account._get_signer(), self.account._get_timestamp() + 10000)
+        self.logger.info("Trade websocket authenticated.")
+
+    def _fail_pending(self, exception):
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exception)
+        self.pending = {}
+
+    async def connect_to_stream(self, retry_delay=1):
+        import websockets
+
+        self.stop_execution = False
+        while not self.stop_execution:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20) as ws:
+                    try:
+                        await self._authenticate(ws)
+                        self.ws = ws
+                        self.ready.set()
+                        retry_delay = 1
+                        async for message in ws:
+                            self.on_message(json.loads(message))
+                    finally:
+                        # Fail requests in flight as soon as the socket drops, not after the close handshake
+                        self.ready.clear()
+                        self.ws = None
+                        self._fail_pending(ConnectionError("Trade websocket disconnected"))
+            except (websockets.exceptions.ConnectionClosedError, OSError) as e:
+                self.logger.info(f"Trade connection closed: {str(e)}")
+            except Exception as e:
+                # E.g. a rejected auth: keep reconnecting with backoff rather than ending the task
+                self.logger.warning(f"Trade websocket error: {str(e)}")
+            if not self.stop_execution:
+                self.logger.info(f"Reconnecting trade websocket in {retry_delay} seconds...")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 60)
+        self.logger.info("Stopped trade websocket")
+
+    def on_message(self, data):
+        future = self.pending.pop(data.get("reqId"), None)
+        if future is not None and not future.done():
+            future.set_result(data)
+        elif data.get("op") not in ("pong", "ping"):
+            self.logger.info(f"Unmatched trade message: {data}")
+
+    async def stop(self):
+        self.stop_execution = True
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def start(self):
+        await self.connect_to_stream()
+
+    async def send_request(self, op: str, args: list, timeout: float = 5.0):
+        """
+        Sends an order op and waits for its ack.
+
+        :param op: 'order.create', 'order.amend' or 'order.cancel' (or their batch forms).
+        :param args: List of request dicts for the op.
+        :param timeout: Seconds to wait for the connection and for the ack.
+        :return: The ack message as a dict.
+        :raises ConnectionError: If the connection drops before the ack.
+        :raises asyncio.TimeoutError: If no ack arrives in time.
+        """
+        await asyncio.wait_for(self.ready.wait(), timeout)
+        ws = self.ws
+        if ws is None:
+            # The connection dropped between the ready event and this task resuming
+            raise ConnectionError("Trade websocket disconnected")
+        req_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self.pending[req_id] = future
+        try:
+            await ws.send(json.dumps({
+                "reqId": req_id,
+                "header": {
+                    "X-BAPI-TIMESTAMP": str(self.account._get_timestamp()),
+                    "X-BAPI-RECV-WINDOW": str(self.recv_window),
+                },
+                "op": op,
+                "args": args,
+            }))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(req_id, None)
+
+    async def place_order(self, symbol, side, order_type, qty, price=None, category="spot", params: dict = {}):
+        order = {
+            "category": category,
+            "symbol": symbol,
+            "side": side,
+            "orderType": order_type,
+            "qty": f'{qty}',
+        }
+        if order_type == "Limit" and price:
+            order["price"] = f'{price}'
+        order.update(params)
+        return await self.send_request("order.create", [order])
+
+    @staticmethod
+    def _check_order_ref(request: dict):
+        # Rejected locally: the exchange would only answer with an error ack after a round trip
+        if not request.get("orderId") and not request.get("orderLinkId"):
+            raise ValueError("Either order_id or order_link_id is required.")
+
+    async def amend_order(self, symbol, order_id=None, order_link_id=None, qty=None, price=None, category="spot", params: dict = {}):
+        amendment = {"category": category, "symbol": symbol}
+        if order_id:
+            amendment["orderId"] = order_id
+        if order_link_id:
+            amendment["orderLinkId"] = order_link_id
+        if qty is not None:
+            amendment["qty"] = f'{qty}'
+        if price is not None:
+            amendment["price"] = f'{price}'
+        amendment.update(params)
+        self._check_order_ref(amendment)
+        return await self.send_request("order.amend", [amendment])
+
+    async def cancel_order(self, symbol, order_id=None, order_link_id=None, category="spot"):
+        cancel = {"category": category, "symbol": symbol}
+        if order_id:
+            cancel["orderId"] = order_id
+        if order_link_id:
+            cancel["orderLinkId"] = order_link_id
+        self._check_order_ref(cancel)
+        return await self.send_request("order.cancel", [cancel])
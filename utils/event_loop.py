@@ -0,0 +1,217 @@
+import os
+import time
+import asyncio
+import logging
+import collections
+import numpy as np
+
+# Default backend of new_event_loop/run, overridable per call
+DEFAULT_BACKEND = os.getenv("BYBIT_EVENT_LOOP", "auto")
+
+# Slow section or lag spike: what ran, for how long, and when
+SlowEvent = collections.namedtuple("SlowEvent", ["name", "duration", "timestamp"])
+
+
+def _uvloop():
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop
+
+
+def new_event_loop(backend: str = None):
+    """
+    Creates an event loop of the given backend.
+
+    :param backend: 'asyncio', 'uvloop', or 'auto' (uvloop when installed);
+        defaults to the BYBIT_EVENT_LOOP environment variable, else 'auto'.
+    :return: The new event loop.
+    """
+    backend = backend if backend else DEFAULT_BACKEND
+    assert backend in ["auto", "asyncio", "uvloop"], "Invalid event loop backend"
+    if backend == "asyncio":
+        return asyncio.new_event_loop()
+    uvloop = _uvloop()
+    if uvloop is None:
+        if backend == "uvloop":
+            raise ImportError("The uvloop event loop backend was requested but uvloop is not installed.")
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+def loop_backend(loop=None):
+    """
+    Returns the name of the backend of a loop (the running one by default).
+    """
+    loop = loop if loop else asyncio.get_running_loop()
+    return "uvloop" if type(loop).__module__.startswith("uvloop") else "asyncio"
+
+
+def run(main, backend: str = None, debug: bool = None):
+    """
+    asyncio.run on a loop of the given backend, e.g.
+    ``run(ws.start(), backend="uvloop")``.
+    """
+    with asyncio.Runner(debug=debug, loop_factory=lambda: new_event_loop(backend)) as runner:
+        return runner.run(main)
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop runs scheduled work, and which sections
+    of code keep it busy.
+
+    A background task sleeps ``interval`` seconds at a time and records how
+    much later than requested it wakes up; this scheduling delay is the time
+    any other ready callback (e.g. the next websocket frame) waits as well.
+    Instrumented code reports the duration of its synchronous sections with
+    ``record(name, duration)`` (BybitWebSocket does so per message topic), and
+    sections longer than ``slow_threshold`` are kept as slow events. A lag
+    spike is attributed to the slowest section recorded since the previous
+    sample. Recording is a couple of dict operations, so the monitor can stay
+    on in production. Lag spikes are logged as at most one warning per
+    ``log_interval`` seconds, with their count and the largest one.
+    """
+
+    def __init__(self, interval: float = 0.05, slow_threshold: float = 0.01, samples: int = 4096,
+                 max_events: int = 1000, log_interval: float = 10.0, logger=None):
+        """
+        Initializes an instance of LoopLagMonitor.
+
+        :param interval: Seconds between scheduling delay samples.
+        :param slow_threshold: Seconds above which a section or a delay is recorded as slow.
+        :param samples: Number of most recent delay samples kept.
+        :param max_events: Number of most recent slow events kept.
+        :param log_interval: Minimum seconds between two lag spike warnings.
+        :param logger: Optional logger instance for logging purposes.
+        """
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.lags = np.zeros(samples)
+        self.sample_count = 0
+        self.slow_events = collections.deque(maxlen=max_events)
+        self.lag_events = collections.deque(maxlen=max_events)
+        # name -> [count, total seconds, max seconds]
+        self.sections = {}
+        self._slowest = None
+        self.log_interval = log_interval
+        # Spikes since the last warning: count and the largest as (lag, section)
+        self._spike_count = 0
+        self._max_spike = None
+        self._last_log = None
+        self._task = None
+        self.backend = None
+
+    def record(self, name, duration: float):
+        """
+        Records the duration of a synchronous section, e.g. a message handler.
+
+        :param name: What ran, e.g. the message topic.
+        :param duration: Seconds it kept the loop busy.
+        """
+        stats = self.sections.get(name)
+        if stats is None:
+            self.sections[name] = [1, duration, duration]
+        else:
+            stats[0] += 1
+            stats[1] += duration
+            if duration > stats[2]:
+                stats[2] = duration
+        if duration >= self.slow_threshold:
+            self.slow_events.append(SlowEvent(name, duration, time.time()))
+        if self._slowest is None or duration > self._slowest[1]:
+            self._slowest = (name, duration)
+
+    def _add_lag(self, lag):
+        self.lags[self.sample_count % len(self.lags)] = lag
+        self.sample_count += 1
+        if lag >= self.slow_threshold:
+            name = self._slowest[0] if self._slowest else None
+            self.lag_events.append(SlowEvent(name, lag, time.time()))
+            self._spike_count += 1
+            if self._max_spike is None or lag > self._max_spike[0]:
+                self._max_spike = (lag, name)
+        if self._spike_count and (self._last_log is None or time.monotonic() - self._last_log >= self.log_interval):
+            self._log_spikes()
+        self._slowest = None
+
+    def _log_spikes(self):
+        lag, name = self._max_spike
+        self.logger.warning(f"Event loop lagged {self._spike_count} time(s) above {self.slow_threshold * 1e3:.1f} ms, "
+                            f"max {lag * 1e3:.1f} ms, slowest recorded section: {name}")
+        self._spike_count = 0
+        self._max_spike = None
+        self._last_log = time.monotonic()
+
+    async def run(self):
+        """
+        Samples the scheduling delay until stop is called.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._add_lag(max(loop.time() - expected, 0.0))
+
+    def start(self):
+        """
+        Starts sampling in a task of the running loop.
+        """
+        if self._task is None or self._task.done():
+            loop = asyncio.get_running_loop()
+            self.backend = loop_backend(loop)
+            self._task = loop.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._spike_count:
+            self._log_spikes()
+
+    def lag_stats(self):
+        """
+        Returns percentiles of the recent scheduling delays, in milliseconds.
+        """
+        lags = self.lags[: min(self.sample_count, len(self.lags))] * 1e3
+        if lags.size == 0:
+            return {"samples": 0}
+        return {
+            "samples": int(lags.size),
+            "mean_ms": float(lags.mean()),
+            "p50_ms": float(np.percentile(lags, 50)),
+            "p99_ms": float(np.percentile(lags, 99)),
+            "max_ms": float(lags.max()),
+        }
+
+    def top_sections(self, n: int = 10, key: str = "total"):
+        """
+        Returns the n sections with the largest total (or max) busy time.
+
+        :param key: 'total' or 'max'.
+        :return: List of (name, count, total seconds, max seconds).
+        """
+        column = 1 if key == "total" else 2
+        rows = sorted(self.sections.items(), key=lambda item: item[1][column], reverse=True)[:n]
+        return [(name, count, total, maximum) for name, (count, total, maximum) in rows]
+
+    def report(self, n: int = 10):
+        return {
+            "backend": self.backend,
+            "lag": self.lag_stats(),
+            "slow_events": len(self.slow_events),
+            "lag_events": [event._asdict() for event in list(self.lag_events)[-n:]],
+            "top_sections": self.top_sections(n),
+        }
+
+    def reset(self):
+        self.sample_count = 0
+        self.slow_events.clear()
+        self.lag_events.clear()
+        self.sections.clear()
+        self._slowest = None
+        self._spike_count = 0
+        self._max_spike = None
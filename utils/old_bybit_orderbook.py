@@ -8,8 +8,6 @@ from datetime import datetime
 
 from models.orderbook import Orderbook
 
-logging.basicConfig(level=logging.INFO)
-
 class BybitOrderbook:
     def __init__(self, symbol, logger=None):
         self.logger = logger if logger else logging.getLogger(__name__)
@@ -0,0 +1,105 @@
+import time
+import asyncio
+import threading
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent coroutine calls into a single execution.
+
+    Callers asking for a key that is already in flight await the same future
+    instead of starting a new call. Optionally, completed results are kept for
+    ``cache_ttl`` seconds so that bursts arriving right after completion are
+    served without another call. Results are shared between callers and must
+    be treated as read-only.
+
+    Cached entries are kept in expiry order (every entry lives ``cache_ttl``),
+    so expired ones are pruned from the front on every insert, and at most
+    ``max_entries`` are kept, dropping the oldest first.
+
+    One instance may be shared by several event loops (e.g. a shared registry
+    used from the caller's loop and from BybitAccount's I/O thread): calls
+    are only coalesced with callers on the same loop, since a future cannot
+    be awaited from another one, while cached results are shared by all.
+    """
+
+    def __init__(self, cache_ttl: float = 0.0, max_entries: int = 1024):
+        """
+        Initializes an instance of SingleFlight.
+
+        :param cache_ttl: Seconds a completed result stays reusable; 0 disables the micro-cache.
+        :param max_entries: Maximum number of micro-cached results.
+        """
+        self.cache_ttl = cache_ttl
+        self.max_entries = max_entries
+        # (event loop, key) -> future of the call running on that loop
+        self._in_flight = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict = None):
+        """
+        Builds a hashable key from an endpoint and its parameters, ignoring
+        parameter order and unset (None) values.
+        """
+        if not params:
+            return (endpoint, ())
+        return (endpoint, tuple(sorted((key, str(value)) for key, value in params.items() if value is not None)))
+
+    async def do(self, key, func):
+        """
+        Returns the result of ``func()`` for a key, sharing it with concurrent callers.
+
+        :param key: Hashable key identifying the call, usually from make_key.
+        :param func: Zero-argument coroutine function performing the call.
+        :return: The result of the (possibly shared) call.
+        """
+        if self.cache_ttl > 0:
+            cached = self._cache.get(key)
+            if cached is not None:
+                expires_at, result = cached
+                if time.monotonic() < expires_at:
+                    return result
+                with self._lock:
+                    if self._cache.get(key) is cached:
+                        del self._cache[key]
+
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            future = self._in_flight.get(flight_key)
+            if future is None:
+                future = asyncio.ensure_future(self._run(flight_key, func))
+                self._in_flight[flight_key] = future
+        # A cancelled waiter must not cancel the call the others are waiting on
+        return await asyncio.shield(future)
+
+    async def _run(self, flight_key, func):
+        try:
+            result = await func()
+            if self.cache_ttl > 0:
+                self._store(flight_key[1], result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(flight_key, None)
+
+    def _store(self, key, result):
+        now = time.monotonic()
+        cache = self._cache
+        with self._lock:
+            # Re-inserting moves the key to the end, keeping the dict in expiry order
+            cache.pop(key, None)
+            while cache:
+                oldest = next(iter(cache))
+                if cache[oldest][0] > now and len(cache) < self.max_entries:
+                    break
+                del cache[oldest]
+            cache[key] = (now + self.cache_ttl, result)
+
+    def clear(self):
+        """
+        Drops every micro-cached result.
+        """
+        with self._lock:
+            self._cache.clear()